@@ -14,6 +14,8 @@ from src.database.db import db_config, Base
 from src.models.user import User, UserRole
 from src.models.badges import Badge, DificultyLevel  # TAMBAHKAN INI
 from src.models.user_badge import user_badge_association  # TAMBAHKAN INI
+from src.models.storage_file import StorageFile
+from src.models.resource_version import ResourceVersion
 
 # this is the Alembic Config object
 config = context.config
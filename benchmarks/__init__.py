@@ -0,0 +1 @@
+"""Benchmark helpers (dijalankan via ``python cli.py bench:*``)"""
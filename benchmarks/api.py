@@ -0,0 +1,374 @@
+"""
+End-to-end API benchmark / load test.
+
+App FastAPI dijalankan in-process (httpx ASGITransport, tanpa socket) di atas
+Postgres lokal, idealnya berisi dataset dari ``python cli.py db:synthetic``.
+Setiap scenario di-drive dengan N request dan concurrency tetap, lalu
+dilaporkan throughput, latency p50/p95/p99 dan rata-rata query SQL per request.
+
+Hasil dibandingkan dengan baseline tersimpan (``benchmarks/baselines/api.json``,
+di-commit bersama perubahan) sehingga regresi terlihat saat review:
+
+    python cli.py bench:api                   # jalankan + bandingkan
+    python cli.py bench:api --update-baseline # simpan hasil sebagai baseline baru
+
+Catatan: scenario quiz finish dan login menulis ke database (progress,
+last_login), jadi jalankan terhadap database benchmark, bukan data asli.
+"""
+import os
+import sys
+import json
+import math
+import time
+import base64
+import asyncio
+import statistics
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "api.json")
+
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", "200"))
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "10"))
+BENCH_WARMUP = int(os.getenv("BENCH_WARMUP", "10"))
+# Toleransi regresi relatif terhadap baseline
+LATENCY_TOLERANCE = float(os.getenv("BENCH_LATENCY_TOLERANCE", "0.25"))
+THROUGHPUT_TOLERANCE = float(os.getenv("BENCH_THROUGHPUT_TOLERANCE", "0.25"))
+
+BENCH_PASSWORD = "Password123"  # Password user seeder dan user sintetis
+
+# Settings immutable dan dibaca sekali saat src di-import: env ini diset sebelumnya
+BENCH_ENV = {
+    "RATE_LIMIT": "100000000",  # Semua request dari satu client
+    "STREAK_JOB_ENABLED": "false",
+    "QUERY_DEBUG": "off",  # Query dihitung langsung, bukan via middleware
+}
+
+
+# =====================================================================
+# APP & FIXTURES
+# =====================================================================
+
+def apply_environment():
+    """Set env benchmark; harus sebelum modul src apa pun di-import (cli.py bench:api)"""
+    if "src.config.settings" in sys.modules:
+        raise RuntimeError("Benchmark environment must be applied before src is imported")
+    os.environ.update(BENCH_ENV)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def _check_environment():
+    from src.config.settings import settings
+
+    if settings.rate_limit != int(BENCH_ENV["RATE_LIMIT"]) or settings.streak_job_enabled:
+        raise RuntimeError("Settings loaded without benchmark overrides: call apply_environment() before importing src")
+
+
+class StubModel:
+    """Pengganti model Keras: output softmax tetap, tanpa TensorFlow"""
+
+    def __init__(self, classes: int = 5):
+        self.classes = classes
+
+    def predict(self, batch, verbose=0):
+        import numpy as np
+
+        output = np.full((len(batch), self.classes), 0.1 / max(self.classes - 1, 1))
+        output[:, 0] = 0.9
+        return output
+
+
+def _sample_image() -> str:
+    from src.database.synthetic import _png
+
+    return "data:image/png;base64," + base64.b64encode(_png(224, 224, (120, 90, 60))).decode()
+
+
+class Fixtures:
+    """User, token dan sublevel untuk scenario (diambil sekali dari database)"""
+
+    def __init__(self, users: int = 50):
+        from sqlalchemy import select
+
+        from src.config.middleware import auth_manager
+        from src.database.db import SessionLocal
+        from src.models.progress import Progress
+        from src.models.user import User, UserRole
+
+        db = SessionLocal()
+        try:
+            learners = db.execute(
+                select(User.id, User.username)
+                .where(User.role == UserRole.USER, User.is_active.is_(True), User.deleted_at.is_(None))
+                .order_by(User.id)
+                .limit(users)
+            ).all()
+            admin_id = db.execute(
+                select(User.id).where(User.role == UserRole.ADMIN, User.deleted_at.is_(None)).order_by(User.id).limit(1)
+            ).scalar()
+            learner_ids = [row[0] for row in learners]
+            unlocked = db.execute(
+                select(Progress.user_id, Progress.sublevel_id)
+                .where(Progress.user_id.in_(learner_ids), Progress.is_unlocked.is_(True))
+                .order_by(Progress.user_id, Progress.sublevel_id)
+            ).all()
+        finally:
+            db.close()
+
+        if not learner_ids or admin_id is None:
+            raise RuntimeError("Benchmark butuh minimal satu admin dan satu user: jalankan db:seed / db:synthetic")
+
+        self.usernames = [row[1] for row in learners]
+        self.learner_tokens = [auth_manager.create_access_token({"sub": str(uid)}) for uid in learner_ids]
+        self.admin_token = auth_manager.create_access_token({"sub": str(admin_id)})
+        # Sublevel yang sudah terbuka per user (quiz start/finish tidak ditolak 403)
+        first_unlocked: Dict[int, int] = {}
+        for user_id, sublevel_id in unlocked:
+            first_unlocked.setdefault(user_id, sublevel_id)
+        self.quiz_targets = [
+            (token, first_unlocked[uid])
+            for uid, token in zip(learner_ids, self.learner_tokens)
+            if uid in first_unlocked
+        ]
+        self.image = _sample_image()
+
+    @staticmethod
+    def auth(token: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+
+# =====================================================================
+# SCENARIOS
+# =====================================================================
+
+RequestFn = Callable[[Any, Fixtures, int], Awaitable[Any]]
+
+
+async def _login(client, fx: Fixtures, i: int):
+    username = fx.usernames[i % len(fx.usernames)]
+    return await client.post("/api/auth/login", json={"email_or_username": username, "password": BENCH_PASSWORD})
+
+
+async def _quiz_loop(client, fx: Fixtures, i: int):
+    if not fx.quiz_targets:
+        raise RuntimeError("Tidak ada sublevel terbuka untuk user benchmark")
+    token, sublevel_id = fx.quiz_targets[i % len(fx.quiz_targets)]
+    started = await client.get(f"/api/user/soal/sublevel/{sublevel_id}/start", headers=fx.auth(token))
+    if started.status_code != 200:
+        return started
+    return await client.post(
+        f"/api/user/soal/sublevel/{sublevel_id}/finish",
+        headers=fx.auth(token),
+        json={"sublevel_id": sublevel_id, "correct_answers": 4, "total_score": 80},
+    )
+
+
+async def _summary(client, fx: Fixtures, i: int):
+    token = fx.learner_tokens[i % len(fx.learner_tokens)]
+    return await client.get("/api/user/soal/user/progress/summary", headers=fx.auth(token))
+
+
+async def _admin_soal_list(client, fx: Fixtures, i: int):
+    return await client.get("/api/admin/soal/list", headers=fx.auth(fx.admin_token))
+
+
+async def _kamus_browse(client, fx: Fixtures, i: int):
+    categories = ("alphabet", "numbers", "imbuhan")
+    return await client.get(
+        "/api/admin/kamus/",
+        params={"category": categories[i % len(categories)]},
+        headers=fx.auth(fx.admin_token),
+    )
+
+
+async def _predict(client, fx: Fixtures, i: int):
+    return await client.post("/predict/", json={"image": fx.image})
+
+
+# name -> (request fn, concurrency override, requests multiplier)
+SCENARIOS: Dict[str, Tuple[RequestFn, Optional[int], float]] = {
+    "login_storm": (_login, 50, 0.5),  # bcrypt: banyak login bersamaan, CPU-bound
+    "quiz_start_finish": (_quiz_loop, None, 0.5),
+    "progress_summary": (_summary, None, 1.0),
+    "admin_soal_list": (_admin_soal_list, None, 0.5),
+    "kamus_browse": (_kamus_browse, None, 1.0),
+    "predict": (_predict, None, 1.0),
+}
+
+
+# =====================================================================
+# RUNNER
+# =====================================================================
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _drive(client, fn: RequestFn, fx: Fixtures, requests: int, concurrency: int) -> Dict[str, Any]:
+    from src.utils.query_inspector import QueryRecorder, current_recorder
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            # Recorder per request: contextvar ikut ke threadpool handler sync
+            recorder = QueryRecorder()
+            token = current_recorder.set(recorder)
+            started = time.perf_counter()
+            try:
+                response = await fn(client, fx, i)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            finally:
+                current_recorder.reset(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(recorder.count)
+            if status != 200:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2) if latencies else 0.0,
+        "queries_per_request": round(statistics.mean(queries), 1) if queries else 0.0,
+        "errors": errors,
+    }
+
+
+async def _run_async(names: List[str], requests: int, concurrency: int, use_real_model: bool) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    from src.app.main import app
+    from src.routes import predictRoutes
+
+    if not use_real_model:
+        predictRoutes._model = StubModel()
+
+    await app.router.startup()
+    try:
+        fx = Fixtures()
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in names:
+                fn, scenario_concurrency, multiplier = SCENARIOS[name]
+                count = max(1, int(requests * multiplier))
+                await _drive(client, fn, fx, min(BENCH_WARMUP, count), 1)  # Warm-up: cache, pool, JIT
+                results[name] = await _drive(client, fn, fx, count, scenario_concurrency or concurrency)
+        return results
+    finally:
+        await app.router.shutdown()
+
+
+def run(
+    names: Optional[List[str]] = None,
+    requests: int = BENCH_REQUESTS,
+    concurrency: int = BENCH_CONCURRENCY,
+    use_real_model: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """Jalankan scenario (default semua), return hasil per scenario"""
+    _check_environment()
+    names = names or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {unknown}. Available: {list(SCENARIOS)}")
+    return asyncio.run(_run_async(names, requests, concurrency, use_real_model))
+
+
+# =====================================================================
+# BASELINE
+# =====================================================================
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("scenarios", {})
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    scenarios = load_baseline(path)
+    scenarios.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "scenarios": scenarios}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Daftar regresi: p95 / throughput di luar toleransi, query per request bertambah, error baru"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + LATENCY_TOLERANCE):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms > baseline {base['p95_ms']}ms")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - THROUGHPUT_TOLERANCE):
+            regressions.append(f"{name}: throughput {current['throughput_rps']} rps < baseline {base['throughput_rps']} rps")
+        if current["queries_per_request"] > base["queries_per_request"]:
+            regressions.append(
+                f"{name}: {current['queries_per_request']} queries/request > baseline {base['queries_per_request']}"
+            )
+        if current["errors"] and not base.get("errors"):
+            regressions.append(f"{name}: errors {current['errors']}")
+    return regressions
+
+
+def main(
+    names: Optional[List[str]] = None,
+    requests: int = BENCH_REQUESTS,
+    update_baseline: bool = False,
+    use_real_model: bool = False,
+) -> bool:
+    print(f"🏋️ API benchmark: {requests} requests/scenario, concurrency {BENCH_CONCURRENCY}")
+    results = run(names, requests, use_real_model=use_real_model)
+    baseline = load_baseline()
+
+    print(f"  {'scenario':<20} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}  baseline p95")
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        base_p95 = f"{base['p95_ms']:.2f}ms" if base else "-"
+        print(
+            f"  {name:<20} {result['throughput_rps']:>8.1f} {result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms "
+            f"{result['p99_ms']:>7.2f}ms {result['queries_per_request']:>8.1f}  {base_p95}"
+        )
+        if result["errors"]:
+            print(f"      errors: {result['errors']}")
+
+    if update_baseline:
+        save_baseline(results)
+        print(f"💾 Baseline updated: {os.path.relpath(BASELINE_PATH)}")
+        return True
+
+    if not baseline:
+        print("ℹ️ No baseline yet: run with --update-baseline to record one")
+        return True
+
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print(f"  ❌ {regression}")
+    if not regressions:
+        print("✅ No regressions against baseline")
+    return not regressions
+
+
+if __name__ == "__main__":
+    apply_environment()
+    main()
@@ -0,0 +1,241 @@
+"""
+Micro-benchmark pipeline inference ``/predict``.
+
+Setiap stage ``predict_image`` diukur terpisah dengan fungsi yang sama
+dengan yang dipakai route (``src.routes.predictRoutes``):
+
+- ``base64``    : decode_base64 (data URI -> bytes)
+- ``decode``    : decode_image (PIL open + convert RGB)
+- ``resize``    : resize_image (ke INPUT_SIZE)
+- ``normalize`` : normalize_image (np.array / 255 + batch axis)
+- ``predict``   : model.predict batch 1
+- ``response``  : build_prediction + validasi PredictionResponse + render FastJSONResponse
+
+Corpus gambar sintetis (deterministik) di beberapa resolusi dan format, plus
+sweep batch size per runtime (stub numpy, Keras, TFLite hasil konversi model
+Keras, model server via Unix socket). Runtime yang tidak tersedia
+dilaporkan, bukan error.
+"""
+import io
+import json
+import time
+import base64
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RESOLUTIONS: List[Tuple[int, int]] = [(224, 224), (640, 480), (1280, 720), (1920, 1080)]
+FORMATS = ("PNG", "JPEG", "WEBP")
+BATCH_SIZES = (1, 4, 8, 16, 32)
+RUNTIMES = ("stub", "keras", "tflite", "server")
+
+
+# =====================================================================
+# CORPUS
+# =====================================================================
+
+def build_corpus(seed: int = 42) -> List[Dict[str, Any]]:
+    """Gambar sintetis (gradient + noise) per resolusi x format, sebagai data URI base64"""
+    import numpy as np
+    from PIL import Image, features
+
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for width, height in RESOLUTIONS:
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        base = np.stack([np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)),
+                         np.full((height, width), 128, dtype=np.float32)], axis=-1)
+        noise = rng.normal(0, 12, size=base.shape)
+        pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+        image = Image.fromarray(pixels, "RGB")
+        for fmt in FORMATS:
+            if fmt == "WEBP" and not features.check("webp"):
+                continue
+            buffer = io.BytesIO()
+            image.save(buffer, format=fmt, **({"quality": 85} if fmt in ("JPEG", "WEBP") else {}))
+            payload = buffer.getvalue()
+            corpus.append({
+                "name": f"{width}x{height}.{fmt.lower()}",
+                "bytes": len(payload),
+                "data_uri": f"data:image/{fmt.lower()};base64," + base64.b64encode(payload).decode(),
+            })
+    return corpus
+
+
+# =====================================================================
+# RUNTIMES
+# =====================================================================
+
+class TFLiteModel:
+    """Interpreter TFLite dengan interface ``predict(batch)`` seperti Keras"""
+
+    def __init__(self, keras_model):
+        import tensorflow as tf
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        self.interpreter = tf.lite.Interpreter(model_content=converter.convert())
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch = None
+
+    def predict(self, batch, verbose=0):
+        import numpy as np
+
+        batch = np.asarray(batch, dtype=self.input["dtype"])
+        if self._batch != len(batch):
+            self.interpreter.resize_tensor_input(self.input["index"], batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = len(batch)
+        self.interpreter.set_tensor(self.input["index"], batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output["index"])
+
+
+def load_runtime(name: str):
+    """Return (model, None) atau (None, alasan tidak tersedia)"""
+    from benchmarks.api import StubModel
+
+    if name == "stub":
+        return StubModel(), None
+    if name == "server":
+        import os
+        from src.config.settings import settings
+        from src.utils.model_server import ModelClient
+
+        if not os.path.exists(settings.model_server_socket):
+            return None, f"model server not running ({settings.model_server_socket}); start with python cli.py model:serve"
+        return ModelClient(settings.model_server_socket), None
+    if name not in ("keras", "tflite"):
+        return None, f"unknown runtime '{name}'"
+    try:
+        # Langsung dari file: get_model() bisa mengembalikan ModelClient (MODEL_SERVER_ENABLED)
+        from src.config.settings import settings
+        from src.utils.model_server import load_keras_model
+
+        keras_model = load_keras_model(settings.model_path)
+    except Exception as e:
+        return None, str(e)
+    if name == "keras":
+        return keras_model, None
+    try:
+        return TFLiteModel(keras_model), None
+    except Exception as e:
+        return None, f"TFLite conversion failed: {e}"
+
+
+# =====================================================================
+# MEASUREMENT
+# =====================================================================
+
+def _time(func: Callable[[], Any], repeat: int) -> Tuple[Dict[str, float], Any]:
+    result = func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }, result
+
+
+def stage_timings(model, corpus: List[Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    """Waktu per stage untuk setiap gambar corpus"""
+    from src.routes.predictRoutes import (
+        PredictionResponse, build_prediction, decode_base64, decode_image, normalize_image, resize_image,
+    )
+    from src.utils.responses import FastJSONResponse
+
+    rows = []
+    for item in corpus:
+        stages: Dict[str, Dict[str, float]] = {}
+        stages["base64"], raw = _time(lambda: decode_base64(item["data_uri"]), repeat)
+        stages["decode"], image = _time(lambda: decode_image(raw), repeat)
+        stages["resize"], resized = _time(lambda: resize_image(image), repeat)
+        stages["normalize"], batch = _time(lambda: normalize_image(resized), repeat)
+        stages["predict"], prediction = _time(lambda: model.predict(batch, verbose=0), repeat)
+
+        def respond():
+            payload = PredictionResponse.model_validate(build_prediction(prediction)).model_dump()
+            return FastJSONResponse(content=payload).body
+
+        stages["response"], _ = _time(respond, repeat)
+        total = sum(stage["median_ms"] for stage in stages.values())
+        rows.append({
+            "image": item["name"],
+            "bytes": item["bytes"],
+            "stages": stages,
+            "total_median_ms": round(total, 3),
+        })
+    return rows
+
+
+def batch_timings(model, repeat: int, batch_sizes=BATCH_SIZES) -> List[Dict[str, Any]]:
+    """model.predict per batch size (input sudah ter-normalisasi)"""
+    import numpy as np
+    from src.routes.predictRoutes import INPUT_SIZE
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in batch_sizes:
+        batch = rng.random((size, INPUT_SIZE[1], INPUT_SIZE[0], 3))
+        timing, _ = _time(lambda: model.predict(batch, verbose=0), repeat)
+        rows.append({
+            "batch_size": size,
+            "batch_median_ms": timing["median_ms"],
+            "per_image_ms": round(timing["median_ms"] / size, 3),
+            "images_per_second": round(size * 1000 / timing["median_ms"], 1) if timing["median_ms"] else 0.0,
+        })
+    return rows
+
+
+def run(runtimes: Optional[List[str]] = None, repeat: int = 20, seed: int = 42) -> Dict[str, Any]:
+    """Jalankan semua runtime, return hasil (siap di-dump ke JSON)"""
+    corpus = build_corpus(seed)
+    results: Dict[str, Any] = {"repeat": repeat, "corpus": [c["name"] for c in corpus], "runtimes": {}}
+    for name in runtimes or RUNTIMES:
+        model, reason = load_runtime(name)
+        if model is None:
+            results["runtimes"][name] = {"available": False, "reason": reason}
+            continue
+        results["runtimes"][name] = {
+            "available": True,
+            "stages": stage_timings(model, corpus, repeat),
+            "batches": batch_timings(model, repeat),
+        }
+    return results
+
+
+def main(runtimes: Optional[List[str]] = None, repeat: int = 20, json_path: Optional[str] = None):
+    print(f"🧠 Inference pipeline benchmark: {repeat} runs per stage")
+    results = run(runtimes, repeat)
+    stage_names = ("base64", "decode", "resize", "normalize", "predict", "response")
+
+    for name, result in results["runtimes"].items():
+        if not result["available"]:
+            print(f"\n  [{name}] unavailable: {result['reason']}")
+            continue
+        print(f"\n  [{name}] median ms per stage")
+        header = "".join(f"{stage:>11}" for stage in stage_names)
+        print(f"  {'image':<16}{header}{'total':>11}")
+        for row in result["stages"]:
+            cells = "".join(f"{row['stages'][stage]['median_ms']:>11.3f}" for stage in stage_names)
+            print(f"  {row['image']:<16}{cells}{row['total_median_ms']:>11.3f}")
+        print(f"  {'batch':<16}{'batch ms':>11}{'ms/image':>11}{'img/s':>11}")
+        for row in result["batches"]:
+            print(f"  {row['batch_size']:<16}{row['batch_median_ms']:>11.3f}{row['per_image_ms']:>11.3f}{row['images_per_second']:>11.1f}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Results written to {json_path}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
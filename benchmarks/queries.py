@@ -0,0 +1,83 @@
+"""
+Query budget check untuk handler utama.
+
+Menjalankan handler langsung (tanpa HTTP) di bawah ``query_budget`` dan
+melaporkan jumlah statement SQL + temuan N+1. Budget diambil dari
+``QUERY_BUDGETS`` (key sama dengan QueryInspectorMiddleware), jadi regresi
+N+1 terdeteksi sebelum sampai ke production.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def _cases(db, user_id: Optional[int]) -> List[Tuple[str, Callable[[], object]]]:
+    from src.handler.admin.manajemen_level import Level_Management
+    from src.handler.admin.manajemen_sublevel import SubLevel_Management
+    from src.handler.admin.master_kamus import Kamus_Management
+    from src.handler.admin.Manajemen_soal import SoalHandler as AdminSoalHandler
+    from src.handler.user.kerjakanSoal import SoalHandler as UserSoalHandler
+
+    cases = [
+        ("GET /api/admin/levels/", lambda: Level_Management(db).get_all_levels()),
+        ("GET /api/admin/sublevels/", lambda: SubLevel_Management(db).get_all_sublevels()),
+        ("GET /api/admin/kamus/", lambda: Kamus_Management(db).get_all_kamus()),
+        ("GET /api/admin/soal/list", lambda: AdminSoalHandler(db).list_soal(use_cache=False)),
+    ]
+    if user_id is not None:
+        cases += [
+            ("GET /api/user/soal/user/progress/summary",
+             lambda: UserSoalHandler(db).get_user_progress_summary(user_id)),
+            ("GET /api/user/soal/available-sublevels",
+             lambda: UserSoalHandler(db).get_available_sublevels(user_id)),
+        ]
+    return cases
+
+
+def run(db, user_id: Optional[int] = None) -> List[Dict[str, object]]:
+    """Jalankan semua case, return hasil per endpoint"""
+    from src.utils.query_inspector import QUERY_BUDGETS, QueryBudgetExceeded, query_budget
+
+    results = []
+    for name, call in _cases(db, user_id):
+        budget = QUERY_BUDGETS.get(name, 0)
+        passed = True
+        try:
+            with query_budget(budget or 10**6, name) as recorder:
+                call()
+        except QueryBudgetExceeded:
+            passed = False
+        db.rollback()
+        db.expire_all()  # Identity map kosong: case berikutnya tidak diuntungkan cache session
+        results.append({
+            "endpoint": name,
+            "queries": recorder.count,
+            "budget": budget,
+            "passed": passed,
+            "n_plus_one": recorder.n_plus_one(),
+        })
+    return results
+
+
+def main(user_id: Optional[int] = None) -> bool:
+    from src.database.db import SessionLocal
+
+    print("🔎 Query budget check")
+    db = SessionLocal()
+    try:
+        results = run(db, user_id)
+    finally:
+        db.close()
+
+    ok = True
+    for result in results:
+        status = "✅" if result["passed"] else "❌"
+        budget = result["budget"] or "-"
+        print(f"  {status} {result['endpoint']:<45} {result['queries']:>4} queries (budget {budget})")
+        for finding in result["n_plus_one"]:
+            origin = finding["origin"] or "unknown origin"
+            print(f"      N+1 x{finding['count']} at {origin}: {finding['statement'][:120]}")
+        ok = ok and result["passed"]
+    return ok
+
+
+if __name__ == "__main__":
+    main()
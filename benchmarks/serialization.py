@@ -0,0 +1,115 @@
+"""
+Serialization benchmark untuk payload list soal.
+
+Membandingkan tiga jalur response untuk payload realistis (default 2.000 soal,
+bentuk sama dengan ``SoalHandler._convert_to_list_data``):
+
+- ``stdlib_json``     : JSONResponse (json.dumps) - jalur lama /admin/soal/list
+- ``response_model``  : validasi SoalListResponse + jsonable_encoder + json.dumps
+                        (yang dilakukan FastAPI saat route me-return dict biasa)
+- ``fast_json``       : FastJSONResponse (orjson) tanpa re-validasi
+"""
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+
+def build_soal_payload(count: int = 2000, seed: int = 42) -> Dict[str, Any]:
+    """Payload list soal sintetis (deterministik per seed)"""
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    words = ["halo", "terima kasih", "maaf", "tolong", "selamat pagi", "apa kabar", "nama", "rumah"]
+    data: List[Dict[str, Any]] = []
+    for index in range(1, count + 1):
+        word = rng.choice(words)
+        created = base_time + timedelta(minutes=index * 7)
+        has_image = rng.random() < 0.6
+        has_video = rng.random() < 0.3
+        data.append({
+            "id": index,
+            "pertanyaan": f"Apa bahasa isyarat untuk kata '{word}' pada gambar berikut? (#{index})",
+            "jawaban_benar": word.upper(),
+            "dictionary_word": word,
+            "sublevel_name": f"Sublevel {index % 40 + 1}",
+            "level_name": f"Level {index % 8 + 1}",
+            "image_url": f"/storage/media/ab/cd/{index:064x}.jpg" if has_image else None,
+            "video_url": f"https://www.youtube.com/watch?v={index:011d}" if has_video else None,
+            "has_video": has_video,
+            "has_image": has_image,
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(days=1)).isoformat(),
+            "is_deleted": False,
+        })
+    return {
+        "success": True,
+        "message": f"Daftar soal berhasil diambil ({count} total)",
+        "data": data,
+        "total": count,
+        "filters": {
+            "search": None, "sublevel_id": None, "level_id": None, "dictionary_id": None,
+            "include_deleted": False, "sort_by": "created_at", "sort_order": "desc"
+        },
+        "cached": False,
+        "cache_ttl_seconds": 180,
+    }
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+    }
+
+
+def run(count: int = 2000, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """Jalankan benchmark, return hasil per jalur"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from src.dto.soal_dto import SoalListResponse
+    from src.utils.responses import FastJSONResponse
+
+    payload = build_soal_payload(count)
+
+    def stdlib_json():
+        return JSONResponse(content=payload).body
+
+    def response_model():
+        validated = SoalListResponse.model_validate(payload)
+        return JSONResponse(content=jsonable_encoder(validated)).body
+
+    def fast_json():
+        return FastJSONResponse(content=payload).body
+
+    results = {
+        "stdlib_json": _measure(stdlib_json, repeat),
+        "response_model": _measure(response_model, repeat),
+        "fast_json": _measure(fast_json, repeat),
+    }
+    results["payload"] = {"soal": count, "bytes": len(fast_json())}
+    return results
+
+
+def main(count: int = 2000, repeat: int = 20):
+    print(f"📊 Serialization benchmark: {count} soal, {repeat} runs")
+    results = run(count, repeat)
+    payload = results.pop("payload")
+    print(f"  payload size: {payload['bytes'] / 1024:.1f} KB")
+    baseline = results["response_model"]["median_ms"]
+    for name, stats in results.items():
+        speedup = baseline / stats["median_ms"] if stats["median_ms"] else 0
+        print(f"  {name:<16} median {stats['median_ms']:>8.2f} ms   mean {stats['mean_ms']:>8.2f} ms   x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
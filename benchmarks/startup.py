@@ -0,0 +1,103 @@
+"""
+Startup-time budget: laporan ``python -X importtime`` untuk ``src.app.main``.
+
+Import dijalankan di subprocess baru (tanpa cache modul dari proses CLI),
+lalu dilaporkan total waktu import, modul paling lambat (cumulative dan self)
+dan rekap per top-level package. Gagal jika melebihi
+``settings.startup_budget_ms`` (env STARTUP_BUDGET_MS), sehingga worker
+restart / autoscaling tetap cepat.
+"""
+import os
+import re
+import sys
+import json
+import subprocess
+from typing import Any, Dict, List, Optional
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Baris ``import time: self | cumulative | module`` -> list dict (us)"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(indent) - 1) // 2,
+            })
+    return rows
+
+
+def measure(target: str = "src.app.main") -> Dict[str, Any]:
+    """Import ``target`` di subprocess dengan -X importtime"""
+    env = dict(os.environ)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {target}; "
+        "print(f'__WALL_MS__={(time.perf_counter() - started) * 1000:.1f}')"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if completed.returncode != 0:
+        tail = "\n".join(line for line in completed.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"Importing {target} failed:\n{tail[-2000:]}")
+
+    wall = re.search(r"__WALL_MS__=([\d.]+)", completed.stdout)
+    rows = parse_importtime(completed.stderr)
+    packages: Dict[str, int] = {}
+    for row in rows:
+        top = row["module"].split(".")[0]
+        packages[top] = packages.get(top, 0) + row["self_us"]
+    return {
+        "target": target,
+        "wall_ms": float(wall.group(1)) if wall else None,
+        "import_ms": round(sum(row["self_us"] for row in rows) / 1000, 1),
+        "modules": len(rows),
+        "top_cumulative": sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:20],
+        "top_self": sorted(rows, key=lambda r: r["self_us"], reverse=True)[:20],
+        "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:15]),
+    }
+
+
+def main(target: str = "src.app.main", budget_ms: Optional[int] = None, json_path: Optional[str] = None) -> bool:
+    from src.config.settings import settings
+
+    budget_ms = budget_ms or settings.startup_budget_ms
+    print(f"⏱️ Import time report: {target} (budget {budget_ms} ms)")
+    report = measure(target)
+
+    print(f"  wall: {report['wall_ms']} ms   import (sum self): {report['import_ms']} ms   modules: {report['modules']}")
+    print("\n  Slowest modules (cumulative):")
+    for row in report["top_cumulative"]:
+        print(f"    {row['cumulative_us'] / 1000:>9.1f} ms  {row['module']}")
+    print("\n  Slowest modules (self):")
+    for row in report["top_self"][:10]:
+        print(f"    {row['self_us'] / 1000:>9.1f} ms  {row['module']}")
+    print("\n  By top-level package (self):")
+    for package, total_us in report["packages"].items():
+        print(f"    {total_us / 1000:>9.1f} ms  {package}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Report written to {json_path}")
+
+    elapsed = report["wall_ms"] or report["import_ms"]
+    ok = elapsed <= budget_ms
+    print(f"\n{'✅' if ok else '❌'} Startup import {elapsed} ms (budget {budget_ms} ms)")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
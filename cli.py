@@ -7,6 +7,14 @@ import sys
 import subprocess
 import shutil
 from pathlib import Path
+
+# bench:api: env benchmark diset sebelum settings (immutable) dimuat oleh import src
+if sys.argv[1:2] == ['bench:api']:
+    from benchmarks.api import apply_environment
+    apply_environment()
+
+from src.config.logging_config import setup_logging
+setup_logging(fmt="text", use_queue=False)  # CLI: output langsung, format mudah dibaca
 from src.database.seeder import run_all_seeders, run_seeder
 from src.database.db import db_config, Base
 from sqlalchemy import text
@@ -150,9 +158,53 @@ Migration Commands (Alembic):
 Seeder Commands:
   db:seed                   Run all database seeders
   db:seed <SeederName>      Run specific seeder
+  db:seed --synthetic <n> [progress] [seed]
+                            Bulk-generate n users x progress rows (deterministic)
+
+Synthetic Data Commands:
+  db:synthetic [users] [seed] [--option=value]
+                            Generate a reproducible production-scale dataset
+                            (default 100000 users, seed 42). Options: --levels,
+                            --sublevels-per-level, --kamus, --soal-per-sublevel,
+                            --badges, --media-files, --avatar-ratio, --chunk-size
+  db:synthetic:purge [seed] Remove the synthetic dataset for a seed
+
+Database Index Commands:
+  db:indexes                Create missing hot-path indexes (CONCURRENTLY, idempotent)
+  db:explain                EXPLAIN key queries and check they use the expected index
+
+Maintenance Commands:
+  streak:maintain           Recalculate streak expiry, freezes and tiers
+  streak:maintain <date>    Run maintenance as of date (YYYY-MM-DD)
+
+Storage Commands:
+  storage:gc                Remove unreferenced media files
+  storage:gc --dry-run      Show orphan media files without removing
+  storage:migrate-legacy    Import legacy uploads into the media store
+  storage:variants          Backfill thumbnail/WebP variants for existing images
+  storage:variants --force  Regenerate all variants
+  storage:catalog           Record existing files in the storage catalog
+
+Benchmark Commands:
+  bench:serialize [n]       Serialization time for an n-soal list payload (default 2000)
+  bench:queries [user_id]   Check SQL query budgets / N+1 on main handlers
+  bench:api [requests]      In-process load test: rps, p50/p95/p99, queries per scenario
+                            vs benchmarks/baselines/api.json. Flags: --scenario=<name>,
+                            --update-baseline, --real-model (default: stub predict model)
+  bench:inference [repeat]  Time each /predict stage per image size/format and batch size.
+                            Flags: --runtime=stub,keras,tflite,server  --json=<path>
+  bench:startup [budget_ms] python -X importtime report for src.app.main; fails over
+                            STARTUP_BUDGET_MS (default 2000). Flags: --json=<path>
+
+Server Commands:
+  serve                     Production server: gunicorn + uvicorn workers (gunicorn.conf.py).
+                            Flags: --workers=<n>  --model-server (one shared model process;
+                            without it every worker loads its own TensorFlow model)
+  model:serve               Run the model server in the foreground (MODEL_SERVER_SOCKET)
 
 Development Commands:
   dev                       Start development server
+  config:show               Print effective settings (secrets redacted)
 
 Examples:
   python cli.py migrate:create "Add new column to users"
@@ -160,7 +212,12 @@ Examples:
   python cli.py migrate:fresh-seed
   python cli.py migrate
   python cli.py db:seed
+  python cli.py db:seed --synthetic 10000
+  python cli.py db:synthetic 100000 42 --kamus=20000
+  python cli.py streak:maintain
+  python cli.py storage:gc --dry-run
   python cli.py dev
+  python cli.py serve --workers=4 --model-server
     """)
 
 def main():
@@ -213,7 +270,15 @@ def main():
             
         # Seeder commands
         elif command == 'db:seed':
-            if len(sys.argv) > 2:
+            if len(sys.argv) > 3 and sys.argv[2] == '--synthetic':
+                # Synthetic load-test data: db:seed --synthetic <users> [progress_per_user] [seed]
+                from src.database.seeder import run_synthetic_seeder
+                users = int(sys.argv[3])
+                progress_per_user = int(sys.argv[4]) if len(sys.argv) > 4 else None
+                seed = int(sys.argv[5]) if len(sys.argv) > 5 else 42
+                print(f"🌱 Running synthetic seeder: {users} users")
+                run_synthetic_seeder(users, progress_per_user=progress_per_user, seed=seed)
+            elif len(sys.argv) > 2:
                 # Specific seeder
                 seeder_name = sys.argv[2]
                 print(f"🌱 Running seeder: {seeder_name}")
@@ -223,10 +288,189 @@ def main():
                 print("🌱 Running all seeders...")
                 run_all_seeders()
                 
+        elif command == 'db:synthetic':
+            # db:synthetic [users] [seed] [--kamus=5000 --soal-per-sublevel=100 ...]
+            from src.database.synthetic import SyntheticConfig, generate_dataset
+            positional = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+            options = {}
+            for arg in sys.argv[2:]:
+                if arg.startswith('--') and '=' in arg:
+                    key, value = arg[2:].split('=', 1)
+                    options[key.replace('-', '_')] = float(value) if '.' in value else int(value)
+            if positional:
+                options['users'] = int(positional[0])
+            if len(positional) > 1:
+                options['seed'] = int(positional[1])
+            config = SyntheticConfig(**options)
+            print(f"🧪 Generating synthetic dataset: {config.as_dict()}")
+            result = generate_dataset(config)
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Synthetic dataset ready!")
+            
+        elif command == 'db:synthetic:purge':
+            from src.database.synthetic import purge_dataset
+            seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+            print(f"🧹 Removing synthetic dataset (seed={seed})...")
+            result = purge_dataset(seed)
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Synthetic dataset removed!")
+                
+        # Maintenance commands
+        elif command == 'db:indexes':
+            from src.database.indexes import ensure_indexes
+            print("🗂️ Creating missing indexes...")
+            result = ensure_indexes(db_config.engine)
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Indexes ready!")
+            
+        elif command == 'db:explain':
+            from src.database.indexes import explain_key_queries
+            print("🔎 Checking index usage on key queries...")
+            results = explain_key_queries(db_config.engine)
+            for result in results:
+                status = "✅" if result["passed"] else "❌"
+                used = ", ".join(result["indexes_used"]) or "seq scan"
+                print(f"  {status} {result['query']:<38} expected {result['expected_index']} (used: {used})")
+            if not all(result["passed"] for result in results):
+                sys.exit(1)
+            
+        elif command == 'streak:maintain':
+            from datetime import date
+            from src.utils.streak_maintenance import run_streak_maintenance
+            run_date = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else None
+            print("🔥 Running streak maintenance...")
+            result = run_streak_maintenance(today=run_date)
+            if result["success"]:
+                for key, value in result["data"].items():
+                    print(f"  {key}: {value}")
+                print("✅ Streak maintenance completed!")
+            else:
+                print(f"❌ {result['message']}")
+                
+        # Storage commands
+        elif command == 'storage:gc':
+            from src.utils.media_store import media_store
+            dry_run = '--dry-run' in sys.argv[2:]
+            print(f"🧹 Collecting orphan media files{' (dry run)' if dry_run else ''}...")
+            db = db_config.SessionLocal()
+            try:
+                result = media_store.gc(db, dry_run=dry_run)
+            finally:
+                db.close()
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Media GC completed!")
+            
+        elif command == 'storage:migrate-legacy':
+            from src.utils.media_store import media_store
+            from src.utils.FileHandler import STORAGE_FOLDERS
+            print("📦 Importing legacy uploads into media store...")
+            db = db_config.SessionLocal()
+            try:
+                result = media_store.migrate_legacy(db, STORAGE_FOLDERS)
+            finally:
+                db.close()
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Legacy migration completed!")
+            
+        elif command == 'storage:variants':
+            from src.utils.image_variants import backfill, available_formats
+            from src.utils.FileHandler import STORAGE_FOLDERS
+            force = '--force' in sys.argv[2:]
+            print(f"🖼️ Generating image variants ({', '.join(available_formats()) or 'Pillow not installed'})...")
+            result = backfill(STORAGE_FOLDERS, force=force)
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Variant backfill completed!")
+            
+        elif command == 'storage:catalog':
+            from src.utils.storage_catalog import storage_catalog
+            from src.utils.FileHandler import STORAGE_FOLDERS
+            print("🗂️ Recording existing files in storage catalog...")
+            db = db_config.SessionLocal()
+            try:
+                result = storage_catalog.backfill(db, STORAGE_FOLDERS)
+            finally:
+                db.close()
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Storage catalog backfill completed!")
+            
+        # Benchmark commands
+        elif command == 'bench:serialize':
+            from benchmarks.serialization import main as run_serialization_benchmark
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+            run_serialization_benchmark(count)
+            
+        elif command == 'bench:queries':
+            from benchmarks.queries import main as run_query_check
+            user_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            if not run_query_check(user_id):
+                sys.exit(1)
+            
+        elif command == 'bench:api':
+            from benchmarks.api import main as run_api_benchmark
+            positional = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+            scenarios = [arg.split('=', 1)[1] for arg in sys.argv[2:] if arg.startswith('--scenario=')]
+            requests = int(positional[0]) if positional else None
+            kwargs = {"requests": requests} if requests else {}
+            ok = run_api_benchmark(
+                names=scenarios or None,
+                update_baseline='--update-baseline' in sys.argv[2:],
+                use_real_model='--real-model' in sys.argv[2:],
+                **kwargs,
+            )
+            if not ok:
+                sys.exit(1)
+            
+        elif command == 'bench:inference':
+            from benchmarks.inference import main as run_inference_benchmark
+            positional = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+            runtimes = [arg.split('=', 1)[1] for arg in sys.argv[2:] if arg.startswith('--runtime=')]
+            json_path = next((arg.split('=', 1)[1] for arg in sys.argv[2:] if arg.startswith('--json=')), None)
+            repeat = int(positional[0]) if positional else 20
+            run_inference_benchmark(
+                runtimes=[r for value in runtimes for r in value.split(',')] or None,
+                repeat=repeat,
+                json_path=json_path,
+            )
+            
+        elif command == 'bench:startup':
+            from benchmarks.startup import main as run_startup_benchmark
+            positional = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+            json_path = next((arg.split('=', 1)[1] for arg in sys.argv[2:] if arg.startswith('--json=')), None)
+            budget_ms = int(positional[0]) if positional else None
+            if not run_startup_benchmark(budget_ms=budget_ms, json_path=json_path):
+                sys.exit(1)
+            
         # Development commands
         elif command == 'dev':
             print("🚀 Starting development server...")
-            subprocess.run(['uvicorn', 'src.main:app', '--reload', '--host', '0.0.0.0', '--port', '8000'])
+            subprocess.run(['uvicorn', 'src.app.main:app', '--reload', '--host', '0.0.0.0', '--port', '8000'])
+            
+        elif command == 'serve':
+            workers = next((arg.split('=', 1)[1] for arg in sys.argv[2:] if arg.startswith('--workers=')), None)
+            if workers:
+                os.environ['WEB_CONCURRENCY'] = workers
+            if '--model-server' in sys.argv[2:]:
+                os.environ['MODEL_SERVER_ENABLED'] = 'true'
+            os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/mauna-metrics')
+            print("🚀 Starting production server (gunicorn)...")
+            # exec: gunicorn menerima signal (HUP/TERM) langsung
+            os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'src.app.main:app'])
+            
+        elif command == 'model:serve':
+            from src.utils.model_server import serve
+            serve()
+            
+        elif command == 'config:show':
+            from src.config.settings import settings
+            for key, value in settings.as_dict().items():
+                print(f"  {key:<28} {value}")
             
         elif command == 'help' or command == '--help' or command == '-h':
             show_help()
@@ -0,0 +1,23 @@
+#!/bin/sh
+# Entrypoint container: serve (default) | dev | model-server | <command lain>
+set -e
+
+case "$1" in
+  serve)
+    shift
+    # Default container: satu model server untuk semua worker (bukan satu model TF per worker)
+    export MODEL_SERVER_ENABLED="${MODEL_SERVER_ENABLED:-true}"
+    # /metrics menjumlahkan semua worker (snapshot per worker)
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/mauna-metrics}"
+    exec gunicorn -c gunicorn.conf.py "$@" src.app.main:app
+    ;;
+  dev)
+    exec uvicorn src.app.main:app --host 0.0.0.0 --port "${PORT:-8000}" --reload
+    ;;
+  model-server)
+    exec python cli.py model:serve
+    ;;
+  *)
+    exec "$@"
+    ;;
+esac
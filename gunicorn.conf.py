@@ -0,0 +1,80 @@
+"""
+Profil production: gunicorn (process manager) + UvicornWorker.
+
+    python cli.py serve                 # atau: gunicorn -c gunicorn.conf.py src.app.main:app
+    docker run <image>                  # docker-entrypoint.sh serve
+
+Semua nilai dari src/config/settings.py (WEB_CONCURRENCY, GUNICORN_*,
+MODEL_SERVER_*). Signal:
+- HUP  : graceful reload worker (config dibaca ulang; dengan preload, kode
+         aplikasi baru ikut ter-load hanya lewat USR2 lalu QUIT master lama)
+- TERM : graceful shutdown (tunggu request berjalan, maks GUNICORN_GRACEFUL_TIMEOUT)
+- TTIN/TTOU : tambah/kurangi worker
+"""
+from src.config.settings import settings
+
+bind = f"{settings.host}:{settings.port}"
+workers = settings.web_concurrency
+worker_class = "uvicorn.workers.UvicornWorker"
+proc_name = "mauna-api"
+
+# ✅ App di-import sekali di master lalu di-fork (copy-on-write, startup worker cepat).
+# TensorFlow tidak di-load di master (lazy di get_model / model server).
+preload_app = settings.gunicorn_preload
+
+timeout = settings.gunicorn_timeout
+graceful_timeout = settings.gunicorn_graceful_timeout
+keepalive = settings.gunicorn_keepalive
+
+# ✅ Worker recycling: batasi pertumbuhan memori (fragmentasi, cache per proses)
+max_requests = settings.gunicorn_max_requests
+max_requests_jitter = settings.gunicorn_max_requests_jitter
+
+# Log aplikasi lewat logging_config (JSON di production); access log gunicorn tidak dipakai
+errorlog = "-"
+loglevel = settings.log_level.lower()
+
+_model_server = None
+
+
+def on_starting(server):
+    """Master: start model server sebelum worker pertama di-fork"""
+    global _model_server
+    if settings.metrics_enabled:
+        if settings.metrics_multiproc_dir:
+            from src.utils.metrics import clear_multiproc_dir
+
+            clear_multiproc_dir(settings.metrics_multiproc_dir)
+        elif workers > 1:
+            server.log.warning(
+                "PROMETHEUS_MULTIPROC_DIR not set: /metrics only reports the worker that serves the scrape"
+            )
+    if settings.model_server_enabled and settings.model_server_managed:
+        from src.utils.model_server import ModelServerProcess
+
+        _model_server = ModelServerProcess(settings.model_server_socket)
+        _model_server.start()
+        # Thread monitor di master: child yang mati (OOM, crash TF) di-start ulang
+        _model_server.watch()
+        server.log.info(f"Model server ready on {settings.model_server_socket}")
+
+
+def post_fork(server, worker):
+    """Worker: jangan pakai koneksi pool yang ikut ter-fork dari master (preload)"""
+    if preload_app:
+        from src.database.db import db_config
+
+        db_config.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Master: counter/histogram worker yang berhenti tetap ikut di /metrics"""
+    if settings.metrics_enabled and settings.metrics_multiproc_dir:
+        from src.utils.metrics import registry
+
+        registry.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _model_server is not None:
+        _model_server.stop()
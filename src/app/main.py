@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 import os
-from dotenv import load_dotenv
+
+# ✅ Settings (.env dimuat sekali) + logging dikonfigurasi sebelum modul lain di-import
+from src.config.settings import settings
+from src.config.logging_config import setup_logging, shutdown_logging
+setup_logging()
 
 # Import konfigurasi dan database
 from src.config.middleware import setup_middleware
@@ -11,24 +15,28 @@ from src.database import connect_db, disconnect_db
 from src.routes import api_router, test_router, predict_router
 from src.utils.FileHandler import router as file_router
 from src.routes.storageRoutes import router as storage_router
-
-# Load environment variables
-load_dotenv()
+from src.routes.metricsRoutes import router as metrics_router
+from src.utils.activity_writer import activity_writer
+from src.utils.metrics import metrics_writer
+from src.utils.streak_maintenance import streak_scheduler
+from src.utils.image_variants import variant_worker
+from src.utils.responses import FastJSONResponse
 
 # Inisialisasi aplikasi
 app = FastAPI(
-    title=os.getenv("API_TITLE", "Mauna API"),
-    description=os.getenv("API_DESCRIPTION", "Sign Language Learning Platform API"),
-    version=os.getenv("API_VERSION", "1.0.0"),
+    title=settings.api_title,
+    description=settings.api_description,
+    version=settings.api_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse  # ✅ orjson untuk semua response default
 )
 
 # ✅ Get environment configuration
-environment = os.getenv("ENVIRONMENT", "development")
-cors_origins = os.getenv("ALLOWED_ORIGINS", "*")
-cors_credentials = os.getenv("CORS_ALLOW_CREDENTIALS", "false").lower() == "true"
-rate_limit = int(os.getenv("RATE_LIMIT", "60"))
+environment = settings.environment
+cors_origins = settings.cors_origins
+cors_credentials = settings.cors_allow_credentials
+rate_limit = settings.rate_limit
 
 print("\n" + "=" * 70)
 print("🚀 MAUNA API - CONFIGURATION")
@@ -63,6 +71,14 @@ async def startup():
     print("=" * 70)
     await connect_db()
     print("✅ Database connected!")
+    activity_writer.start()
+    print("✅ Activity writer started!")
+    if settings.metrics_multiproc_dir:
+        metrics_writer.start()
+        print(f"✅ Metrics snapshots -> {settings.metrics_multiproc_dir}")
+    if settings.streak_job_enabled:
+        streak_scheduler.start()
+        print("✅ Streak maintenance scheduler started!")
     print("=" * 70)
     print("📍 AVAILABLE ENDPOINTS:")
     print("")
@@ -76,6 +92,7 @@ async def startup():
     print("      - GET  /predict/health    (Prediction health)")
     print("      - GET  /predict/classes   (Available classes)")
     print("      - GET  /storage/*         (Public files)")
+    print("      - GET  /metrics           (Prometheus metrics)")
     print("")
     print("   🔒 PROTECTED (Requires Bearer token):")
     print("      - GET  /api/user/profile  (User profile)")
@@ -94,14 +111,20 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Shutdown event"""
+    streak_scheduler.stop()
+    variant_worker.shutdown()
+    activity_writer.stop()
+    metrics_writer.stop()
     await disconnect_db()
     print("\n👋 Application stopped gracefully\n")
+    shutdown_logging()
 
 # ✅ Register routers
 # 1. PUBLIC ROUTES (No authentication)
 app.include_router(test_router, tags=["Root"])
 app.include_router(predict_router, tags=["ML Prediction"])
 app.include_router(storage_router, tags=["Storage"])
+app.include_router(metrics_router, tags=["Monitoring"])
 
 # 2. PROTECTED ROUTES (Authentication required)
 app.include_router(api_router, tags=["API"])
@@ -110,8 +133,8 @@ app.include_router(file_router, tags=["File Upload"])
 if __name__ == "__main__":
     import uvicorn
     
-    port = int(os.getenv("PORT", "8000"))
-    host = os.getenv("HOST", "0.0.0.0")
+    port = settings.port
+    host = settings.host
     
     print(f"\n🚀 Starting server on {host}:{port}")
     print(f"📝 Environment: {environment}")
@@ -2,53 +2,44 @@
 Configuration package for SMT 5 application.
 
 This package contains:
-- Database configuration and connection management
+- Settings (.env dimuat sekali)
 - JWT configuration
 - CORS configuration
 - Password hashing utilities
-- Database seeding
-"""
+- Logging
 
+Export di-load secara lazy (PEP 562): ``from src.config.settings import settings``
+tidak ikut meng-import middleware, database dan bcrypt.
+"""
+import importlib
 
-# CORS exports
-from .cors import (
-    CORSConfig,
-    cors_config,
-    get_development_cors,
-    get_production_cors
-)
-
-
-# Password hash exports
-from .hash import (  # Ubah dari .hash ke .password_hash
-    PasswordManager,
-    password_manager,
-    hash_password,
-    verify_password
-)
-
-from .middleware import (
-    JWTAuthMiddleware,
-    RateLimitMiddleware,
-    EnhancedCORSMiddleware
-)
-__all__ = [
-    
+# nama export -> submodule
+_EXPORTS = {
     # CORS
-    'CORSConfig',
-    'cors_config',
-    'get_development_cors',
-    'get_production_cors',
-  
+    'CORSConfig': 'cors',
+    'cors_config': 'cors',
+    'get_development_cors': 'cors',
+    'get_production_cors': 'cors',
+
     # Password Hash
-    'PasswordManager',
-    'password_manager',
-    'hash_password',
-    'verify_password',
-    
+    'PasswordManager': 'hash',
+    'password_manager': 'hash',
+    'hash_password': 'hash',
+    'verify_password': 'hash',
+
     # Middleware
-    'JWTAuthMiddleware',
-    'RateLimitMiddleware',
-    'EnhancedCORSMiddleware'
-    
-]
\ No newline at end of file
+    'JWTAuthMiddleware': 'middleware',
+    'RateLimitMiddleware': 'middleware',
+    'EnhancedCORSMiddleware': 'middleware',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
-import os
+from .settings import settings
 
 class CORSConfig:
     """CORS configuration class"""
@@ -14,7 +14,7 @@ class CORSConfig:
         allow_headers: Optional[List[str]] = None
     ):
         # ✅ Default to allow all origins in development
-        environment = os.getenv("ENVIRONMENT", "development")
+        environment = settings.environment
         
         if environment == "production" and origins:
             self.origins = origins
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import queue
+import uuid
+import atexit
+import random
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .settings import settings
+
+# =====================================================================
+# SETTINGS
+# =====================================================================
+
+ENVIRONMENT = settings.environment
+LOG_LEVEL = settings.log_level
+# json (default production) | text (default development)
+LOG_FORMAT = settings.log_format
+# Handler non-blocking: record masuk queue, ditulis ke stdout oleh thread listener
+LOG_ASYNC = settings.log_async
+# Sampling per level atau per event, mis. "DEBUG=0.1,quiz.completed=0.25,file.saved=0.1"
+# WARNING ke atas tidak pernah di-sample
+LOG_SAMPLE_RATES = settings.log_sample_rates
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atribut bawaan LogRecord; sisanya (extra=...) ikut ditulis ke JSON
+_RESERVED = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime", "request_id"}
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        key, value = item.split("=", 1)
+        try:
+            rates[key.strip()] = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+# =====================================================================
+# FILTERS & FORMATTERS
+# =====================================================================
+
+class RequestContextFilter(logging.Filter):
+    """Tempel request_id dari contextvar (harus jalan di thread pemanggil, bukan listener)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Sampling untuk event frekuensi tinggi.
+
+    Rate dicari berdasarkan ``extra={"event": ...}`` lalu level name. Keputusan
+    di-hash dari request_id sehingga satu request tercatat utuh atau tidak sama sekali.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rates.get(getattr(record, "event", None) or "", self.rates.get(record.levelname))
+        if rate is None or rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            return (uuid.uuid5(uuid.NAMESPACE_OID, request_id).int % 10_000) < rate * 10_000
+        return random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu record = satu baris JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        return super().format(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler yang mempertahankan field extra & traceback terpisah (untuk JSON)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+# =====================================================================
+# SETUP
+# =====================================================================
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configured = False
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, use_queue: bool = LOG_ASYNC) -> None:
+    """Konfigurasi root logger (idempotent). Panggil sekali sebelum import modul aplikasi"""
+    global _listener, _configured
+    if _configured:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if use_queue:
+        handler = _QueueHandler(queue.SimpleQueue())
+        _listener = logging.handlers.QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        # Thread listener tidak ikut ter-fork (gunicorn --preload): start ulang di child
+        os.register_at_fork(after_in_child=_restart_listener)
+    else:
+        handler = stream_handler
+
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES)))
+    root.addHandler(handler)
+    _configured = True
+
+
+def _restart_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener = logging.handlers.QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush sisa queue ke stdout"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# =====================================================================
+# REQUEST ID MIDDLEWARE
+# =====================================================================
+
+class RequestIdMiddleware:
+    """Pure ASGI: ambil/generate X-Request-ID, simpan di contextvar, kembalikan di response"""
+
+    header_name = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == self.header_name:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header_name, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
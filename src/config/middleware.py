@@ -5,20 +5,25 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-import os
-from dotenv import load_dotenv
+import logging
 import time
 import re
 from typing import Callable, List, Optional, Union, Dict, Any, Awaitable
 from datetime import datetime, timedelta
 
-# Load environment variables
-load_dotenv()
+from ..database.db import get_db
+from ..utils.http_cache import ConditionalCacheMiddleware, CompressionMiddleware
+from ..utils.metrics import MetricsMiddleware, METRICS_ENABLED
+from ..utils.query_inspector import QueryInspectorMiddleware, QUERY_DEBUG
+from .logging_config import RequestIdMiddleware
+from .settings import settings
 
-# JWT Config
-SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key_here")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+logger = logging.getLogger(__name__)
+
+# JWT Config (sama dengan database/connect.py JWTConfig, sumber: settings)
+SECRET_KEY = settings.jwt_secret_key
+ALGORITHM = settings.jwt_algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 # OAuth2 scheme untuk dependency injection
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
@@ -253,7 +258,7 @@ class EnhancedCORSMiddleware(BaseHTTPMiddleware):
            (isinstance(allow_origins, list) and "*" in allow_origins):
             self.allow_origins = "*"
             self.allow_credentials = False  # ✅ Force False with wildcard
-            print("⚠️  CORS: Using wildcard origin (*), credentials disabled")
+            logger.warning("⚠️  CORS: Using wildcard origin (*), credentials disabled")
         else:
             self.allow_origins = allow_origins
             self.allow_credentials = allow_credentials
@@ -262,8 +267,8 @@ class EnhancedCORSMiddleware(BaseHTTPMiddleware):
         self.allow_headers = allow_headers
         self.max_age = max_age
         self.expose_headers = expose_headers or [
-            "Content-Length", "Content-Type", "X-Process-Time",
-            "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"
+            "Content-Length", "Content-Type", "X-Process-Time", "ETag", "X-Query-Count",
+            "X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"
         ]
     
     async def dispatch(self, request: Request, call_next):
@@ -411,32 +416,19 @@ auth_manager = AuthManager()
 # =============================================================================
 # CLEAN DEPENDENCIES FOR ROUTES - FIXED
 # =============================================================================
+# ✅ Semua dependency memakai Depends(get_db): FastAPI meng-cache dependency
+# per request, jadi auth dan handler berbagi satu session yang ditutup
+# otomatis setelah response selesai.
 
-def get_current_user(request: Request, db: Session = Depends(lambda: None)) -> Any:
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> Any:
     """
     Clean dependency untuk mendapatkan current user
     Menggunakan request.state yang sudah diset oleh middleware
     """
-    # Import database dependency inside function to avoid circular imports
-    from ..database import get_db
-    
-    # Get fresh db session if not provided
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
-    
     return auth_manager.get_current_user_from_state(request, db)
 
-def require_admin(request: Request, db: Session = Depends(lambda: None)) -> Any:
+def require_admin(request: Request, db: Session = Depends(get_db)) -> Any:
     """Clean dependency untuk require admin role"""
-    # Import database dependency inside function
-    from ..database import get_db
-    
-    # Get fresh db session if not provided
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
-    
     user = auth_manager.get_current_user_from_state(request, db)
     
     # Import here to avoid circular imports
@@ -449,16 +441,8 @@ def require_admin(request: Request, db: Session = Depends(lambda: None)) -> Any:
         )
     return user
 
-def require_moderator_or_admin(request: Request, db: Session = Depends(lambda: None)) -> Any:
+def require_moderator_or_admin(request: Request, db: Session = Depends(get_db)) -> Any:
     """Clean dependency untuk require moderator atau admin role"""
-    # Import database dependency inside function
-    from ..database import get_db
-    
-    # Get fresh db session if not provided
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
-    
     user = auth_manager.get_current_user_from_state(request, db)
     
     # Import here to avoid circular imports
@@ -471,16 +455,8 @@ def require_moderator_or_admin(request: Request, db: Session = Depends(lambda: N
         )
     return user
 
-def require_user_or_above(request: Request, db: Session = Depends(lambda: None)) -> Any:
+def require_user_or_above(request: Request, db: Session = Depends(get_db)) -> Any:
     """Clean dependency untuk require minimal user role (semua role)"""
-    # Import database dependency inside function
-    from ..database import get_db
-    
-    # Get fresh db session if not provided
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
-    
     return auth_manager.get_current_user_from_state(request, db)
 
 # =============================================================================
@@ -502,6 +478,16 @@ def setup_middleware(
         "/static/.*", "/storage/.*", "/favicon.ico", "/predict/.*", "/api/*", "/*"
     ]
     
+    # ✅ Query inspector (dev/test): query count, N+1 detector, budget per endpoint
+    if QUERY_DEBUG in ("warn", "strict"):
+        app.add_middleware(QueryInspectorMiddleware, mode=QUERY_DEBUG)
+        logger.info(f"✅ Query inspector enabled ({QUERY_DEBUG})")
+    
+    # ✅ HTTP caching layer: ETag/304 dari version counter, lalu brotli/gzip
+    app.add_middleware(ConditionalCacheMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    logger.info("✅ Conditional GET (ETag) & response compression configured")
+    
     # ✅ SIMPLIFIED CORS - Always allow all origins by default
     # Hanya gunakan specific origins jika explicitly set di environment
     
@@ -522,7 +508,7 @@ def setup_middleware(
             allow_credentials=False,  # ✅ MUST be False with wildcard
             max_age=600
         )
-        print(f"✅ CORS configured: Allow all origins (*), no credentials [{environment}]")
+        logger.info(f"✅ CORS configured: Allow all origins (*), no credentials [{environment}]")
     else:
         # ✅ Specific origins (when explicitly configured)
         if isinstance(cors_origins, str):
@@ -534,22 +520,30 @@ def setup_middleware(
             EnhancedCORSMiddleware,
             allow_origins=origins_list,
             allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-            allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With"],
+            allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With", "X-Request-ID"],
             allow_credentials=cors_allow_credentials,  # Can be True with specific origins
             max_age=3600
         )
-        print(f"✅ CORS configured: Specific origins {origins_list}, credentials={cors_allow_credentials} [{environment}]")
+        logger.info(f"✅ CORS configured: Specific origins {origins_list}, credentials={cors_allow_credentials} [{environment}]")
     
     # Setup Rate Limiting
     app.add_middleware(RateLimitMiddleware, rate_limit_per_minute=rate_limit)
-    print(f"✅ Rate limit: {rate_limit} requests/minute")
+    logger.info(f"✅ Rate limit: {rate_limit} requests/minute")
     
     # Setup JWT Authentication
     app.add_middleware(
         JWTAuthMiddleware,
         public_paths=jwt_public_paths or default_public_paths
     )
-    print("✅ JWT authentication configured")
+    logger.info("✅ JWT authentication configured")
+    
+    # ✅ Metrics paling luar: latency mencakup auth, rate limit dan CORS
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        logger.info("✅ Metrics enabled at /metrics")
+    
+    # ✅ Request ID paling luar: semua log (termasuk metrics/auth) membawa request_id
+    app.add_middleware(RequestIdMiddleware)
     
     return app
 # Export semua yang dibutuhkan
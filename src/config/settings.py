@@ -0,0 +1,251 @@
+"""
+Settings aplikasi, dimuat sekali per proses.
+
+.env dibaca satu kali di sini (bukan ``load_dotenv()`` di setiap modul);
+modul lain cukup ``from ..config.settings import settings``. Semua knob
+performa (pool DB, TTL/ukuran cache, rate limit, worker, chunk size, logging,
+HTTP) ada di satu tempat, sehingga tuning cukup lewat environment.
+
+Settings immutable (frozen dataclass) dan tidak bisa dimuat ulang: override
+environment (test, benchmark) harus diset sebelum ``src`` di-import. Modul ini
+tidak boleh meng-import modul ``src`` lain agar bisa di-load paling awal.
+"""
+import os
+from dataclasses import dataclass, fields
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Default dev; di production SECRET_KEY wajib diset
+DEFAULT_SECRET_KEY = "your_secret_key_here"
+
+
+def env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Snapshot environment saat startup"""
+
+    # App
+    environment: str
+    api_title: str
+    api_description: str
+    api_version: str
+    host: str
+    port: int
+
+    # HTTP
+    cors_origins: str
+    cors_allow_credentials: bool
+    rate_limit: int  # request per menit per client
+    compression_min_size: int
+    gzip_level: int
+    brotli_quality: int
+    etag_version_ttl: float  # detik version counter di-cache per proses
+    metrics_enabled: bool
+    metrics_multiproc_dir: str  # kosong = registry per proses (satu worker)
+    metrics_flush_interval: float
+    max_upload_size_mb: int
+    storage_accel_redirect: bool
+    storage_accel_prefix: str
+
+    # Auth (satu sumber untuk middleware.py dan database/connect.py)
+    jwt_secret_key: str
+    jwt_algorithm: str
+    access_token_expire_minutes: int
+    jwt_expiration: int  # detik
+
+    # Database
+    database_hostname: str
+    database_port: str
+    database_username: str
+    database_password: str
+    database_name: str
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: int
+    db_pool_recycle: int  # -1 = tidak pernah
+    db_pool_pre_ping: bool
+    db_echo: bool
+
+    # Cache
+    admin_stats_ttl: int
+    soal_cache_ttl: int
+    thumbnail_cache_max_files: int
+    media_gc_grace_seconds: int
+
+    # Background workers / jobs
+    streak_job_enabled: bool
+    streak_job_time: str
+    activity_flush_interval: float
+    activity_max_pending: int
+    image_variant_workers: int
+
+    # Bulk operations / seeding
+    user_bulk_chunk_size: int
+    seed_chunk_size: int
+    seed_workers: int
+    seed_copy_batch: int
+
+    # Production server (gunicorn.conf.py)
+    web_concurrency: int
+    gunicorn_preload: bool
+    gunicorn_timeout: int
+    gunicorn_graceful_timeout: int
+    gunicorn_keepalive: int
+    gunicorn_max_requests: int  # recycle worker setelah N request (0 = tidak pernah)
+    gunicorn_max_requests_jitter: int
+
+    # Inference
+    model_path: str
+    model_server_enabled: bool  # True: satu proses model, worker lewat Unix socket
+    model_server_managed: bool  # False: model server dijalankan terpisah (model:serve / sidecar)
+    model_server_socket: str
+    model_server_timeout: float
+    model_server_start_timeout: float
+    model_server_watch_interval: float  # detik antar cek proses model server (restart jika mati)
+    inference_batch_size: int
+    inference_batch_wait_ms: float
+
+    # Logging
+    log_level: str
+    log_format: str
+    log_async: bool
+    log_sample_rates: str
+
+    # Query inspector (dev/test)
+    query_debug: str
+    query_n_plus_one_threshold: int
+    query_budget_default: int
+
+    # Startup: budget waktu import src.app.main (python cli.py bench:startup)
+    startup_budget_ms: int
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        environment = env_str("ENVIRONMENT", "development")
+        access_token_expire_minutes = env_int("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
+        jwt_secret_key = env_str("SECRET_KEY", DEFAULT_SECRET_KEY)
+        if environment == "production" and jwt_secret_key == DEFAULT_SECRET_KEY:
+            raise ValueError("SECRET_KEY must be set in production")
+
+        return cls(
+            environment=environment,
+            api_title=env_str("API_TITLE", "Mauna API"),
+            api_description=env_str("API_DESCRIPTION", "Sign Language Learning Platform API"),
+            api_version=env_str("API_VERSION", "1.0.0"),
+            host=env_str("HOST", "0.0.0.0"),
+            port=env_int("PORT", 8000),
+
+            cors_origins=env_str("ALLOWED_ORIGINS", "*"),
+            cors_allow_credentials=env_bool("CORS_ALLOW_CREDENTIALS", False),
+            rate_limit=env_int("RATE_LIMIT", 60),
+            compression_min_size=env_int("HTTP_COMPRESSION_MIN_SIZE", 1024),
+            gzip_level=env_int("HTTP_GZIP_LEVEL", 5),
+            brotli_quality=env_int("HTTP_BROTLI_QUALITY", 5),
+            etag_version_ttl=env_float("HTTP_ETAG_VERSION_TTL", 1.0),
+            metrics_enabled=env_bool("METRICS_ENABLED", True),
+            metrics_multiproc_dir=env_str("PROMETHEUS_MULTIPROC_DIR", ""),
+            metrics_flush_interval=env_float("METRICS_FLUSH_INTERVAL", 5.0),
+            max_upload_size_mb=env_int("MAX_UPLOAD_SIZE_MB", 10),
+            storage_accel_redirect=env_bool("STORAGE_ACCEL_REDIRECT", False),
+            storage_accel_prefix=env_str("STORAGE_ACCEL_PREFIX", "/_protected_storage/"),
+
+            jwt_secret_key=jwt_secret_key,
+            jwt_algorithm=env_str("ALGORITHM", "HS256"),
+            access_token_expire_minutes=access_token_expire_minutes,
+            jwt_expiration=env_int("JWT_EXPIRATION", access_token_expire_minutes * 60),
+
+            database_hostname=env_str("DATABASE_HOSTNAME", "localhost"),
+            database_port=env_str("DATABASE_PORT", "5432"),
+            database_username=env_str("DATABASE_USERNAME", "postgres"),
+            database_password=env_str("DATABASE_PASSWORD", "postgres"),
+            database_name=env_str("DATABASE_NAME", "mauna"),
+            db_pool_size=env_int("DB_POOL_SIZE", 5),
+            db_max_overflow=env_int("DB_MAX_OVERFLOW", 10),
+            db_pool_timeout=env_int("DB_POOL_TIMEOUT", 30),
+            db_pool_recycle=env_int("DB_POOL_RECYCLE", -1),
+            db_pool_pre_ping=env_bool("DB_POOL_PRE_PING", False),
+            db_echo=env_bool("DB_ECHO", False),
+
+            admin_stats_ttl=env_int("ADMIN_STATS_TTL", 60),
+            soal_cache_ttl=env_int("SOAL_CACHE_TTL", 180),
+            thumbnail_cache_max_files=env_int("THUMBNAIL_CACHE_MAX_FILES", 500),
+            media_gc_grace_seconds=env_int("MEDIA_GC_GRACE_SECONDS", 3600),
+
+            streak_job_enabled=env_bool("STREAK_JOB_ENABLED", True),
+            streak_job_time=env_str("STREAK_JOB_TIME", "00:05"),
+            activity_flush_interval=env_float("ACTIVITY_FLUSH_INTERVAL", 5.0),
+            activity_max_pending=env_int("ACTIVITY_MAX_PENDING", 1000),
+            image_variant_workers=env_int("IMAGE_VARIANT_WORKERS", 1),
+
+            user_bulk_chunk_size=env_int("USER_BULK_CHUNK_SIZE", 1000),
+            seed_chunk_size=env_int("SEED_CHUNK_SIZE", 1000),
+            seed_workers=env_int("SEED_WORKERS", 4),
+            seed_copy_batch=env_int("SEED_COPY_BATCH", 50000),
+
+            web_concurrency=env_int("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1),
+            gunicorn_preload=env_bool("GUNICORN_PRELOAD", True),
+            gunicorn_timeout=env_int("GUNICORN_TIMEOUT", 60),
+            gunicorn_graceful_timeout=env_int("GUNICORN_GRACEFUL_TIMEOUT", 30),
+            gunicorn_keepalive=env_int("GUNICORN_KEEPALIVE", 5),
+            gunicorn_max_requests=env_int("GUNICORN_MAX_REQUESTS", 1000),
+            gunicorn_max_requests_jitter=env_int("GUNICORN_MAX_REQUESTS_JITTER", 100),
+
+            model_path=env_str("MODEL_PATH", "ml/mauna.h5"),
+            model_server_enabled=env_bool("MODEL_SERVER_ENABLED", False),
+            model_server_managed=env_bool("MODEL_SERVER_MANAGED", True),
+            model_server_socket=env_str("MODEL_SERVER_SOCKET", "/tmp/mauna-model.sock"),
+            model_server_timeout=env_float("MODEL_SERVER_TIMEOUT", 30.0),
+            model_server_start_timeout=env_float("MODEL_SERVER_START_TIMEOUT", 120.0),
+            model_server_watch_interval=env_float("MODEL_SERVER_WATCH_INTERVAL", 5.0),
+            inference_batch_size=env_int("INFERENCE_BATCH_SIZE", 8),
+            inference_batch_wait_ms=env_float("INFERENCE_BATCH_WAIT_MS", 5.0),
+
+            log_level=env_str("LOG_LEVEL", "INFO").upper(),
+            # json (default production) | text (default development)
+            log_format=env_str("LOG_FORMAT", "text" if environment == "development" else "json").lower(),
+            log_async=env_bool("LOG_ASYNC", True),
+            log_sample_rates=env_str("LOG_SAMPLE_RATES", ""),
+
+            query_debug=env_str("QUERY_DEBUG", "off").lower(),
+            query_n_plus_one_threshold=env_int("QUERY_N_PLUS_ONE_THRESHOLD", 5),
+            query_budget_default=env_int("QUERY_BUDGET_DEFAULT", 0),
+
+            startup_budget_ms=env_int("STARTUP_BUDGET_MS", 2000),
+        )
+
+    @property
+    def is_development(self) -> bool:
+        return self.environment == "development"
+
+    def as_dict(self, redact: bool = True) -> dict:
+        """Untuk log/CLI; secret di-redact"""
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        if redact:
+            values["jwt_secret_key"] = "***"
+            values["database_password"] = "***" if self.database_password else ""
+        return values
+
+
+settings = Settings.from_env()
+
+
+def get_settings() -> Settings:
+    """Dependency FastAPI: ``settings: Settings = Depends(get_settings)``"""
+    return settings
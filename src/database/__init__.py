@@ -1,66 +1,50 @@
-# Database exports
-from .db import (
-    db_config,
-    engine,
-    SessionLocal,
-    Base,
-    database,
-    metadata,
-    get_db
-)
+"""
+Database package: engine/session, koneksi async dan seeder.
 
-# Connection and JWT exports
-from .connect import (
-    connect_db,
-    disconnect_db,
-    test_connection,
-    create_tables,
-    print_config,
-    JWT_SECRET,
-    JWT_EXPIRATION,
-    JWT_ALGORITHM,
-    DATABASE_URL,
-    jwt_config
-)
+Export di-load secara lazy (PEP 562) sehingga ``from src.database.db import ...``
+tidak ikut meng-import connect/seeder.
+"""
+import importlib
 
-# Seeder exports
-from .seeder import (
-    run_all_seeders,
-    run_seeder,
-    list_seeders,
-    BaseSeeder,
-    registry,
-)
-
-# Note: Seeders are auto-discovered by registry.discover_seeders()
-# No need to manually import them here
-
-__all__ = [
+# nama export -> submodule
+_EXPORTS = {
     # Database
-    'db_config',
-    'engine',
-    'SessionLocal',
-    'Base',
-    'database',
-    'metadata',
-    'get_db',
-    
+    'db_config': 'db',
+    'engine': 'db',
+    'SessionLocal': 'db',
+    'Base': 'db',
+    'database': 'db',
+    'metadata': 'db',
+    'get_db': 'db',
+
     # Connection & JWT
-    'connect_db',
-    'disconnect_db',
-    'test_connection',
-    'create_tables',
-    'print_config',
-    'JWT_SECRET',
-    'JWT_EXPIRATION',
-    'JWT_ALGORITHM',
-    'DATABASE_URL',
-    'jwt_config',
-    
+    'connect_db': 'connect',
+    'disconnect_db': 'connect',
+    'test_connection': 'connect',
+    'create_tables': 'connect',
+    'print_config': 'connect',
+    'JWT_SECRET': 'connect',
+    'JWT_EXPIRATION': 'connect',
+    'JWT_ALGORITHM': 'connect',
+    'DATABASE_URL': 'connect',
+    'jwt_config': 'connect',
+
     # Seeder
-    'run_all_seeders',
-    'run_seeder',
-    'list_seeders',
-    'BaseSeeder',
-    'registry',
-]
\ No newline at end of file
+    # Note: Seeders are auto-discovered by registry.discover_seeders()
+    'run_all_seeders': 'seeder',
+    'run_seeder': 'seeder',
+    'list_seeders': 'seeder',
+    'BaseSeeder': 'seeder',
+    'registry': 'seeder',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
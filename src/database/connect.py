@@ -1,18 +1,15 @@
-import os
-from dotenv import load_dotenv
 from .db import db_config
-
-# Load environment variables
-load_dotenv()
+from ..config.settings import settings
 
 # JWT Configuration
 class JWTConfig:
     """JWT configuration class"""
     
     def __init__(self):
-        self.secret = os.getenv("SECRET_KEY", "your_jwt_secret_key")
-        self.expiration = int(os.getenv("JWT_EXPIRATION", "3600"))
-        self.algorithm = "HS256"
+        # ✅ Sama dengan config/middleware.py (token dibuat & diverifikasi di sana)
+        self.secret = settings.jwt_secret_key
+        self.expiration = settings.jwt_expiration
+        self.algorithm = settings.jwt_algorithm
     
     def get_settings(self) -> dict:
         """Get JWT settings as dictionary"""
@@ -1,33 +1,36 @@
-import os
+import logging
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from databases import Database
-from dotenv import load_dotenv
 from typing import Generator, Optional
 from sqlalchemy.orm import sessionmaker, Session
 
-# Load environment variables from a .env file
-load_dotenv()
+from ..config.settings import settings
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
 class DatabaseConfig:
     """Database configuration class to manage database connections and metadata."""
 
     def __init__(self):
-        self.hostname = os.getenv("DATABASE_HOSTNAME", "localhost")
-        self.port = os.getenv("DATABASE_PORT", "5432")
-        self.username = os.getenv("DATABASE_USERNAME", "postgres")
-        self.password = os.getenv("DATABASE_PASSWORD", "postgres")
-        self.database_name = os.getenv("DATABASE_NAME", "mauna")
+        self.hostname = settings.database_hostname
+        self.port = settings.database_port
+        self.username = settings.database_username
+        self.password = settings.database_password
+        self.database_name = settings.database_name
         
-        # Debug: Print actual values being used
-        print(f"[DEBUG] Database Config:")
-        print(f"   Host: {self.hostname}")
-        print(f"   Port: {self.port}")
-        print(f"   Database: {self.database_name}")
-        print(f"   Username: {self.username}")
-        print(f"   Password: {'***' if self.password else 'EMPTY'}")
+        logger.debug(
+            "Database config",
+            extra={
+                "db_host": self.hostname,
+                "db_port": self.port,
+                "db_name": self.database_name,
+                "db_user": self.username,
+                "db_password_set": bool(self.password),
+            },
+        )
         
         # Validate required environment variables
         if not all([self.hostname, self.port, self.username, self.database_name]):
@@ -43,10 +46,16 @@ class DatabaseConfig:
         else:
             self.database_url = f"postgresql://{self.username}@{self.hostname}:{self.port}/{self.database_name}"
         
-        print(f"   Database URL: postgresql://{self.username}:***@{self.hostname}:{self.port}/{self.database_name}")
-        
         # SQLAlchemy setup
-        self.engine = create_engine(self.database_url, echo=False)
+        self.engine = create_engine(
+            self.database_url,
+            echo=settings.db_echo,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         self.Base = Base  # Use the global Base
         
@@ -60,6 +69,11 @@ class DatabaseConfig:
         try:
             db = self.SessionLocal()
             yield db
+        except Exception:
+            # Unit of work gagal: jangan biarkan transaksi setengah jalan kembali ke pool
+            if db is not None:
+                db.rollback()
+            raise
         finally:
             if db is not None:
                 db.close()
@@ -68,23 +82,21 @@ class DatabaseConfig:
         """Connect to the database."""
         try:
             await self.database.connect()
-            print(f"[SUCCESS] Database connected: {self.hostname}:{self.port}/{self.database_name}")
+            logger.info(f"Database connected: {self.hostname}:{self.port}/{self.database_name}")
         except Exception as e:
-            print(f"[ERROR] Database connection failed: {e}")
-            print(f"[DEBUG] Connection details:")
-            print(f"   Host: {self.hostname}")
-            print(f"   Port: {self.port}")
-            print(f"   Database: {self.database_name}")
-            print(f"   Username: {self.username}")
+            logger.error(
+                f"Database connection failed: {e}",
+                extra={"db_host": self.hostname, "db_port": self.port, "db_name": self.database_name, "db_user": self.username},
+            )
             raise
             
     async def disconnect_db(self):
         """Disconnect from database (async)"""
         try:
             await self.database.disconnect()
-            print("[SUCCESS] Database disconnected")
+            logger.info("Database disconnected")
         except Exception as e:
-            print(f"[ERROR] Error disconnecting database: {e}")
+            logger.error(f"Error disconnecting database: {e}")
             
     async def test_connection(self):
         """Test database connection (async)"""
@@ -93,11 +105,11 @@ class DatabaseConfig:
             query = "SELECT 1"
             result = await self.database.fetch_one(query)
             if result and result[0] == 1:
-                print("[SUCCESS] Database connection test successful")
+                logger.info("Database connection test successful")
             else:
-                print("[ERROR] Database connection test failed")
+                logger.error("Database connection test failed")
         except Exception as e:
-            print(f"[ERROR] Database connection test error: {e}")
+            logger.error(f"Database connection test error: {e}")
         finally:
             await self.database.disconnect()
             
@@ -105,9 +117,9 @@ class DatabaseConfig:
         """Create database tables based on the defined models."""
         try:
             self.Base.metadata.create_all(bind=self.engine)
-            print("[SUCCESS] Database tables created")
+            logger.info("Database tables created")
         except Exception as e:
-            print(f"[ERROR] Error creating database tables: {e}")
+            logger.error(f"Error creating database tables: {e}")
 
 # Create global database instance
 db_config = DatabaseConfig()
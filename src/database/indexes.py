@@ -0,0 +1,139 @@
+"""
+Index hot-path (soft delete) dan pengecekan EXPLAIN.
+
+Index dideklarasikan di model (``__table_args__``) sehingga ikut ter-generate
+oleh ``alembic revision --autogenerate`` / ``migrate:fresh``. Untuk database
+yang sudah berjalan, ``ensure_indexes`` membuat index yang belum ada dengan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS (tanpa lock tulis panjang).
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from .db import Base
+
+# Tabel hot-path yang index-nya dikelola di sini
+MANAGED_TABLES = ("users", "soal", "sublevel", "kamus", "progress")
+
+# (nama, SQL, index yang harus dipakai planner)
+KEY_QUERIES: List[Tuple[str, str, str]] = [
+    (
+        "login by email",
+        "SELECT id FROM users WHERE email = 'a@example.com' OR username = 'a@example.com'",
+        "ix_users_email",
+    ),
+    (
+        "login by username",
+        "SELECT id FROM users WHERE email = 'alice' OR username = 'alice'",
+        "ix_users_username",
+    ),
+    (
+        "sublevels per level (learner/admin)",
+        "SELECT id FROM sublevel WHERE level_id = 1 AND deleted_at IS NULL ORDER BY id",
+        "idx_sublevel_level_active",
+    ),
+    (
+        "soal per sublevel (start quiz)",
+        "SELECT id FROM soal WHERE sublevel_id = 1 AND deleted_at IS NULL ORDER BY id",
+        "idx_soal_sublevel_active",
+    ),
+    (
+        "soal per kamus",
+        "SELECT id FROM soal WHERE dictionary_id = 1 AND deleted_at IS NULL",
+        "idx_soal_dictionary_active",
+    ),
+    (
+        "admin soal list",
+        "SELECT id FROM soal WHERE deleted_at IS NULL ORDER BY created_at DESC LIMIT 50",
+        "idx_soal_created_active",
+    ),
+    (
+        "kamus per kategori",
+        "SELECT id FROM kamus WHERE category = 'ALPHABET' AND deleted_at IS NULL ORDER BY word_text",
+        "idx_kamus_category_word_active",
+    ),
+    (
+        "progress per user",
+        "SELECT id FROM progress WHERE user_id = 1",
+        "uq_user_sublevel_progress",
+    ),
+    (
+        "progress per sublevel",
+        "SELECT id FROM progress WHERE sublevel_id = 1",
+        "idx_progress_sublevel_id",
+    ),
+]
+
+
+def managed_indexes():
+    """Semua Index model pada tabel hot-path"""
+    import src.models  # noqa: F401 - registrasi semua model ke metadata
+
+    for table_name in MANAGED_TABLES:
+        table = Base.metadata.tables[table_name]
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            yield index
+
+
+def ensure_indexes(engine: Engine) -> Dict[str, int]:
+    """Buat index yang belum ada secara CONCURRENTLY (idempotent)"""
+    dialect = postgresql.dialect()
+    created = skipped = 0
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = {
+            row[0] for row in conn.execute(
+                text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+            )
+        }
+        for index in managed_indexes():
+            if index.name in existing:
+                skipped += 1
+                continue
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+            ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+            ddl = ddl.replace("CREATE UNIQUE INDEX", "CREATE UNIQUE INDEX CONCURRENTLY", 1)
+            conn.execute(text(ddl))
+            created += 1
+    return {"created": created, "existing": skipped}
+
+
+def _index_names(plan: Any) -> List[str]:
+    names = []
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.append(plan["Index Name"])
+        for child in plan.get("Plans", []):
+            names.extend(_index_names(child))
+    return names
+
+
+def explain_key_queries(engine: Engine) -> List[Dict[str, Any]]:
+    """
+    EXPLAIN query hot-path dan cek index yang diharapkan dipakai.
+
+    enable_seqscan dimatikan (hanya di transaksi ini) agar hasil tidak
+    bergantung pada jumlah baris: yang dicek adalah index *bisa* dipakai.
+    """
+    results = []
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            for name, sql, expected in KEY_QUERIES:
+                plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                used = _index_names(plan[0]["Plan"])
+                results.append({
+                    "query": name,
+                    "expected_index": expected,
+                    "indexes_used": used,
+                    "passed": expected in used,
+                })
+        finally:
+            trans.rollback()
+    return results
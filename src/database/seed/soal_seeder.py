@@ -19,6 +19,8 @@ except ImportError:
 
 class SoalSeeder(BaseSeeder):
     """Seed Soal dengan auto-assignment foreign keys"""
+
+    depends_on = ("CompleteSeeder",)
     
     def __init__(self):
         super().__init__()
@@ -335,17 +337,17 @@ class SoalSeeder(BaseSeeder):
             }
         ]
 
+        # ✅ Satu query cek soal yang sudah ada + INSERT multi-row, bukan query dan add() per soal
+        questions = [data["question"] for data in soal_data]
+        existing = {
+            row[0] for row in self.db.query(Soal.question).filter(Soal.question.in_(questions)).all()
+        }
+        new_rows = [data for data in soal_data if data["question"] not in existing]
+
         for data in soal_data:
-            # Check if soal already exists
-            existing = self.db.query(Soal).filter(Soal.question == data["question"]).first()
-            if existing:
+            if data["question"] in existing:
                 print(f"  ⚠️ Soal already exists: {data['question'][:50]}...")
-                continue
-
-            # Create new soal
-            soal = Soal(**data)
-            self.db.add(soal)
-            print(f"  ✅ Created soal: {data['question'][:50]}...")
 
+        created_count = self.bulk_insert(Soal, new_rows)
         self.db.commit()
-        print("  💾 Soal data committed to database")
+        print(f"  💾 Soal data committed to database. Created {created_count} soal.")
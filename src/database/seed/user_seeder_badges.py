@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, select, update, func
 from datetime import datetime, timedelta
 import random
 
@@ -11,6 +11,8 @@ from ..seeder import BaseSeeder
 
 class UserSeederBadges(BaseSeeder):
     """Seeder untuk memberikan badges kepada users berdasarkan ID"""
+
+    depends_on = ("UserSeeder", "BadgeSeeder")
     
     def run(self):
         """Run the user badge seeder"""
@@ -48,22 +50,46 @@ class UserSeederBadges(BaseSeeder):
             "janedoe": [1, 2],  # "First Steps" and "Alphabet Master"
         }
         
-        assigned_count = 0
-        for user in users:
-            username = str(user.username)
-            if username in user_badge_mapping:
-                badge_ids = user_badge_mapping[username]
-                user_assigned = self.assign_badges_by_id(user, badge_ids)
-                assigned_count += user_assigned
-                
-                # Update user's total_badges count - ensure we have proper user_id
-                if user_assigned > 0:
-                    user_id = int(user.id) if user.id is not None else None # type: ignore
-                    if user_id is not None:
-                        setattr(user, "total_badges", self._get_user_badge_count(user_id))
+        # ✅ Set-based: satu INSERT ... ON CONFLICT DO NOTHING untuk semua pasangan,
+        # lalu total_badges dihitung ulang dalam satu UPDATE
+        user_ids = {str(user.username): user.id for user in users}
+        badge_ids = {badge.id for badge in badges}
+        now = datetime.utcnow()
+        rows = []
+        for username, wanted in user_badge_mapping.items():
+            user_id = user_ids.get(username)
+            if user_id is None:
+                continue
+            for badge_id in wanted:
+                if badge_id in badge_ids:
+                    rows.append({"user_id": user_id, "badge_id": badge_id, "earned_at": now})
+                else:
+                    print(f"    ❌ Badge ID {badge_id} not found")
+
+        inserted = self.bulk_insert(
+            user_badge_association,
+            rows,
+            on_conflict_do_nothing=True,
+            returning=[user_badge_association.c.user_id],
+        )
+        assigned_count = len(inserted)
+        affected = sorted({row[0] for row in inserted})
+        if affected:
+            badge_count = (
+                select(func.count())
+                .select_from(user_badge_association)
+                .where(user_badge_association.c.user_id == User.id)
+                .scalar_subquery()
+            )
+            self.db.execute(
+                update(User)
+                .where(User.id.in_(affected))
+                .values(total_badges=badge_count)
+                .execution_options(synchronize_session=False)
+            )
                     
         self.db.commit()
-        print(f"  ✅ Assigned {assigned_count} badges to users.")
+        print(f"  ✅ Assigned {assigned_count} badges to users ({len(rows) - assigned_count} already owned).")
     def assign_badges_by_id(self, user: User, badge_ids: List[int]) -> int:
         """Assign specific badge IDs to user"""
         assigned_count = 0
@@ -74,23 +100,36 @@ class UserSeederBadges(BaseSeeder):
             print(f"    ❌ Invalid user ID for {user.username}")
             return 0
         
+        # ✅ Dua query per user (badge yang dimiliki + nama badge), bukan dua query per badge
+        owned = self._user_badge_ids(user_id)
+        badge_names = {
+            badge_id: nama
+            for badge_id, nama in self.db.query(Badge.id, Badge.nama).filter(Badge.id.in_(badge_ids)).all()
+        }
+        
         for badge_id in badge_ids:
             # Check if user already has this badge
-            if not self._user_has_badge(user_id, badge_id):
-                # Get badge name for logging
-                badge = self.db.query(Badge).filter(Badge.id == badge_id).first()
-                if badge:
+            if badge_id not in owned:
+                if badge_id in badge_names:
                     self._award_badge(user_id, badge_id) # type: ignore
+                    owned.add(badge_id)
                     assigned_count += 1
-                    print(f"    ✅ {user.username} earned '{badge.nama}' (ID: {badge_id})")
+                    print(f"    ✅ {user.username} earned '{badge_names[badge_id]}' (ID: {badge_id})")
                 else:
                     print(f"    ❌ Badge ID {badge_id} not found")
             else:
-                badge = self.db.query(Badge).filter(Badge.id == badge_id).first()
-                badge_name = badge.nama if badge else f"ID {badge_id}"
+                badge_name = badge_names.get(badge_id, f"ID {badge_id}")
                 print(f"    ⚠️ {user.username} already has '{badge_name}'")
         
         return assigned_count
+    def _user_badge_ids(self, user_id) -> set:
+        """Badge IDs yang sudah dimiliki user (satu query)"""
+        rows = self.db.execute(
+            text("SELECT badge_id FROM user_badges WHERE user_id = :user_id"),
+            {"user_id": user_id}
+        ).all()
+        return {row[0] for row in rows}
+
     def _user_has_badge(self, user_id, badge_id) -> bool:
         """Check if user already has this badge"""
         result = self.db.execute(
@@ -1,12 +1,133 @@
+import io
+import csv
+import enum
+import time
+import random
 import pkgutil
 import importlib
 import inspect
-from typing import List, Type, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import List, Type, Dict, Any, Iterable, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from .db import db_config
+from ..config.settings import settings
+
+# Baris per statement INSERT ... VALUES (batas parameter Postgres: 65535 per statement)
+SEED_CHUNK_SIZE = settings.seed_chunk_size
+# Jumlah seeder independen yang jalan paralel (1 = serial)
+SEED_WORKERS = settings.seed_workers
+# Baris per batch COPY (buffer CSV di memori)
+SEED_COPY_BATCH = settings.seed_copy_batch
+
+
+# =====================================================================
+# BULK INSERT API
+# =====================================================================
+
+def _table_of(target):
+    return getattr(target, "__table__", target)
+
+
+def _chunks(rows: Sequence[Dict[str, Any]], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def bulk_insert(
+    db: Session,
+    target,
+    rows: Sequence[Dict[str, Any]],
+    chunk_size: int = SEED_CHUNK_SIZE,
+    on_conflict_do_nothing: bool = False,
+    returning: Optional[Sequence[Any]] = None,
+):
+    """
+    Multi-row INSERT ... VALUES per chunk (satu round-trip per chunk, bukan per baris).
+
+    ``target`` boleh model ORM (default Python kolom ikut diisi dan version
+    counter cache ikut di-bump) atau Table. Return jumlah baris yang masuk,
+    atau list baris RETURNING jika ``returning`` diisi. Tidak commit.
+    """
+    rows = list(rows)
+    inserted = 0
+    returned: List[Any] = []
+    for chunk in _chunks(rows, chunk_size):
+        stmt = pg_insert(target).values(chunk)
+        if on_conflict_do_nothing:
+            stmt = stmt.on_conflict_do_nothing()
+        if returning is not None:
+            returned.extend(db.execute(stmt.returning(*returning)).all())
+        else:
+            inserted += db.execute(stmt).rowcount or 0
+    return returned if returning is not None else inserted
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return r"\N"
+    if isinstance(value, enum.Enum):
+        return value.name  # SQLAlchemy Enum menyimpan nama member
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(
+    db: Session,
+    target,
+    rows: Iterable[Sequence[Any]],
+    columns: Sequence[str],
+    batch_size: int = SEED_COPY_BATCH,
+) -> int:
+    """
+    COPY ... FROM STDIN (CSV) lewat koneksi session, dalam transaksi yang sama.
+
+    Paling cepat untuk volume besar, tapi melewati default Python/ORM dan event
+    SQLAlchemy: semua kolom NOT NULL tanpa server default wajib diisi.
+    ``rows`` berupa tuple sesuai urutan ``columns`` (boleh generator); buffer
+    dikirim per ``batch_size`` baris agar memori tetap kecil. Tidak commit.
+    """
+    table = _table_of(target)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    sql = f"COPY \"{table.name}\" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    cursor = db.connection().connection.cursor()
+
+    def flush(buffer: io.StringIO):
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+    count = 0
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        pending = 0
+        for row in rows:
+            writer.writerow([_copy_value(value) for value in row])
+            pending += 1
+            if pending >= batch_size:
+                flush(buffer)
+                count += pending
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                pending = 0
+        if pending:
+            flush(buffer)
+            count += pending
+    finally:
+        cursor.close()
+    return count
+
 
 class BaseSeeder:
     """Base seeder class"""
+
+    # Nama class seeder yang harus selesai lebih dulu (urutan eksekusi paralel)
+    depends_on: Tuple[str, ...] = ()
     
     def __init__(self):
         self.db: Session = db_config.SessionLocal()
@@ -14,6 +135,14 @@ class BaseSeeder:
     def run(self):
         """Override this method in child classes"""
         raise NotImplementedError("Subclass must implement run method")
+
+    def bulk_insert(self, target, rows, **kwargs):
+        """Shortcut ``bulk_insert`` dengan session seeder"""
+        return bulk_insert(self.db, target, rows, **kwargs)
+
+    def copy_rows(self, target, rows, columns):
+        """Shortcut ``copy_rows`` dengan session seeder"""
+        return copy_rows(self.db, target, rows, columns)
     
     def close(self):
         """Close database session"""
@@ -83,8 +212,47 @@ class SeederRegistry:
 # Global registry instance
 registry = SeederRegistry()
 
-def run_all_seeders():
-    """Run all discovered seeders"""
+def seeder_waves(seeders: List[Type[BaseSeeder]]) -> List[List[Type[BaseSeeder]]]:
+    """
+    Kelompokkan seeder per gelombang berdasarkan ``depends_on`` (topological sort).
+
+    Seeder dalam satu gelombang saling independen dan boleh jalan paralel.
+    Dependency yang tidak terdaftar diabaikan (mis. seeder dijalankan sebagian).
+    """
+    by_name = {seeder.__name__: seeder for seeder in seeders}
+    pending = {
+        name: {dep for dep in seeder.depends_on if dep in by_name}
+        for name, seeder in by_name.items()
+    }
+    waves = []
+    done = set()
+    while pending:
+        ready = sorted(name for name, deps in pending.items() if deps <= done)
+        if not ready:
+            raise ValueError(f"Circular seeder dependency: {sorted(pending)}")
+        waves.append([by_name[name] for name in ready])
+        done.update(ready)
+        for name in ready:
+            del pending[name]
+    return waves
+
+
+def _run_one(SeederClass: Type[BaseSeeder]) -> Tuple[str, bool, float, Optional[str]]:
+    started = time.perf_counter()
+    seeder = None
+    try:
+        seeder = SeederClass()
+        seeder.run()
+        return SeederClass.__name__, True, time.perf_counter() - started, None
+    except Exception as e:
+        return SeederClass.__name__, False, time.perf_counter() - started, str(e)
+    finally:
+        if seeder is not None:
+            seeder.close()
+
+
+def run_all_seeders(workers: int = SEED_WORKERS):
+    """Run all discovered seeders, gelombang demi gelombang (paralel di dalam gelombang)"""
     seeders = registry.get_seeders()
     
     if not seeders:
@@ -92,22 +260,37 @@ def run_all_seeders():
         return
     
     print("Starting database seeding...")
+    started = time.perf_counter()
+    failed = set()
+
+    for wave in seeder_waves(seeders):
+        runnable = []
+        for SeederClass in wave:
+            blocked = failed.intersection(SeederClass.depends_on)
+            if blocked:
+                print(f"Skipped: {SeederClass.__name__} (dependency failed: {', '.join(sorted(blocked))})")
+                failed.add(SeederClass.__name__)
+            else:
+                runnable.append(SeederClass)
+        if not runnable:
+            continue
+
+        print(f"Running {', '.join(s.__name__ for s in runnable)}...")
+        if workers > 1 and len(runnable) > 1:
+            # Tiap seeder punya session sendiri, jadi aman di thread terpisah
+            with ThreadPoolExecutor(max_workers=min(workers, len(runnable))) as pool:
+                results = list(pool.map(_run_one, runnable))
+        else:
+            results = [_run_one(SeederClass) for SeederClass in runnable]
+
+        for name, ok, elapsed, error in results:
+            if ok:
+                print(f"Success: {name} completed ({elapsed:.2f}s)")
+            else:
+                failed.add(name)
+                print(f"Error: Seeder {name} failed: {error}")
     
-    for SeederClass in seeders:
-        try:
-            print(f"Running {SeederClass.__name__}...")
-            seeder = SeederClass()
-            seeder.run()
-            seeder.close()
-            print(f"Success: {SeederClass.__name__} completed")
-        except Exception as e:
-            print(f"Error: Seeder {SeederClass.__name__} failed: {e}")
-            try:
-                seeder.close()
-            except:
-                pass
-    
-    print("Database seeding completed")
+    print(f"Database seeding completed ({time.perf_counter() - started:.2f}s)")
 
 def run_seeder(seeder_name: str):
     """Run specific seeder by name"""
@@ -127,6 +310,84 @@ def run_seeder(seeder_name: str):
     except Exception as e:
         print(f"Error: {seeder_name} failed: {e}")
 
+# =====================================================================
+# SYNTHETIC DATA (load test)
+# =====================================================================
+
+def seed_synthetic_users(
+    users: int,
+    progress_per_user: Optional[int] = None,
+    seed: int = 42,
+    chunk_size: int = SEED_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Generate ``users`` user sintetis + baris progress per sublevel (deterministik dari ``seed``).
+
+    User di-insert dengan INSERT ... VALUES ON CONFLICT DO NOTHING (idempotent:
+    menjalankan ulang dengan seed sama tidak menduplikasi), progress lewat COPY
+    hanya untuk user yang baru dibuat. Butuh sublevel (jalankan CompleteSeeder dulu).
+    Dataset lengkap (kamus, soal, badge, media): lihat ``synthetic.generate_dataset``.
+    """
+    from ..config.hash import hash_password
+    from ..models.user import User
+    from ..models.sublevel import SubLevel
+    from ..models.progress import Progress
+    from .synthetic import (
+        PROGRESS_COLUMNS, REFERENCE_TIME, SYNTHETIC_PASSWORD, build_user_row, draw_depth, progress_rows,
+    )
+
+    rng = random.Random(seed)
+    db = db_config.SessionLocal()
+    try:
+        sublevel_ids = db.execute(
+            select(SubLevel.id).where(SubLevel.deleted_at.is_(None)).order_by(SubLevel.level_id, SubLevel.id)
+        ).scalars().all()
+        if progress_per_user is not None:
+            sublevel_ids = sublevel_ids[:progress_per_user]
+
+        password = hash_password(SYNTHETIC_PASSWORD)  # Hash sekali, bcrypt per user terlalu lambat
+        today = REFERENCE_TIME.date()
+        depths = {}
+        user_rows = []
+        for i in range(1, users + 1):
+            depth = draw_depth(rng, len(sublevel_ids))
+            row = build_user_row(rng, seed, i, password, depth, today=today)
+            depths[row["unique_id"]] = depth
+            user_rows.append(row)
+
+        created = bulk_insert(
+            db, User, user_rows, chunk_size=chunk_size,
+            on_conflict_do_nothing=True, returning=[User.id, User.unique_id],
+        )
+        created = sorted(created, key=lambda row: row[1])
+        progress_count = copy_rows(
+            db, Progress,
+            progress_rows(rng, [(user_id, depths[unique_id]) for user_id, unique_id in created], sublevel_ids),
+            PROGRESS_COLUMNS,
+        )
+        db.commit()
+        return {"users": len(created), "skipped_users": users - len(created), "progress": progress_count}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_synthetic_seeder(users: int, progress_per_user: Optional[int] = None, seed: int = 42):
+    """CLI wrapper untuk seed_synthetic_users"""
+    print(f"Generating {users} synthetic users (seed={seed})...")
+    started = time.perf_counter()
+    try:
+        result = seed_synthetic_users(users, progress_per_user=progress_per_user, seed=seed)
+    except Exception as e:
+        print(f"Error: synthetic seeding failed: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    for key, value in result.items():
+        print(f"  {key}: {value}")
+    print(f"Success: synthetic seeding completed ({elapsed:.2f}s)")
+
 def list_seeders():
     """List all available seeders"""
     seeders = registry.get_seeders()
@@ -134,6 +395,8 @@ def list_seeders():
     print("=" * 30)
     for seeder in seeders:
         print(f"• {seeder.__name__}")
+        if seeder.depends_on:
+            print(f"  depends on: {', '.join(seeder.depends_on)}")
         if seeder.__doc__:
             print(f"  {seeder.__doc__.strip()}")
     print("=" * 30)
@@ -0,0 +1,483 @@
+"""
+Generator dataset sintetis skala production untuk benchmark.
+
+Semua nilai diturunkan dari ``random.Random(seed)`` dengan urutan generate
+yang tetap dan waktu referensi tetap (``SyntheticConfig.reference_time``,
+bukan jam saat generate), jadi seed yang sama di database kosong selalu
+menghasilkan data yang sama. Tabel besar (kamus, soal, users, progress, user_badges) dimuat
+lewat COPY, tabel kecil lewat INSERT multi-row.
+
+Semua row ditandai prefix per seed (``SYN-<seed>-``) sehingga bisa dihapus
+lagi dengan ``purge_dataset``.
+"""
+import io
+import time
+import zlib
+import struct
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+
+from .db import db_config
+from .seeder import SEED_CHUNK_SIZE, bulk_insert, copy_rows
+
+SYNTHETIC_PASSWORD = "Password123"
+QUESTIONS_PER_QUIZ = 5
+
+# "Sekarang" untuk dataset: last_activity_date, last_attempt, earned_at relatif ke sini
+REFERENCE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class SyntheticConfig:
+    """Ukuran dataset. Default ~ skala production (100k user)"""
+
+    def __init__(
+        self,
+        users: int = 100_000,
+        seed: int = 42,
+        levels: int = 8,
+        sublevels_per_level: int = 10,
+        kamus: int = 5_000,
+        soal_per_sublevel: int = 100,
+        badges: int = 20,
+        media_files: int = 300,
+        avatar_ratio: float = 0.2,
+        chunk_size: int = SEED_CHUNK_SIZE,
+        reference_time: datetime = REFERENCE_TIME,
+    ):
+        self.users = users
+        self.seed = seed
+        self.levels = levels
+        self.sublevels_per_level = sublevels_per_level
+        self.kamus = kamus
+        self.soal_per_sublevel = soal_per_sublevel
+        self.badges = badges
+        self.media_files = media_files
+        self.avatar_ratio = avatar_ratio
+        self.chunk_size = chunk_size
+        self.reference_time = reference_time
+
+    @property
+    def prefix(self) -> str:
+        return f"SYN-{self.seed}-"
+
+    @property
+    def today(self) -> date:
+        return self.reference_time.date()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+# =====================================================================
+# ROW GENERATORS
+# =====================================================================
+
+def tier_for_streak(streak: int):
+    """Sinkron dengan User.update_tier_based_on_streak"""
+    from ..models.user import UserTier
+
+    if streak >= 180:
+        return UserTier.PLATINUM
+    if streak >= 90:
+        return UserTier.DIAMOND
+    if streak >= 30:
+        return UserTier.GOLD
+    if streak >= 7:
+        return UserTier.SILVER
+    return UserTier.BRONZE
+
+
+def draw_streak(rng: random.Random) -> int:
+    """
+    Distribusi streak ala production: ~35% sudah putus (0), sisanya ekor
+    panjang Pareto (banyak 1-6 hari, sedikit sekali > 180 hari).
+    """
+    if rng.random() < 0.35:
+        return 0
+    return min(int(rng.paretovariate(1.2)), 730)
+
+
+def draw_depth(rng: random.Random, total_sublevels: int) -> int:
+    """Jumlah sublevel yang sudah selesai: mayoritas learner baru di awal kurikulum"""
+    if total_sublevels <= 0:
+        return 0
+    return min(int(total_sublevels * rng.betavariate(1.2, 3.0)), total_sublevels)
+
+
+def build_user_row(
+    rng: random.Random,
+    seed: int,
+    index: int,
+    password: str,
+    depth: int,
+    total_badges: int = 0,
+    avatar: Optional[str] = None,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Satu user sintetis (kolom sama dengan urutan USER_COLUMNS)"""
+    from ..models.user import UserRole
+
+    today = today or REFERENCE_TIME.date()
+    streak = draw_streak(rng)
+    last_activity = today - timedelta(days=0 if streak else rng.randint(2, 120))
+    return {
+        "unique_id": f"SYN-{seed}-{index:07d}",
+        "username": f"synthetic_{seed}_{index}",
+        "email": f"synthetic_{seed}_{index}@example.com",
+        "password": password,
+        "nama": f"Synthetic User {index}",
+        "role": UserRole.USER,
+        "is_active": rng.random() < 0.97,
+        "is_verified": rng.random() < 0.8,
+        "avatar": avatar,
+        "total_badges": total_badges,
+        "current_streak": streak,
+        "longest_streak": streak + int(rng.expovariate(1 / 5)),
+        "last_activity_date": last_activity,
+        "streak_freeze_count": rng.choice((0, 0, 0, 1, 2)),
+        "tier": tier_for_streak(streak),
+        "total_xp": depth * QUESTIONS_PER_QUIZ * 10 + rng.randint(0, 500),
+        "total_quizzes_completed": depth + int(rng.expovariate(1 / 3)),
+    }
+
+
+USER_COLUMNS = (
+    "unique_id", "username", "email", "password", "nama", "role", "is_active",
+    "is_verified", "avatar", "total_badges", "current_streak", "longest_streak",
+    "last_activity_date", "streak_freeze_count", "tier", "total_xp",
+    "total_quizzes_completed",
+)
+
+PROGRESS_COLUMNS = (
+    "user_id", "sublevel_id", "status", "total_questions", "correct_answers",
+    "score", "stars", "completion_percentage", "attempts", "best_score",
+    "best_stars", "is_unlocked", "last_attempt", "completed_at",
+)
+
+
+def progress_rows(
+    rng: random.Random,
+    users: Sequence[Tuple[int, int]],
+    sublevel_ids: Sequence[int],
+    now: Optional[datetime] = None,
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Baris progress (urutan PROGRESS_COLUMNS) untuk pasangan (user_id, depth).
+
+    Learner maju berurutan: ``depth`` sublevel pertama selesai, sublevel
+    berikutnya terbuka dan mungkin sedang dikerjakan, sisanya terkunci.
+    """
+    from ..models.progress import ProgressStatus
+
+    now = now or REFERENCE_TIME
+    total = QUESTIONS_PER_QUIZ
+    for user_id, depth in users:
+        for position, sublevel_id in enumerate(sublevel_ids):
+            if position < depth:
+                correct = rng.randint(3, total)
+                score = correct * 100 // total
+                stars = 3 if correct == total else 2 if score >= 80 else 1
+                attempted = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+                yield (user_id, sublevel_id, ProgressStatus.COMPLETED, total, correct,
+                       score, stars, 100, rng.randint(1, 4), score, stars, True,
+                       attempted, attempted)
+            elif position == depth and rng.random() < 0.4:
+                correct = rng.randint(0, 2)
+                score = correct * 100 // total
+                attempted = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+                yield (user_id, sublevel_id, ProgressStatus.FAILED, total, correct,
+                       score, 0, score, rng.randint(1, 3), score, 0, True,
+                       attempted, None)
+            else:
+                yield (user_id, sublevel_id, ProgressStatus.NOT_STARTED, 0, 0,
+                       0, 0, 0, 0, 0, 0, position == depth, None, None)
+
+
+def _png(width: int, height: int, rgb: Tuple[int, int, int]) -> bytes:
+    """PNG polos valid (tanpa Pillow), deterministik dari ukuran + warna"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    row = b"\x00" + bytes(rgb) * width
+    raw = row * height
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+# =====================================================================
+# PHASES
+# =====================================================================
+
+def _generate_media(db, config: SyntheticConfig, rng: random.Random) -> Dict[str, List[str]]:
+    """Tulis file gambar ke media store + catalog, return path per subfolder"""
+    from ..utils.media_store import media_store
+    from ..utils.storage_catalog import StorageCatalog
+
+    paths: Dict[str, List[str]] = {"soal": [], "kamus": [], "avatars": []}
+    catalog_rows = []
+    subfolders = tuple(paths)
+    for i in range(config.media_files):
+        subfolder = subfolders[i % len(subfolders)]
+        size = rng.choice((64, 128, 256))
+        # Warna unik per index: konten (dan path content-addressed) tidak pernah bentrok
+        content = _png(size, size, (i % 256, (i // 256) % 256, rng.randrange(256)))
+        relative_path, digest, length, _ = media_store.put_stream(io.BytesIO(content), ".png", len(content) + 1)
+        paths[subfolder].append(relative_path)
+        catalog_rows.append(StorageCatalog.build_row(
+            subfolder, relative_path, media_store.resolve(relative_path), digest, length, "image/png"
+        ))
+    for start in range(0, len(catalog_rows), config.chunk_size):
+        StorageCatalog._upsert(db, catalog_rows[start:start + config.chunk_size])
+    return paths
+
+
+def _generate_kamus(db, config: SyntheticConfig, rng: random.Random, images: List[str]) -> List[int]:
+    from ..models.kamus import Kamus
+    from ..utils.http_cache import ResourceVersions
+
+    categories = list(Kamus.CategoryEnum)
+    weights = [0.2, 0.2, 0.6][:len(categories)]
+
+    def rows():
+        for i in range(1, config.kamus + 1):
+            image = rng.choice(images) if images and rng.random() < 0.6 else None
+            yield (
+                f"{config.prefix}{i:06d}",
+                f"Definisi isyarat sintetis nomor {i}",
+                rng.choices(categories, weights)[0],
+                image,
+                f"https://example.com/kamus/{config.seed}/{i}.mp4" if rng.random() < 0.3 else None,
+            )
+
+    copy_rows(db, Kamus, rows(), ("word_text", "definition", "category", "image_url_ref", "video_url"))
+    # COPY melewati event ORM: bump version cache (ETag) manual, satu transaksi dengan data
+    ResourceVersions.bump(db.connection(), ["kamus"])
+    return db.execute(
+        select(Kamus.id).where(Kamus.word_text.like(f"{config.prefix}%")).order_by(Kamus.id)
+    ).scalars().all()
+
+
+def _generate_curriculum(db, config: SyntheticConfig, rng: random.Random) -> List[int]:
+    """Level + sublevel sintetis, return semua sublevel aktif (urut kurikulum)"""
+    from ..models.level import Level
+    from ..models.sublevel import SubLevel
+
+    levels = bulk_insert(
+        db, Level,
+        [
+            {
+                "name": f"{config.prefix}Level {i:03d}",
+                "description": f"Level sintetis {i}",
+                "tujuan": "Benchmark dataset",
+            }
+            for i in range(1, config.levels + 1)
+        ],
+        chunk_size=config.chunk_size,
+        returning=[Level.id],
+    )
+    sublevel_rows = [
+        {
+            "name": f"{config.prefix}Sublevel {level_id}-{j:03d}",
+            "description": f"Sublevel sintetis {j}",
+            "tujuan": "Benchmark dataset",
+            "level_id": level_id,
+        }
+        for (level_id,) in sorted(levels)
+        for j in range(1, config.sublevels_per_level + 1)
+    ]
+    bulk_insert(db, SubLevel, sublevel_rows, chunk_size=config.chunk_size)
+
+    return db.execute(
+        select(SubLevel.id)
+        .where(SubLevel.name.like(f"{config.prefix}%"), SubLevel.deleted_at.is_(None))
+        .order_by(SubLevel.level_id, SubLevel.id)
+    ).scalars().all()
+
+
+def _generate_soal(db, config: SyntheticConfig, rng: random.Random,
+                   sublevel_ids: List[int], kamus_ids: List[int], images: List[str]) -> int:
+    from ..models.soal import Soal
+    from ..utils.http_cache import ResourceVersions
+
+    def rows():
+        for sublevel_id in sublevel_ids:
+            for j in range(1, config.soal_per_sublevel + 1):
+                yield (
+                    f"{config.prefix}Soal {sublevel_id}-{j}: tunjukkan isyarat berikut",
+                    f"Jawaban sintetis {sublevel_id}-{j}",
+                    rng.choice(kamus_ids),
+                    sublevel_id,
+                    rng.choice(images) if images and rng.random() < 0.5 else None,
+                    f"https://example.com/quiz/{config.seed}/{sublevel_id}-{j}.mp4" if rng.random() < 0.3 else None,
+                )
+
+    if not kamus_ids:
+        return 0
+    count = copy_rows(
+        db, Soal, rows(), ("question", "answer", "dictionary_id", "sublevel_id", "image_url", "video_url")
+    )
+    ResourceVersions.bump(db.connection(), ["soal"])
+    return count
+
+
+def _generate_badges(db, config: SyntheticConfig, rng: random.Random) -> List[int]:
+    from ..models.badges import Badge, DificultyLevel
+
+    difficulties = list(DificultyLevel)
+    bulk_insert(
+        db, Badge,
+        [
+            {
+                "nama": f"{config.prefix}Badge {i:03d}",
+                "deskripsi": f"Badge sintetis {i}",
+                "icon": "🏅",
+                "level": difficulties[i % len(difficulties)],
+            }
+            for i in range(1, config.badges + 1)
+        ],
+        chunk_size=config.chunk_size,
+        on_conflict_do_nothing=True,
+    )
+    return db.execute(
+        select(Badge.id)
+        .where(Badge.nama.like(f"{config.prefix}%"), Badge.deleted_at.is_(None))
+        .order_by(Badge.id)
+    ).scalars().all()
+
+
+def _generate_users(db, config: SyntheticConfig, rng: random.Random, sublevel_ids: List[int],
+                    badge_ids: List[int], avatars: List[str]) -> Dict[str, int]:
+    """Users (COPY) -> progress (COPY) -> user_badges (COPY), total_badges sudah konsisten"""
+    from ..config.hash import hash_password
+    from ..models.user import User
+    from ..models.progress import Progress
+    from ..models.user_badge import user_badge_association
+
+    password = hash_password(SYNTHETIC_PASSWORD)  # Hash sekali, bcrypt per user terlalu lambat
+    today = config.today
+    depths: List[int] = []
+    owned: List[List[int]] = []
+    user_rows = []
+    for i in range(1, config.users + 1):
+        depth = draw_depth(rng, len(sublevel_ids))
+        earned = min(len(badge_ids), depth // 3 + (1 if rng.random() < 0.3 else 0))
+        badges = sorted(rng.sample(badge_ids, earned)) if earned else []
+        avatar = rng.choice(avatars) if avatars and rng.random() < config.avatar_ratio else None
+        row = build_user_row(rng, config.seed, i, password, depth, len(badges), avatar, today)
+        user_rows.append(tuple(row[column] for column in USER_COLUMNS))
+        depths.append(depth)
+        owned.append(badges)
+
+    copy_rows(db, User, user_rows, USER_COLUMNS)
+    user_ids = db.execute(
+        select(User.id).where(User.unique_id.like(f"{config.prefix}%")).order_by(User.unique_id)
+    ).scalars().all()
+
+    now = config.reference_time
+    progress_count = copy_rows(
+        db, Progress, progress_rows(rng, list(zip(user_ids, depths)), sublevel_ids, now), PROGRESS_COLUMNS
+    )
+
+    def badge_rows():
+        for user_id, badges in zip(user_ids, owned):
+            for badge_id in badges:
+                yield (user_id, badge_id, now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)))
+
+    badge_count = copy_rows(db, user_badge_association, badge_rows(), ("user_id", "badge_id", "earned_at"))
+    return {"users": len(user_ids), "progress": progress_count, "user_badges": badge_count}
+
+
+# =====================================================================
+# ENTRYPOINTS
+# =====================================================================
+
+def dataset_exists(db, seed: int) -> bool:
+    from ..models.user import User
+
+    return db.execute(
+        select(func.count()).select_from(User).where(User.unique_id.like(f"SYN-{seed}-%"))
+    ).scalar() > 0
+
+
+def generate_dataset(config: SyntheticConfig, progress=print) -> Dict[str, Any]:
+    """
+    Generate dataset lengkap. Satu commit per fase sehingga fase besar
+    (progress) tidak menahan transaksi raksasa. Return statistik + durasi per fase.
+    """
+    rng = random.Random(config.seed)
+    stats: Dict[str, Any] = {}
+    db = db_config.SessionLocal()
+    try:
+        if dataset_exists(db, config.seed):
+            raise ValueError(
+                f"Synthetic dataset for seed {config.seed} already exists; "
+                f"run db:synthetic:purge {config.seed} first"
+            )
+
+        def phase(name, fn, *args):
+            started = time.perf_counter()
+            result = fn(db, config, rng, *args)
+            db.commit()
+            stats[f"{name}_seconds"] = round(time.perf_counter() - started, 2)
+            progress(f"  ✅ {name} ({stats[f'{name}_seconds']}s)")
+            return result
+
+        media = phase("media", _generate_media)
+        kamus_ids = phase("kamus", _generate_kamus, media["kamus"])
+        sublevel_ids = phase("curriculum", _generate_curriculum)
+        stats["soal"] = phase("soal", _generate_soal, sublevel_ids, kamus_ids, media["soal"])
+        badge_ids = phase("badges", _generate_badges)
+        stats.update(phase("users", _generate_users, sublevel_ids, badge_ids, media["avatars"]))
+
+        stats.update({
+            "media_files": sum(len(paths) for paths in media.values()),
+            "kamus": len(kamus_ids),
+            "sublevels": len(sublevel_ids),
+            "badges": len(badge_ids),
+        })
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def purge_dataset(seed: int) -> Dict[str, int]:
+    """Hapus semua row sintetis untuk seed (file media dibersihkan oleh storage:gc)"""
+    from ..models.user import User
+    from ..models.kamus import Kamus
+    from ..models.level import Level
+    from ..models.sublevel import SubLevel
+    from ..models.soal import Soal
+    from ..models.badges import Badge
+    from ..models.progress import Progress
+
+    prefix = f"SYN-{seed}-%"
+    synthetic_sublevels = select(SubLevel.id).where(SubLevel.name.like(prefix))
+    no_sync = {"synchronize_session": False}
+    db = db_config.SessionLocal()
+    try:
+        result = {}
+        # Progress/user_badges ikut terhapus lewat ON DELETE CASCADE dari users
+        result["users"] = db.execute(delete(User).where(User.unique_id.like(prefix)).execution_options(**no_sync)).rowcount
+        db.execute(delete(Progress).where(Progress.sublevel_id.in_(synthetic_sublevels)).execution_options(**no_sync))
+        result["soal"] = db.execute(
+            delete(Soal)
+            .where(Soal.question.like(prefix) | Soal.sublevel_id.in_(synthetic_sublevels))
+            .execution_options(**no_sync)
+        ).rowcount
+        result["sublevels"] = db.execute(delete(SubLevel).where(SubLevel.name.like(prefix)).execution_options(**no_sync)).rowcount
+        result["levels"] = db.execute(delete(Level).where(Level.name.like(prefix)).execution_options(**no_sync)).rowcount
+        result["kamus"] = db.execute(delete(Kamus).where(Kamus.word_text.like(prefix)).execution_options(**no_sync)).rowcount
+        result["badges"] = db.execute(delete(Badge).where(Badge.nama.like(prefix)).execution_options(**no_sync)).rowcount
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
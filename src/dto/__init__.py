@@ -100,6 +100,14 @@ from .exercise_dto import (
     ErrorResponse
 )
 
+from .leaderboard_dto import (
+    TierInfo,
+    LeaderboardEntry,
+    LeaderboardData,
+    LeaderboardResponse,
+    TierListResponse
+)
+
 __all__ = [
     # Auth DTOs
     "RegisterRequest",
@@ -187,5 +195,12 @@ __all__ = [
         "AvailableSubLevelResponse",
         "ResetProgressResponse",
         "ApiResponse",
-        "ErrorResponse"
+        "ErrorResponse",
+    
+    # Leaderboard DTOs
+    "TierInfo",
+    "LeaderboardEntry",
+    "LeaderboardData",
+    "LeaderboardResponse",
+    "TierListResponse"
 ]
\ No newline at end of file
@@ -28,8 +28,32 @@ class LeaderboardEntry(BaseModel):
     total_xp: int = 0
     total_quizzes_completed: int = 0
     total_stars: int = 0
+    completed_count: int = 0
     completion_rate: float = 0.0
     
     # Highlight
     is_current_user: bool = False
-    last_activity_date: Optional[str] = None
\ No newline at end of file
+    last_activity_date: Optional[str] = None
+
+class LeaderboardData(BaseModel):
+    """Leaderboard page + posisi current user"""
+    window: str  # "daily", "weekly", "all_time"
+    total_users: int
+    offset: int = 0
+    limit: int = 10
+    entries: List[LeaderboardEntry] = Field(default_factory=list)
+    current_user: Optional[LeaderboardEntry] = None
+    neighbors: List[LeaderboardEntry] = Field(default_factory=list)
+    generated_at: Optional[str] = None
+
+class LeaderboardResponse(BaseModel):
+    """Leaderboard API response"""
+    success: bool
+    message: str
+    data: LeaderboardData
+
+class TierListResponse(BaseModel):
+    """Tier list API response"""
+    success: bool
+    message: str
+    data: List[TierInfo]
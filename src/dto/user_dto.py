@@ -313,7 +313,32 @@ class BulkUserActionDTO(BaseModel):
         }
     )
     
-    user_ids: List[int] = Field(..., min_length=1, max_length=100)
+    # Cohort onboarding: ribuan user sekaligus (diproses per chunk di handler)
+    user_ids: List[int] = Field(..., min_length=1, max_length=20000)
+
+class BulkRoleUpdateDTO(BulkUserActionDTO):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "user_ids": [1, 2, 3],
+                "role": "moderator"
+            }
+        }
+    )
+    
+    role: UserRoleEnum
+
+class BulkBadgeAssignDTO(BulkUserActionDTO):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "user_ids": [1, 2, 3],
+                "badge_id": 1
+            }
+        }
+    )
+    
+    badge_id: int = Field(..., gt=0)
 
 # Backward compatibility aliases
 UserResponseDTO = UserDataDTO
@@ -1,8 +1,7 @@
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, asc, func
+from sqlalchemy import and_, or_, desc, asc, func, update, delete
 from fastapi import HTTPException, UploadFile
-import os
 import uuid
 from datetime import datetime, timezone
 from functools import lru_cache
@@ -13,6 +12,10 @@ from ...models.soal import Soal
 from ...models.kamus import Kamus
 from ...models.sublevel import SubLevel
 from ...models.level import Level
+from .statistics import AdminStatistics
+from ...utils.http_cache import resource_versions
+from ...utils.metrics import cache_hit, cache_miss
+from ...config.settings import settings
 from ...dto import (
     SoalCreateRequest, SoalUpdateRequest, SoalData, SoalListData,
     BulkDeleteSoalRequest, BulkRestoreSoalRequest
@@ -24,7 +27,7 @@ class SoalHandler:
     # Class-level cache untuk menyimpan hasil query
     _cache: Dict[str, Dict[str, Any]] = {}
     _cache_timestamps: Dict[str, datetime] = {}
-    _cache_ttl = 180  # ✅ Cache TTL 3 minutes (180 seconds)
+    _cache_ttl = settings.soal_cache_ttl  # ✅ Default 3 menit (SOAL_CACHE_TTL)
     
     def __init__(self, db: Session):
         self.db = db
@@ -45,7 +48,9 @@ class SoalHandler:
     @classmethod
     def _get_from_cache(cls, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get data from cache if valid"""
+        cache_name = cache_key.split(":", 1)[0]
         if cache_key not in cls._cache:
+            cache_miss(cache_name)
             return None
         
         # Check if cache is expired
@@ -56,8 +61,10 @@ class SoalHandler:
                 # Cache expired, remove it
                 cls._cache.pop(cache_key, None)
                 cls._cache_timestamps.pop(cache_key, None)
+                cache_miss(cache_name)
                 return None
         
+        cache_hit(cache_name)
         return cls._cache.get(cache_key)
     
     @classmethod
@@ -69,6 +76,8 @@ class SoalHandler:
     @classmethod
     def _invalidate_cache(cls, prefix: Optional[str] = None):
         """Invalidate cache (all or by prefix)"""
+        if prefix is None or prefix.startswith("soal_stats"):
+            AdminStatistics.invalidate("soal")  # Snapshot statistik soal ikut basi setelah write
         if prefix:
             # Remove only keys with specific prefix
             keys_to_remove = [k for k in cls._cache.keys() if k.startswith(prefix)]
@@ -483,34 +492,34 @@ class SoalHandler:
             }
     
     def bulk_delete_soal(self, request: BulkDeleteSoalRequest) -> Dict[str, Any]:
-        """Bulk delete soal"""
+        """Bulk delete soal - set-based (DELETE/UPDATE ... RETURNING), satu transaksi"""
         try:
-            soal_list = self.db.query(Soal).filter(Soal.id.in_(request.ids)).all()
-            
-            if not soal_list:
+            if request.permanent:
+                statement = delete(Soal).where(Soal.id.in_(request.ids))
+            else:
+                # Soft delete (hanya jika belum di-delete)
+                statement = update(Soal).where(
+                    Soal.id.in_(request.ids),
+                    Soal.deleted_at.is_(None)
+                ).values(deleted_at=datetime.now(timezone.utc))
+            deleted_ids = sorted(self.db.execute(
+                statement.returning(Soal.id).execution_options(synchronize_session=False)
+            ).scalars().all())
+            
+            # Tidak ada yang berubah: bedakan "semua sudah terhapus" dari "ID tidak ada"
+            if not deleted_ids and not self.db.query(
+                self.db.query(Soal.id).filter(Soal.id.in_(request.ids)).exists()
+            ).scalar():
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "Tidak ada soal yang ditemukan dengan ID yang diberikan",
                     "data": None
                 }
             
-            deleted_count = 0
-            deleted_ids = []
-            
-            for soal in soal_list:
-                if request.permanent:
-                    # Permanent delete
-                    self.db.delete(soal)
-                    deleted_ids.append(soal.id)
-                    deleted_count += 1
-                else:
-                    # Soft delete (hanya jika belum di-delete)
-                    if soal.deleted_at is None:
-                        setattr(soal, 'deleted_at', datetime.now(timezone.utc))
-                        deleted_ids.append(soal.id)
-                        deleted_count += 1
-            
             self.db.commit()
+            self.db.expire_all()  # Object di identity map sudah basi setelah bulk statement
+            deleted_count = len(deleted_ids)
             
             # ✅ Invalidate cache after bulk delete
             self._invalidate_cache("soal_list")
@@ -582,30 +591,27 @@ class SoalHandler:
             }
     
     def bulk_restore_soal(self, request: BulkRestoreSoalRequest) -> Dict[str, Any]:
-        """Bulk restore soal"""
+        """Bulk restore soal - set-based (UPDATE ... RETURNING), satu transaksi"""
         try:
-            soal_list = self.db.query(Soal).filter(
-                Soal.id.in_(request.ids),
-                Soal.deleted_at.isnot(None)
-            ).all()
-            
-            if not soal_list:
+            restored_ids = sorted(self.db.execute(
+                update(Soal)
+                .where(Soal.id.in_(request.ids), Soal.deleted_at.isnot(None))
+                .values(deleted_at=None, updated_at=datetime.now(timezone.utc))
+                .returning(Soal.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all())
+            
+            if not restored_ids:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "Tidak ada soal yang dihapus ditemukan dengan ID yang diberikan",
                     "data": None
                 }
             
-            restored_count = 0
-            restored_ids = []
-            
-            for soal in soal_list:
-                setattr(soal, 'deleted_at', None)
-                setattr(soal, 'updated_at', datetime.now(timezone.utc))
-                restored_ids.append(soal.id)
-                restored_count += 1
-                
             self.db.commit()
+            self.db.expire_all()
+            restored_count = len(restored_ids)
             
             # ✅ Invalidate cache after bulk restore
             self._invalidate_cache("soal_list")
@@ -647,6 +653,7 @@ class SoalHandler:
                 )
             
             kamus_list = query.order_by(Kamus.word_text).all()
+            Kamus.preload_total_soal(self.db, kamus_list)
             
             kamus_data = [
                 {
@@ -683,6 +690,7 @@ class SoalHandler:
                 query = query.filter(SubLevel.level_id == level_id)
             
             sublevel_list = query.order_by(SubLevel.level_id, SubLevel.name).all()
+            SubLevel.preload_total_soal(self.db, sublevel_list)
             
             sublevel_data = [
                 {
@@ -718,45 +726,10 @@ class SoalHandler:
             if cached_data:
                 return cached_data
             
-            # Basic counts
-            total_soal = self.db.query(Soal).count()
-            active_soal = self.db.query(Soal).filter(Soal.deleted_at.is_(None)).count()
-            deleted_soal = self.db.query(Soal).filter(Soal.deleted_at.isnot(None)).count()
-            
-            # Count by sublevel
-            sublevel_stats = self.db.query(
-                SubLevel.id,
-                SubLevel.name,
-                Level.name.label("level_name"),
-                func.count(Soal.id).label("soal_count")
-            ).select_from(SubLevel)\
-             .join(Level, SubLevel.level_id == Level.id)\
-             .outerjoin(Soal, and_(
-                 SubLevel.id == Soal.sublevel_id, 
-                 Soal.deleted_at.is_(None)
-             ))\
-             .group_by(SubLevel.id, SubLevel.name, Level.name)\
-             .all()
-            
             response = {
                 "success": True,
                 "message": "Statistik berhasil diambil",
-                "data": {
-                    "summary": {
-                        "total_soal": total_soal,
-                        "active_soal": active_soal,
-                        "deleted_soal": deleted_soal
-                    },
-                    "by_sublevel": [
-                        {
-                            "sublevel_id": stat.id,
-                            "sublevel_name": stat.name,
-                            "level_name": stat.level_name,
-                            "soal_count": stat.soal_count
-                        }
-                        for stat in sublevel_stats
-                    ]
-                }
+                "data": AdminStatistics(self.db).soal_stats()
             }
             
             # ✅ Store to cache
@@ -948,4 +921,11 @@ class SoalHandler:
                 "success": False,
                 "message": f"Gagal update video URL: {str(e)}",
                 "data": None
-            }
\ No newline at end of file
+            }
+
+
+# ✅ Perubahan dari worker lain (version counter naik) membuang cache list soal di worker ini
+resource_versions.on_change(
+    ("soal", "kamus", "sublevel", "level"),
+    lambda: SoalHandler._invalidate_cache("soal_list")
+)
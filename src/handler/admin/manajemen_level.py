@@ -1,17 +1,18 @@
 import os
 import re
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, and_
-from dotenv import load_dotenv
+from sqlalchemy import or_, func, and_, select, update, delete
 
 from ...models.level import Level
 from ...models.sublevel import SubLevel
+from ...models.soal import Soal
 from ...models.progress import Progress
+from .statistics import AdminStatistics
 
-load_dotenv()
 
 class Level_Management:
     def __init__(self, db: Session):
@@ -63,6 +64,7 @@ class Level_Management:
             
             total_count = query.count()
             levels = query.offset(offset).limit(limit).all()
+            Level.preload_total_sublevels(self.db, levels)  # ✅ 1 query, bukan N
             
             result = []
             for level in levels:
@@ -117,6 +119,7 @@ class Level_Management:
             
             total_count = search_query.count()
             levels = search_query.offset(offset).limit(limit).all()
+            Level.preload_total_sublevels(self.db, levels)
             
             result = []
             for level in levels:
@@ -413,6 +416,7 @@ class Level_Management:
             query = self.db.query(Level).filter(Level.deleted_at.is_not(None))
             total_count = query.count()
             levels = query.offset(offset).limit(limit).all()
+            Level.preload_total_sublevels(self.db, levels)  # ✅ 1 query, bukan N
             
             result = []
             for level in levels:
@@ -451,44 +455,10 @@ class Level_Management:
     def get_level_statistics(self) -> Dict[str, Any]:
         """Get level statistics"""
         try:
-            total_levels = self.db.query(Level).count()
-            active_levels = self.db.query(Level).filter(Level.deleted_at.is_(None)).count()
-            deleted_levels = self.db.query(Level).filter(Level.deleted_at.is_not(None)).count()
-            
-            # Get levels with most sublevels
-            levels_with_sublevels = self.db.query(Level).filter(Level.deleted_at.is_(None)).all()
-            sublevel_stats = []
-            for level in levels_with_sublevels:
-                sublevel_count = level.total_sublevels
-                sublevel_stats.append({
-                    "level_id": level.id,
-                    "level_name": level.name,
-                    "total_sublevels": sublevel_count
-                })
-            
-            # Sort by sublevel count descending
-            sublevel_stats.sort(key=lambda x: x["total_sublevels"], reverse=True)
-            
-            # Get recent levels (last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_levels = self.db.query(Level).filter(
-                Level.created_at >= thirty_days_ago,
-                Level.deleted_at.is_(None)
-            ).count()
-            
-            stats_data = {
-                "total_levels": total_levels,
-                "active_levels": active_levels,
-                "deleted_levels": deleted_levels,
-                "recent_levels": recent_levels,
-                "top_levels_by_sublevels": sublevel_stats[:10],  # Top 10
-                "generated_at": datetime.utcnow().isoformat()
-            }
-            
             return {
                 "success": True,
                 "message": "Level statistics retrieved successfully",
-                "data": stats_data
+                "data": AdminStatistics(self.db).level_stats()
             }
         except Exception as e:
             return {
@@ -498,11 +468,53 @@ class Level_Management:
             }
 
     def bulk_delete_levels(self, level_ids: List[int], permanent: bool = False) -> Dict[str, Any]:
-        """Bulk delete levels (soft or permanent)"""
+        """Bulk delete levels (soft or permanent) - set-based, satu transaksi"""
         try:
-            levels = self.db.query(Level).filter(Level.id.in_(level_ids)).all()
-            
-            if not levels:
+            # ✅ UPDATE/DELETE ... WHERE id IN (...) RETURNING: tanpa load ORM object satu per satu
+            if permanent:
+                sublevel_ids = select(SubLevel.id).where(SubLevel.level_id.in_(level_ids))
+                self.db.execute(
+                    delete(Progress).where(Progress.sublevel_id.in_(sublevel_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.execute(
+                    delete(Soal).where(Soal.sublevel_id.in_(sublevel_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                sublevel_rows = self.db.execute(
+                    delete(SubLevel).where(SubLevel.level_id.in_(level_ids))
+                    .returning(SubLevel.level_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                level_rows = self.db.execute(
+                    delete(Level).where(Level.id.in_(level_ids))
+                    .returning(Level.id, Level.name)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                total_processed = len(level_rows)
+            else:
+                total_processed = self.db.query(func.count(Level.id)).filter(Level.id.in_(level_ids)).scalar() or 0
+                now = datetime.utcnow()
+                level_rows = self.db.execute(
+                    update(Level)
+                    .where(Level.id.in_(level_ids), Level.deleted_at.is_(None))
+                    .values(deleted_at=now, updated_at=now)
+                    .returning(Level.id, Level.name)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                sublevel_rows = self.db.execute(
+                    update(SubLevel)
+                    .where(
+                        SubLevel.level_id.in_([row.id for row in level_rows]),
+                        SubLevel.deleted_at.is_(None)
+                    )
+                    .values(deleted_at=now, updated_at=now)
+                    .returning(SubLevel.level_id)
+                    .execution_options(synchronize_session=False)
+                ).all() if level_rows else []
+            
+            if total_processed == 0:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No levels found with provided IDs",
@@ -513,64 +525,29 @@ class Level_Management:
                     }
                 }
             
-            deleted_count = 0
-            deleted_levels = []
-            total_sublevels_affected = 0
-            
-            for level in levels:
-                if permanent:
-                    # Count sublevels before deletion
-                    sublevels = self.db.query(SubLevel).filter(SubLevel.level_id == level.id).all()
-                    sublevel_count = len(sublevels)
-                    total_sublevels_affected += sublevel_count
-                    
-                    # Delete progress records for all sublevels
-                    for sublevel in sublevels:
-                        self.db.query(Progress).filter(Progress.sublevel_id == sublevel.id).delete()
-                    
-                    deleted_levels.append({
-                        "id": level.id,
-                        "name": level.name,
-                        "sublevels_count": sublevel_count
-                    })
-                    self.db.delete(level)
-                    deleted_count += 1
-                else:
-                    if level.deleted_at is None:  # Only soft delete if not already deleted
-                        # Count active sublevels
-                        sublevels = self.db.query(SubLevel).filter(
-                            SubLevel.level_id == level.id,
-                            SubLevel.deleted_at.is_(None)
-                        ).all()
-                        sublevel_count = len(sublevels)
-                        total_sublevels_affected += sublevel_count
-                        
-                        # Soft delete level and sublevels
-                        setattr(level, 'deleted_at', datetime.utcnow())
-                        setattr(level, 'updated_at', datetime.utcnow())
-                        
-                        for sublevel in sublevels:
-                            setattr(sublevel, 'deleted_at', datetime.utcnow())
-                            setattr(sublevel, 'updated_at', datetime.utcnow())
-                        
-                        deleted_levels.append({
-                            "id": level.id,
-                            "name": level.name,
-                            "sublevels_count": sublevel_count
-                        })
-                        deleted_count += 1
-            
             self.db.commit()
-            
+            self.db.expire_all()  # Object di identity map sudah basi setelah bulk statement
+            
+            sublevel_counts = Counter(row.level_id for row in sublevel_rows)
+            deleted_levels = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "sublevels_count": sublevel_counts.get(row.id, 0)
+                }
+                for row in sorted(level_rows, key=lambda row: row.id)
+            ]
+            deleted_count = len(deleted_levels)
+            total_sublevels_affected = len(sublevel_rows)
             deletion_type = "permanently" if permanent else "soft"
             
             return {
                 "success": True,
                 "message": f"Successfully {deletion_type} deleted {deleted_count} levels and {total_sublevels_affected} sublevels",
                 "data": {
-                    "total_processed": len(levels),
+                    "total_processed": total_processed,
                     "deleted_count": deleted_count,
-                    "skipped_count": len(levels) - deleted_count,
+                    "skipped_count": total_processed - deleted_count,
                     "deletion_type": deletion_type,
                     "deleted_levels": deleted_levels,
                     "total_sublevels_affected": total_sublevels_affected,
@@ -590,14 +567,19 @@ class Level_Management:
             }
 
     def bulk_restore_levels(self, level_ids: List[int]) -> Dict[str, Any]:
-        """Bulk restore soft deleted levels"""
+        """Bulk restore soft deleted levels - set-based, satu transaksi"""
         try:
-            levels = self.db.query(Level).filter(
-                Level.id.in_(level_ids),
-                Level.deleted_at.is_not(None)
+            now = datetime.utcnow()
+            level_rows = self.db.execute(
+                update(Level)
+                .where(Level.id.in_(level_ids), Level.deleted_at.is_not(None))
+                .values(deleted_at=None, updated_at=now)
+                .returning(Level.id, Level.name)
+                .execution_options(synchronize_session=False)
             ).all()
             
-            if not levels:
+            if not level_rows:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No deleted levels found with provided IDs",
@@ -608,42 +590,38 @@ class Level_Management:
                     }
                 }
             
-            restored_count = 0
-            restored_levels = []
-            total_sublevels_restored = 0
-            
-            for level in levels:
-                # Count deleted sublevels that will be restored
-                sublevels = self.db.query(SubLevel).filter(
-                    SubLevel.level_id == level.id,
+            # ✅ Semua sublevel terhapus milik level-level ini dalam satu UPDATE
+            sublevel_rows = self.db.execute(
+                update(SubLevel)
+                .where(
+                    SubLevel.level_id.in_([row.id for row in level_rows]),
                     SubLevel.deleted_at.is_not(None)
-                ).all()
-                sublevel_count = len(sublevels)
-                total_sublevels_restored += sublevel_count
-                
-                # Restore level
-                setattr(level, 'deleted_at', None)
-                setattr(level, 'updated_at', datetime.utcnow())
-                
-                # Restore sublevels
-                for sublevel in sublevels:
-                    setattr(sublevel, 'deleted_at', None)
-                    setattr(sublevel, 'updated_at', datetime.utcnow())
-                
-                restored_levels.append({
-                    "id": level.id,
-                    "name": level.name,
-                    "sublevels_count": sublevel_count
-                })
-                restored_count += 1
+                )
+                .values(deleted_at=None, updated_at=now)
+                .returning(SubLevel.level_id)
+                .execution_options(synchronize_session=False)
+            ).all()
             
             self.db.commit()
+            self.db.expire_all()
+            
+            sublevel_counts = Counter(row.level_id for row in sublevel_rows)
+            restored_levels = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "sublevels_count": sublevel_counts.get(row.id, 0)
+                }
+                for row in sorted(level_rows, key=lambda row: row.id)
+            ]
+            restored_count = len(restored_levels)
+            total_sublevels_restored = len(sublevel_rows)
             
             return {
                 "success": True,
                 "message": f"Successfully restored {restored_count} levels and {total_sublevels_restored} sublevels",
                 "data": {
-                    "total_processed": len(levels),
+                    "total_processed": restored_count,
                     "restored_count": restored_count,
                     "restored_levels": restored_levels,
                     "total_sublevels_restored": total_sublevels_restored,
@@ -679,6 +657,7 @@ class Level_Management:
                 query = query.filter(SubLevel.deleted_at.is_(None))
             
             sublevels = query.order_by(SubLevel.id).all()
+            SubLevel.preload_total_soal(self.db, sublevels)
             
             sublevel_data = []
             for sublevel in sublevels:
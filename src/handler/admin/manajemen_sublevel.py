@@ -3,16 +3,15 @@ import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, and_
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, func, and_, select, update, delete
 
 from ...models.sublevel import SubLevel
 from ...models.level import Level
 from ...models.soal import Soal
 from ...models.progress import Progress
+from .statistics import AdminStatistics
 
-load_dotenv()
 
 class SubLevel_Management:
     def __init__(self, db: Session):
@@ -58,7 +57,7 @@ class SubLevel_Management:
     def get_all_sublevels(self, limit: int = 100, offset: int = 0, include_deleted: bool = False, level_id: Optional[int] = None) -> Dict[str, Any]:
         """Get all sublevels with pagination and consistent response format"""
         try:
-            query = self.db.query(SubLevel)
+            query = self.db.query(SubLevel).options(joinedload(SubLevel.level_ref))
             
             # Filter by level_id if provided
             if level_id:
@@ -70,6 +69,7 @@ class SubLevel_Management:
             
             total_count = query.count()
             sublevels = query.offset(offset).limit(limit).all()
+            SubLevel.preload_total_soal(self.db, sublevels)  # ✅ 1 query, bukan N
             
             result = []
             for sublevel in sublevels:
@@ -114,7 +114,7 @@ class SubLevel_Management:
     def search_sublevels(self, query: str, limit: int = 10, offset: int = 0, include_deleted: bool = False) -> Dict[str, Any]:
         """Search sublevels by name, description, or objective"""
         try:
-            search_query = self.db.query(SubLevel).filter(
+            search_query = self.db.query(SubLevel).options(joinedload(SubLevel.level_ref)).filter(
                 or_(
                     SubLevel.name.ilike(f"%{query}%"),
                     SubLevel.description.ilike(f"%{query}%"),
@@ -127,6 +127,7 @@ class SubLevel_Management:
             
             total_count = search_query.count()
             sublevels = search_query.offset(offset).limit(limit).all()
+            SubLevel.preload_total_soal(self.db, sublevels)
             
             result = []
             for sublevel in sublevels:
@@ -434,9 +435,10 @@ class SubLevel_Management:
     def get_deleted_sublevels(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """Get all soft deleted sublevels"""
         try:
-            query = self.db.query(SubLevel).filter(SubLevel.deleted_at.is_not(None))
+            query = self.db.query(SubLevel).options(joinedload(SubLevel.level_ref)).filter(SubLevel.deleted_at.is_not(None))
             total_count = query.count()
             sublevels = query.offset(offset).limit(limit).all()
+            SubLevel.preload_total_soal(self.db, sublevels)  # ✅ 1 query, bukan N
             
             result = []
             for sublevel in sublevels:
@@ -477,51 +479,10 @@ class SubLevel_Management:
     def get_sublevel_statistics(self, level_id: Optional[int] = None) -> Dict[str, Any]:
         """Get sublevel statistics"""
         try:
-            query = self.db.query(SubLevel)
-            
-            if level_id:
-                query = query.filter(SubLevel.level_id == level_id)
-            
-            total_sublevels = query.count()
-            active_sublevels = query.filter(SubLevel.deleted_at.is_(None)).count()
-            deleted_sublevels = query.filter(SubLevel.deleted_at.is_not(None)).count()
-            
-            # Get sublevels with most soal
-            sublevels_with_soal = query.filter(SubLevel.deleted_at.is_(None)).all()
-            soal_stats = []
-            for sublevel in sublevels_with_soal:
-                soal_count = sublevel.total_soal
-                soal_stats.append({
-                    "sublevel_id": sublevel.id,
-                    "sublevel_name": sublevel.name,
-                    "level_name": sublevel.level_ref.name if sublevel.level_ref else None,
-                    "total_soal": soal_count
-                })
-            
-            # Sort by soal count descending
-            soal_stats.sort(key=lambda x: x["total_soal"], reverse=True)
-            
-            # Get recent sublevels (last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_sublevels = query.filter(
-                SubLevel.created_at >= thirty_days_ago,
-                SubLevel.deleted_at.is_(None)
-            ).count()
-            
-            stats_data = {
-                "total_sublevels": total_sublevels,
-                "active_sublevels": active_sublevels,
-                "deleted_sublevels": deleted_sublevels,
-                "recent_sublevels": recent_sublevels,
-                "top_sublevels_by_soal": soal_stats[:10],  # Top 10
-                "level_filter": level_id,
-                "generated_at": datetime.utcnow().isoformat()
-            }
-            
             return {
                 "success": True,
                 "message": "SubLevel statistics retrieved successfully",
-                "data": stats_data
+                "data": AdminStatistics(self.db).sublevel_stats(level_id=level_id)
             }
         except Exception as e:
             return {
@@ -530,12 +491,47 @@ class SubLevel_Management:
                 "data": {}
             }
 
+    def _level_names(self, level_ids) -> Dict[int, str]:
+        """Nama level untuk sekumpulan id (satu query)"""
+        level_ids = set(level_ids)
+        if not level_ids:
+            return {}
+        return dict(self.db.query(Level.id, Level.name).filter(Level.id.in_(level_ids)).all())
+
     def bulk_delete_sublevels(self, sublevel_ids: List[int], permanent: bool = False) -> Dict[str, Any]:
-        """Bulk delete sublevels (soft or permanent)"""
+        """Bulk delete sublevels (soft or permanent) - set-based, satu transaksi"""
         try:
-            sublevels = self.db.query(SubLevel).filter(SubLevel.id.in_(sublevel_ids)).all()
-            
-            if not sublevels:
+            # ✅ UPDATE/DELETE ... WHERE id IN (...) RETURNING: tanpa load ORM object satu per satu
+            if permanent:
+                self.db.execute(
+                    delete(Progress).where(Progress.sublevel_id.in_(sublevel_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.execute(
+                    delete(Soal).where(Soal.sublevel_id.in_(sublevel_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                rows = self.db.execute(
+                    delete(SubLevel).where(SubLevel.id.in_(sublevel_ids))
+                    .returning(SubLevel.id, SubLevel.name, SubLevel.level_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                total_processed = len(rows)
+            else:
+                total_processed = self.db.query(func.count(SubLevel.id)).filter(
+                    SubLevel.id.in_(sublevel_ids)
+                ).scalar() or 0
+                now = datetime.utcnow()
+                rows = self.db.execute(
+                    update(SubLevel)
+                    .where(SubLevel.id.in_(sublevel_ids), SubLevel.deleted_at.is_(None))
+                    .values(deleted_at=now, updated_at=now)
+                    .returning(SubLevel.id, SubLevel.name, SubLevel.level_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+            
+            if total_processed == 0:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No sublevels found with provided IDs",
@@ -546,43 +542,28 @@ class SubLevel_Management:
                     }
                 }
             
-            deleted_count = 0
-            deleted_sublevels = []
-            
-            for sublevel in sublevels:
-                if permanent:
-                    # Delete related progress records
-                    self.db.query(Progress).filter(Progress.sublevel_id == sublevel.id).delete()
-                    
-                    deleted_sublevels.append({
-                        "id": sublevel.id,
-                        "name": sublevel.name,
-                        "level_name": sublevel.level_ref.name if sublevel.level_ref else None
-                    })
-                    self.db.delete(sublevel)
-                    deleted_count += 1
-                else:
-                    if sublevel.deleted_at is None:  # Only soft delete if not already deleted
-                        setattr(sublevel, 'deleted_at', datetime.utcnow())
-                        setattr(sublevel, 'updated_at', datetime.utcnow())
-                        deleted_sublevels.append({
-                            "id": sublevel.id,
-                            "name": sublevel.name,
-                            "level_name": sublevel.level_ref.name if sublevel.level_ref else None
-                        })
-                        deleted_count += 1
-            
+            level_names = self._level_names(row.level_id for row in rows)
             self.db.commit()
+            self.db.expire_all()  # Object di identity map sudah basi setelah bulk statement
             
+            deleted_sublevels = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "level_name": level_names.get(row.level_id)
+                }
+                for row in sorted(rows, key=lambda row: row.id)
+            ]
+            deleted_count = len(deleted_sublevels)
             deletion_type = "permanently" if permanent else "soft"
             
             return {
                 "success": True,
-                "message": f"Successfully {deletion_type} deleted {deleted_count} out of {len(sublevels)} sublevels",
+                "message": f"Successfully {deletion_type} deleted {deleted_count} out of {total_processed} sublevels",
                 "data": {
-                    "total_processed": len(sublevels),
+                    "total_processed": total_processed,
                     "deleted_count": deleted_count,
-                    "skipped_count": len(sublevels) - deleted_count,
+                    "skipped_count": total_processed - deleted_count,
                     "deletion_type": deletion_type,
                     "deleted_sublevels": deleted_sublevels,
                     "processed_at": datetime.utcnow().isoformat()
@@ -601,14 +582,33 @@ class SubLevel_Management:
             }
 
     def bulk_restore_sublevels(self, sublevel_ids: List[int]) -> Dict[str, Any]:
-        """Bulk restore soft deleted sublevels"""
+        """Bulk restore soft deleted sublevels - set-based, satu transaksi"""
         try:
-            sublevels = self.db.query(SubLevel).filter(
+            # Sublevel dengan parent level yang masih terhapus tidak di-restore
+            skipped_rows = self.db.query(SubLevel.id, SubLevel.name, Level.name.label("level_name")).join(
+                Level, SubLevel.level_id == Level.id
+            ).filter(
                 SubLevel.id.in_(sublevel_ids),
-                SubLevel.deleted_at.is_not(None)
+                SubLevel.deleted_at.is_not(None),
+                Level.deleted_at.is_not(None)
+            ).order_by(SubLevel.id).all()
+            
+            active_levels = select(Level.id).where(Level.deleted_at.is_(None))
+            rows = self.db.execute(
+                update(SubLevel)
+                .where(
+                    SubLevel.id.in_(sublevel_ids),
+                    SubLevel.deleted_at.is_not(None),
+                    SubLevel.level_id.in_(active_levels)
+                )
+                .values(deleted_at=None, updated_at=datetime.utcnow())
+                .returning(SubLevel.id, SubLevel.name, SubLevel.level_id)
+                .execution_options(synchronize_session=False)
             ).all()
             
-            if not sublevels:
+            total_processed = len(rows) + len(skipped_rows)
+            if total_processed == 0:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No deleted sublevels found with provided IDs",
@@ -619,36 +619,33 @@ class SubLevel_Management:
                     }
                 }
             
-            restored_count = 0
-            restored_sublevels = []
-            skipped_sublevels = []
-            
-            for sublevel in sublevels:
-                # Check if parent level is not deleted
-                if sublevel.level_ref and sublevel.level_ref.deleted_at is not None:
-                    skipped_sublevels.append({
-                        "id": sublevel.id,
-                        "name": sublevel.name,
-                        "reason": f"Parent level '{sublevel.level_ref.name}' is deleted"
-                    })
-                    continue
-                
-                setattr(sublevel, 'deleted_at', None)
-                setattr(sublevel, 'updated_at', datetime.utcnow())
-                restored_sublevels.append({
-                    "id": sublevel.id,
-                    "name": sublevel.name,
-                    "level_name": sublevel.level_ref.name if sublevel.level_ref else None
-                })
-                restored_count += 1
-            
+            level_names = self._level_names(row.level_id for row in rows)
             self.db.commit()
+            self.db.expire_all()
+            
+            restored_sublevels = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "level_name": level_names.get(row.level_id)
+                }
+                for row in sorted(rows, key=lambda row: row.id)
+            ]
+            skipped_sublevels = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "reason": f"Parent level '{row.level_name}' is deleted"
+                }
+                for row in skipped_rows
+            ]
+            restored_count = len(restored_sublevels)
             
             return {
                 "success": True,
-                "message": f"Successfully restored {restored_count} out of {len(sublevels)} sublevels",
+                "message": f"Successfully restored {restored_count} out of {total_processed} sublevels",
                 "data": {
-                    "total_processed": len(sublevels),
+                    "total_processed": total_processed,
                     "restored_count": restored_count,
                     "skipped_count": len(skipped_sublevels),
                     "restored_sublevels": restored_sublevels,
@@ -686,6 +683,7 @@ class SubLevel_Management:
                 query = query.filter(SubLevel.deleted_at.is_(None))
             
             sublevels = query.order_by(SubLevel.id).all()
+            SubLevel.preload_total_soal(self.db, sublevels)
             
             result = []
             for sublevel in sublevels:
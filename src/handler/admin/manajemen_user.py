@@ -1,22 +1,26 @@
-import os
 import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from dotenv import load_dotenv
+from sqlalchemy import or_, func, select, update, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from ...config.hash import hash_password, verify_password
+from ...config.settings import settings
 from ...models.user import User, UserRole
 from ...models.badges import Badge
+from ...models.user_badge import user_badge_association
+from .statistics import AdminStatistics
 from ...dto.user_dto import (
     UserDataDTO, UserListDataDTO, UserProfileDataDTO,
     UserResponse, UserListResponse, UserProfileResponse,
     UserStatsResponse, GenericUserResponse
 )
 
-load_dotenv()
+
+# Ukuran chunk untuk bulk operation (batas parameter IN per statement)
+BULK_CHUNK_SIZE = settings.user_bulk_chunk_size
 
 class User_Management:
     def __init__(self, db: Session):
@@ -418,38 +422,10 @@ class User_Management:
     def get_user_statistics(self) -> Dict[str, Any]:
         """Get user statistics with consistent response format"""
         try:
-            total_users = self.db.query(User).count()
-            active_users = self.db.query(User).filter(User.is_active.is_(True)).count()
-            verified_users = self.db.query(User).filter(User.is_verified.is_(True)).count()
-            admin_count = self.db.query(User).filter(User.role == UserRole.ADMIN).count()
-            moderator_count = self.db.query(User).filter(User.role == UserRole.MODERATOR).count()
-            user_count = self.db.query(User).filter(User.role == UserRole.USER).count()
-            
-            # Get recent registrations (last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_registrations = self.db.query(User).filter(
-                User.created_at >= thirty_days_ago
-            ).count()
-            
-            stats_data = {
-                "total_users": total_users,
-                "active_users": active_users,
-                "verified_users": verified_users,
-                "inactive_users": total_users - active_users,
-                "unverified_users": total_users - verified_users,
-                "recent_registrations": recent_registrations,
-                "roles": {
-                    "admin": admin_count,
-                    "moderator": moderator_count,
-                    "user": user_count
-                },
-                "generated_at": datetime.utcnow().isoformat()
-            }
-            
             return {
                 "success": True,
                 "message": "User statistics retrieved successfully",
-                "data": stats_data
+                "data": AdminStatistics(self.db).user_stats()
             }
         except Exception as e:
             return {
@@ -458,45 +434,89 @@ class User_Management:
                 "data": {}
             }
 
-    def bulk_activate_users(self, user_ids: List[int]) -> Dict[str, Any]:
-        """Bulk activate users with consistent response format"""
+    # =====================================================================
+    # BULK OPERATIONS - set-based, chunked, satu transaksi
+    # =====================================================================
+
+    @staticmethod
+    def _chunks(ids: List[int], size: int = BULK_CHUNK_SIZE):
+        unique_ids = list(dict.fromkeys(ids))  # Dedup, urutan dipertahankan
+        for start in range(0, len(unique_ids), size):
+            yield unique_ids[start:start + size]
+
+    def _existing_ids(self, chunk: List[int]) -> set:
+        return set(self.db.execute(select(User.id).where(User.id.in_(chunk))).scalars().all())
+
+    @staticmethod
+    def _invalidate_user_caches():
+        """Snapshot yang bergantung pada status/role user (statistik dashboard)"""
+        AdminStatistics.invalidate("users")
+
+    def _bulk_update(self, user_ids: List[int], condition, values: Dict[str, Any], changed_status: str):
+        """
+        UPDATE users SET ... WHERE id IN (chunk) AND <condition> RETURNING id, username.
+
+        Return (changed_rows, results) dengan status per id:
+        ``changed_status`` / "unchanged" / "not_found".
+        """
+        changed_rows = []
+        results: Dict[int, str] = {}
+        for chunk in self._chunks(user_ids):
+            existing = self._existing_ids(chunk)
+            rows = self.db.execute(
+                update(User)
+                .where(User.id.in_(chunk), condition)
+                .values(**values, updated_at=datetime.utcnow())
+                .returning(User.id, User.username)
+                .execution_options(synchronize_session=False)
+            ).all()
+            changed = {row.id for row in rows}
+            changed_rows.extend(rows)
+            for user_id in chunk:
+                if user_id in changed:
+                    results[user_id] = changed_status
+                elif user_id in existing:
+                    results[user_id] = "unchanged"
+                else:
+                    results[user_id] = "not_found"
+        return changed_rows, results
+
+    def _bulk_set_active(self, user_ids: List[int], active: bool) -> Dict[str, Any]:
+        action = "activated" if active else "deactivated"
+        label = "activation" if active else "deactivation"
         try:
-            users = self.db.query(User).filter(User.id.in_(user_ids)).all()
-            
-            if not users:
+            # NULL diperlakukan sebagai tidak aktif (sama seperti bool(user.is_active))
+            condition = User.is_active.isnot(True) if active else User.is_active.is_(True)
+            rows, results = self._bulk_update(user_ids, condition, {"is_active": active}, action)
+            not_found = [user_id for user_id, result in results.items() if result == "not_found"]
+            total_processed = len(results) - len(not_found)
+            
+            if total_processed == 0:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No users found with provided IDs",
                     "data": {
                         "processed_count": 0,
-                        "activated_count": 0,
+                        f"{action}_count": 0,
                         "user_ids": user_ids
                     }
                 }
             
-            activated_count = 0
-            activated_users = []
-            
-            for user in users:
-                if not bool(user.is_active):
-                    setattr(user, 'is_active', True)
-                    setattr(user, 'updated_at', datetime.utcnow())
-                    activated_count += 1
-                    activated_users.append({
-                        "id": user.id,
-                        "username": user.username
-                    })
-            
             self.db.commit()
+            self.db.expire_all()
+            self._invalidate_user_caches()
             
             return {
                 "success": True,
-                "message": f"Successfully activated {activated_count} out of {len(users)} users",
+                "message": f"Successfully {action} {len(rows)} out of {total_processed} users",
                 "data": {
-                    "total_processed": len(users),
-                    "activated_count": activated_count,
-                    "skipped_count": len(users) - activated_count,
-                    "activated_users": activated_users,
+                    "total_processed": total_processed,
+                    f"{action}_count": len(rows),
+                    "skipped_count": total_processed - len(rows),
+                    f"{action}_users": [{"id": row.id, "username": row.username} for row in rows],
+                    "not_found_ids": not_found,
+                    "results": results,
                     "processed_at": datetime.utcnow().isoformat()
                 }
             }
@@ -504,53 +524,66 @@ class User_Management:
             self.db.rollback()
             return {
                 "success": False,
-                "message": f"Bulk activation failed: {str(e)}",
+                "message": f"Bulk {label} failed: {str(e)}",
                 "data": {
                     "processed_count": 0,
-                    "activated_count": 0,
+                    f"{action}_count": 0,
                     "user_ids": user_ids
                 }
             }
 
+    def bulk_activate_users(self, user_ids: List[int]) -> Dict[str, Any]:
+        """Bulk activate users with consistent response format"""
+        return self._bulk_set_active(user_ids, True)
+
     def bulk_deactivate_users(self, user_ids: List[int]) -> Dict[str, Any]:
         """Bulk deactivate users with consistent response format"""
+        return self._bulk_set_active(user_ids, False)
+
+    def bulk_update_role(self, user_ids: List[int], new_role: str) -> Dict[str, Any]:
+        """Bulk change role (satu UPDATE per chunk)"""
+        try:
+            role_enum = UserRole(new_role)
+        except ValueError:
+            return {
+                "success": False,
+                "message": f"Invalid role value: {new_role}",
+                "data": None
+            }
+        
         try:
-            users = self.db.query(User).filter(User.id.in_(user_ids)).all()
+            condition = or_(User.role.is_(None), User.role != role_enum)
+            rows, results = self._bulk_update(user_ids, condition, {"role": role_enum}, "updated")
+            not_found = [user_id for user_id, result in results.items() if result == "not_found"]
+            total_processed = len(results) - len(not_found)
             
-            if not users:
+            if total_processed == 0:
+                self.db.rollback()
                 return {
                     "success": False,
                     "message": "No users found with provided IDs",
                     "data": {
                         "processed_count": 0,
-                        "deactivated_count": 0,
+                        "updated_count": 0,
                         "user_ids": user_ids
                     }
                 }
             
-            deactivated_count = 0
-            deactivated_users = []
-            
-            for user in users:
-                if bool(user.is_active):
-                    setattr(user, 'is_active', False)
-                    setattr(user, 'updated_at', datetime.utcnow())
-                    deactivated_count += 1
-                    deactivated_users.append({
-                        "id": user.id,
-                        "username": user.username
-                    })
-            
             self.db.commit()
+            self.db.expire_all()
+            self._invalidate_user_caches()
             
             return {
                 "success": True,
-                "message": f"Successfully deactivated {deactivated_count} out of {len(users)} users",
+                "message": f"Role '{role_enum.value}' applied to {len(rows)} out of {total_processed} users",
                 "data": {
-                    "total_processed": len(users),
-                    "deactivated_count": deactivated_count,
-                    "skipped_count": len(users) - deactivated_count,
-                    "deactivated_users": deactivated_users,
+                    "new_role": role_enum.value,
+                    "total_processed": total_processed,
+                    "updated_count": len(rows),
+                    "skipped_count": total_processed - len(rows),
+                    "updated_users": [{"id": row.id, "username": row.username} for row in rows],
+                    "not_found_ids": not_found,
+                    "results": results,
                     "processed_at": datetime.utcnow().isoformat()
                 }
             }
@@ -558,14 +591,105 @@ class User_Management:
             self.db.rollback()
             return {
                 "success": False,
-                "message": f"Bulk deactivation failed: {str(e)}",
+                "message": f"Bulk role update failed: {str(e)}",
                 "data": {
                     "processed_count": 0,
-                    "deactivated_count": 0,
+                    "updated_count": 0,
                     "user_ids": user_ids
                 }
             }
+
+    def bulk_assign_badge(self, user_ids: List[int], badge_id: int) -> Dict[str, Any]:
+        """
+        Bulk assign badge: INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING per chunk,
+        lalu total_badges dihitung ulang hanya untuk user yang benar-benar mendapat badge.
+        """
+        try:
+            badge = self.db.query(Badge).filter(Badge.id == badge_id).first()
+            if not badge:
+                return {
+                    "success": False,
+                    "message": f"Badge with ID {badge_id} not found",
+                    "data": None
+                }
+            
+            results: Dict[int, str] = {}
+            assigned_ids: List[int] = []
+            for chunk in self._chunks(user_ids):
+                existing = self._existing_ids(chunk)
+                inserted = set(self.db.execute(
+                    pg_insert(user_badge_association)
+                    .from_select(
+                        ["user_id", "badge_id"],
+                        select(User.id, literal(badge_id)).where(User.id.in_(chunk))
+                    )
+                    .on_conflict_do_nothing(constraint="uq_user_badge")
+                    .returning(user_badge_association.c.user_id)
+                ).scalars().all())
+                
+                if inserted:
+                    badge_count = select(func.count()).select_from(user_badge_association).where(
+                        user_badge_association.c.user_id == User.id
+                    ).scalar_subquery()
+                    self.db.execute(
+                        update(User)
+                        .where(User.id.in_(inserted))
+                        .values(total_badges=badge_count, updated_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                
+                for user_id in chunk:
+                    if user_id in inserted:
+                        results[user_id] = "assigned"
+                        assigned_ids.append(user_id)
+                    elif user_id in existing:
+                        results[user_id] = "already_assigned"
+                    else:
+                        results[user_id] = "not_found"
+            
+            not_found = [user_id for user_id, result in results.items() if result == "not_found"]
+            total_processed = len(results) - len(not_found)
+            if total_processed == 0:
+                self.db.rollback()
+                return {
+                    "success": False,
+                    "message": "No users found with provided IDs",
+                    "data": {
+                        "processed_count": 0,
+                        "assigned_count": 0,
+                        "user_ids": user_ids
+                    }
+                }
+            
+            self.db.commit()
+            self.db.expire_all()
             
+            return {
+                "success": True,
+                "message": f"Badge '{badge.nama}' assigned to {len(assigned_ids)} out of {total_processed} users",
+                "data": {
+                    "badge_id": badge.id,
+                    "badge_name": badge.nama,
+                    "total_processed": total_processed,
+                    "assigned_count": len(assigned_ids),
+                    "skipped_count": total_processed - len(assigned_ids),
+                    "assigned_user_ids": assigned_ids,
+                    "not_found_ids": not_found,
+                    "results": results,
+                    "assigned_at": datetime.utcnow().isoformat()
+                }
+            }
+        except Exception as e:
+            self.db.rollback()
+            return {
+                "success": False,
+                "message": f"Bulk badge assignment failed: {str(e)}",
+                "data": {
+                    "processed_count": 0,
+                    "assigned_count": 0,
+                    "user_ids": user_ids
+                }
+            }
 
     def get_user_badges(self, user_id: int) -> Dict[str, Any]:
         """Get user's badges with consistent response format"""
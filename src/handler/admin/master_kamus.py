@@ -6,6 +6,7 @@ from sqlalchemy import or_, func, and_
 
 from ...models.kamus import Kamus
 from ...models.soal import Soal
+from .statistics import AdminStatistics
 
 class Kamus_Management:
     """Handler for Kamus management operations"""
@@ -121,6 +122,7 @@ class Kamus_Management:
             
             # Apply pagination
             kamus_list = query.order_by(Kamus.word_text.asc()).offset(offset).limit(limit).all()
+            Kamus.preload_total_soal(self.db, kamus_list)  # ✅ 1 query, bukan N
             
             return {
                 "success": True,
@@ -158,36 +160,10 @@ class Kamus_Management:
     def get_kamus_statistics(self) -> Dict[str, Any]:
         """Get kamus statistics grouped by category"""
         try:
-            total_kamus = self.db.query(func.count(Kamus.id)).filter(
-                Kamus.deleted_at.is_(None)
-            ).scalar() or 0
-            
-            # Count by category
-            category_stats = {}
-            for cat in Kamus.CategoryEnum:
-                count = self.db.query(func.count(Kamus.id)).filter(
-                    Kamus.category == cat,
-                    Kamus.deleted_at.is_(None)
-                ).scalar() or 0
-                
-                category_stats[cat.value] = {
-                    "count": count,
-                    "percentage": round((count / total_kamus * 100), 2) if total_kamus > 0 else 0,
-                    "display_name": Kamus(category=cat).get_category_display()
-                }
-            
-            deleted_count = self.db.query(func.count(Kamus.id)).filter(
-                Kamus.deleted_at.isnot(None)
-            ).scalar() or 0
-            
             return {
                 "success": True,
                 "message": "Statistics retrieved successfully",
-                "data": {
-                    "total_active": total_kamus,
-                    "total_deleted": deleted_count,
-                    "by_category": category_stats
-                }
+                "data": AdminStatistics(self.db).kamus_stats()
             }
             
         except Exception as e:
@@ -0,0 +1,252 @@
+import copy
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_
+
+from ...models.user import User, UserRole
+from ...models.level import Level
+from ...models.sublevel import SubLevel
+from ...models.soal import Soal
+from ...models.kamus import Kamus
+from ...utils.metrics import cache_hit, cache_miss
+from ...config.settings import settings
+
+
+class AdminStatistics:
+    """
+    Dashboard aggregates untuk admin.
+
+    Setiap section dihitung dengan satu query COUNT(*) FILTER (...) plus paling
+    banyak satu GROUP BY, lalu disimpan sebagai snapshot (dengan generated_at)
+    yang dipakai ulang sampai TTL habis atau di-invalidate.
+    """
+
+    # Class-level snapshot cache: key -> (generated_at, data)
+    _snapshots: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+    _snapshot_ttl = settings.admin_stats_ttl
+    _lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # =====================================================================
+    # SNAPSHOT CACHE
+    # =====================================================================
+
+    def _snapshot(self, key: str, compute: Callable[[], Dict[str, Any]], refresh: bool = False) -> Dict[str, Any]:
+        """Return salinan snapshot (cached atau dihitung ulang jika expired)"""
+        now = datetime.utcnow()
+        if not refresh:
+            cached = self._snapshots.get(key)
+            if cached and (now - cached[0]).total_seconds() <= self._snapshot_ttl:
+                cache_hit("admin_stats")
+                return copy.deepcopy(cached[1])  # Caller boleh mutasi tanpa merusak cache
+
+        cache_miss("admin_stats")
+        data = compute()
+        data["generated_at"] = now.isoformat()
+        with self._lock:
+            self._snapshots[key] = (now, data)
+        return copy.deepcopy(data)
+
+    @classmethod
+    def invalidate(cls, prefix: Optional[str] = None):
+        """Invalidate snapshot (all or by prefix)"""
+        with cls._lock:
+            if prefix:
+                for key in [k for k in cls._snapshots if k.startswith(prefix)]:
+                    cls._snapshots.pop(key, None)
+            else:
+                cls._snapshots.clear()
+
+    # =====================================================================
+    # SECTIONS
+    # =====================================================================
+
+    def user_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Users: total, active, verified, roles, recent registrations (1 query)"""
+        def compute():
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            row = self.db.query(
+                func.count(User.id),
+                func.count(User.id).filter(User.is_active.is_(True)),
+                func.count(User.id).filter(User.is_verified.is_(True)),
+                func.count(User.id).filter(User.role == UserRole.ADMIN),
+                func.count(User.id).filter(User.role == UserRole.MODERATOR),
+                func.count(User.id).filter(User.role == UserRole.USER),
+                func.count(User.id).filter(User.created_at >= thirty_days_ago),
+            ).one()
+            total, active, verified, admin, moderator, user, recent = (int(v or 0) for v in row)
+            return {
+                "total_users": total,
+                "active_users": active,
+                "verified_users": verified,
+                "inactive_users": total - active,
+                "unverified_users": total - verified,
+                "recent_registrations": recent,
+                "roles": {
+                    "admin": admin,
+                    "moderator": moderator,
+                    "user": user
+                }
+            }
+        return self._snapshot("users", compute, refresh)
+
+    def level_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Levels: counts (1 query) + top levels by sublevel count (1 GROUP BY)"""
+        def compute():
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            active = Level.deleted_at.is_(None)
+            total, active_count, recent = self.db.query(
+                func.count(Level.id),
+                func.count(Level.id).filter(active),
+                func.count(Level.id).filter(and_(active, Level.created_at >= thirty_days_ago)),
+            ).one()
+
+            sublevel_count = func.count(SubLevel.id)
+            top_levels = self.db.query(Level.id, Level.name, sublevel_count.label("total_sublevels"))\
+                .outerjoin(SubLevel, SubLevel.level_id == Level.id)\
+                .filter(active)\
+                .group_by(Level.id, Level.name)\
+                .order_by(sublevel_count.desc(), Level.id)\
+                .limit(10)\
+                .all()
+
+            return {
+                "total_levels": int(total or 0),
+                "active_levels": int(active_count or 0),
+                "deleted_levels": int(total or 0) - int(active_count or 0),
+                "recent_levels": int(recent or 0),
+                "top_levels_by_sublevels": [
+                    {"level_id": r.id, "level_name": r.name, "total_sublevels": int(r.total_sublevels)}
+                    for r in top_levels
+                ]
+            }
+        return self._snapshot("levels", compute, refresh)
+
+    def sublevel_stats(self, level_id: Optional[int] = None, refresh: bool = False) -> Dict[str, Any]:
+        """SubLevels: counts (1 query) + top sublevels by soal count (1 GROUP BY)"""
+        def compute():
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            active = SubLevel.deleted_at.is_(None)
+            counts = self.db.query(
+                func.count(SubLevel.id),
+                func.count(SubLevel.id).filter(active),
+                func.count(SubLevel.id).filter(and_(active, SubLevel.created_at >= thirty_days_ago)),
+            )
+            if level_id:
+                counts = counts.filter(SubLevel.level_id == level_id)
+            total, active_count, recent = counts.one()
+
+            soal_count = func.count(Soal.id)
+            top_query = self.db.query(
+                SubLevel.id, SubLevel.name, Level.name.label("level_name"), soal_count.label("total_soal")
+            ).outerjoin(Level, SubLevel.level_id == Level.id)\
+             .outerjoin(Soal, Soal.sublevel_id == SubLevel.id)\
+             .filter(active)
+            if level_id:
+                top_query = top_query.filter(SubLevel.level_id == level_id)
+            top_sublevels = top_query\
+                .group_by(SubLevel.id, SubLevel.name, Level.name)\
+                .order_by(soal_count.desc(), SubLevel.id)\
+                .limit(10)\
+                .all()
+
+            return {
+                "total_sublevels": int(total or 0),
+                "active_sublevels": int(active_count or 0),
+                "deleted_sublevels": int(total or 0) - int(active_count or 0),
+                "recent_sublevels": int(recent or 0),
+                "top_sublevels_by_soal": [
+                    {
+                        "sublevel_id": r.id,
+                        "sublevel_name": r.name,
+                        "level_name": r.level_name,
+                        "total_soal": int(r.total_soal)
+                    }
+                    for r in top_sublevels
+                ],
+                "level_filter": level_id
+            }
+        return self._snapshot(f"sublevels:{level_id or 'all'}", compute, refresh)
+
+    def soal_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Soal: counts (1 query) + soal per sublevel (1 GROUP BY)"""
+        def compute():
+            active = Soal.deleted_at.is_(None)
+            total, active_count = self.db.query(
+                func.count(Soal.id),
+                func.count(Soal.id).filter(active),
+            ).one()
+
+            by_sublevel = self.db.query(
+                SubLevel.id,
+                SubLevel.name,
+                Level.name.label("level_name"),
+                func.count(Soal.id).label("soal_count")
+            ).select_from(SubLevel)\
+             .join(Level, SubLevel.level_id == Level.id)\
+             .outerjoin(Soal, and_(SubLevel.id == Soal.sublevel_id, active))\
+             .group_by(SubLevel.id, SubLevel.name, Level.name)\
+             .all()
+
+            return {
+                "summary": {
+                    "total_soal": int(total or 0),
+                    "active_soal": int(active_count or 0),
+                    "deleted_soal": int(total or 0) - int(active_count or 0)
+                },
+                "by_sublevel": [
+                    {
+                        "sublevel_id": r.id,
+                        "sublevel_name": r.name,
+                        "level_name": r.level_name,
+                        "soal_count": int(r.soal_count)
+                    }
+                    for r in by_sublevel
+                ]
+            }
+        return self._snapshot("soal", compute, refresh)
+
+    def kamus_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Kamus: active/deleted per category dalam satu GROUP BY"""
+        def compute():
+            rows = self.db.query(
+                Kamus.category,
+                func.count(Kamus.id).filter(Kamus.deleted_at.is_(None)),
+                func.count(Kamus.id).filter(Kamus.deleted_at.isnot(None)),
+            ).group_by(Kamus.category).all()
+
+            active_by_category = {cat: int(active or 0) for cat, active, _ in rows}
+            total_active = sum(active_by_category.values())
+            total_deleted = sum(int(deleted or 0) for _, _, deleted in rows)
+
+            category_stats = {}
+            for cat in Kamus.CategoryEnum:
+                count = active_by_category.get(cat, 0)
+                category_stats[cat.value] = {
+                    "count": count,
+                    "percentage": round((count / total_active * 100), 2) if total_active > 0 else 0,
+                    "display_name": Kamus(category=cat).get_category_display()
+                }
+
+            return {
+                "total_active": total_active,
+                "total_deleted": total_deleted,
+                "by_category": category_stats
+            }
+        return self._snapshot("kamus", compute, refresh)
+
+    def dashboard(self, refresh: bool = False) -> Dict[str, Any]:
+        """Semua section dashboard dalam satu response"""
+        return {
+            "users": self.user_stats(refresh),
+            "levels": self.level_stats(refresh),
+            "sublevels": self.sublevel_stats(refresh=refresh),
+            "soal": self.soal_stats(refresh),
+            "kamus": self.kamus_stats(refresh),
+            "generated_at": datetime.utcnow().isoformat()
+        }
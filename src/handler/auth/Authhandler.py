@@ -1,17 +1,25 @@
-import os
 import re
+import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy.orm import Session
-from dotenv import load_dotenv
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, load_only
 import uuid
 
 from ...config.hash import hash_password, verify_password
 from ...models.user import User, UserRole
 from ...config.middleware import auth_manager
+from ...utils.activity_writer import activity_writer
 
-load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Kolom yang dibutuhkan login (password check + token + response)
+LOGIN_COLUMNS = (
+    User.id, User.unique_id, User.username, User.email, User.password,
+    User.nama, User.role, User.avatar, User.is_active, User.is_verified,
+)
 
 class AuthHandler:
     """Authentication handler for business logic only"""
@@ -136,8 +144,10 @@ class AuthHandler:
             raise ValueError("Database session is required")
             
         try:
-            user = db.query(User).filter(
-                (User.email == email_or_username) | (User.username == email_or_username)
+            # ✅ Exact match (ix_users_email / ix_users_username), username tidak unique
+            # sehingga tidak dibuat case-insensitive; hanya kolom untuk verifikasi + token
+            user = db.query(User).options(load_only(*LOGIN_COLUMNS)).filter(
+                or_(User.email == email_or_username, User.username == email_or_username)
             ).first()
             
             if not user:
@@ -152,16 +162,17 @@ class AuthHandler:
                     detail="Invalid email/username or password"
                 )
             
-            # ✅ FIX: Type-safe is_active check
+            # ✅ last_login ditulis oleh batched background writer
+            last_login = activity_writer.record_login(user.id)
+            
+            # ✅ FIX: Type-safe is_active check (re-activation jarang, tetap sinkron)
             is_active_val = getattr(user, 'is_active', None)
             if is_active_val is None or not bool(is_active_val):
-                setattr(user, 'is_active', True)
-                setattr(user, 'last_login', datetime.utcnow())
-                db.commit()
-                db.refresh(user)
-            else:
-                setattr(user, 'last_login', datetime.utcnow())
+                db.query(User).filter(User.id == user.id).update(
+                    {User.is_active: True}, synchronize_session=False
+                )
                 db.commit()
+                setattr(user, 'is_active', True)
             
             access_token_expires = timedelta(minutes=self.auth_manager.access_token_expire_minutes)
             access_token = self.auth_manager.create_access_token(
@@ -190,7 +201,7 @@ class AuthHandler:
                     "avatar_url": avatar_url,
                     "is_active": bool(getattr(user, 'is_active', False)),
                     "is_verified": bool(getattr(user, 'is_verified', False)),
-                    "last_login": user.last_login.isoformat() if user.last_login is not None else None
+                    "last_login": last_login.isoformat()
                 }
             }
             
@@ -397,15 +408,10 @@ class AuthHandler:
             
             # ✅ Update avatar if provided
             if avatar_file is not None and avatar_file.filename:
-                from ...utils.FileHandler import STORAGE_FOLDERS, _ensure_dir_exists, save_image
-                
-                # Ensure avatars folder exists
-                avatar_folder = os.path.join(STORAGE_FOLDERS.get("soal", "").replace("soal", ""), "avatars")
-                _ensure_dir_exists(avatar_folder)
-                STORAGE_FOLDERS["avatars"] = avatar_folder
+                from ...utils.FileHandler import save_image
                 
-                # Save new avatar
-                avatar_path = save_image(avatar_file, "avatars")
+                # Save new avatar (content-addressed media store)
+                avatar_path = await save_image(avatar_file, "avatars")
                 
                 # ✅ FIX: Re-query user after file operation to ensure session attachment
                 user_id = current_user.id
@@ -417,18 +423,8 @@ class AuthHandler:
                         detail="User not found after avatar upload"
                     )
                 
-                # Delete old avatar if exists
-                old_avatar = getattr(current_user, 'avatar', None)
-                if old_avatar is not None and old_avatar != "":
-                    old_avatar_path = os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)),
-                        old_avatar.replace("storage/", "")
-                    )
-                    if os.path.exists(old_avatar_path):
-                        try:
-                            os.remove(old_avatar_path)
-                        except Exception as e:
-                            print(f"Warning: Could not delete old avatar: {e}")
+                # Avatar lama tidak dihapus langsung: file media bisa dipakai bersama,
+                # orphan dibersihkan oleh `python cli.py storage:gc`
                 
                 # Update user avatar
                 setattr(current_user, 'avatar', avatar_path)
@@ -565,17 +561,8 @@ class AuthHandler:
                     detail="No avatar to delete"
                 )
             
-            avatar_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)),
-                avatar_val.replace("storage/", "")
-            )
-            
-            if os.path.exists(avatar_path):
-                try:
-                    os.remove(avatar_path)
-                except Exception as e:
-                    print(f"Warning: Could not delete avatar file: {e}")
-            
+            # ✅ Blob media content-addressed (bisa dipakai user/soal/kamus lain):
+            # hanya referensi yang dilepas, file orphan dibersihkan `python cli.py storage:gc`
             setattr(current_user, 'avatar', None)
             setattr(current_user, 'updated_at', datetime.utcnow())
             
@@ -1,5 +1,6 @@
+import logging
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import func, and_
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException, status
 from datetime import date, datetime
@@ -9,12 +10,15 @@ from src.models.sublevel import SubLevel
 from src.models.level import Level
 from src.models.soal import Soal
 from src.models.progress import Progress, ProgressStatus
+from src.handler.user.leaderBoard import leaderboard_engine
 from src.dto.exercise_dto import (
     SoalResponse, QuizDataResponse, QuizResultResponse,
     SubLevelProgressResponse, AvailableSubLevelResponse,
     FinishQuizRequest
 )
 
+logger = logging.getLogger(__name__)
+
 class SoalHandler:
     """Handler untuk business logic terkait soal dan quiz"""
     
@@ -56,27 +60,18 @@ class SoalHandler:
         Returns:
             bool: True jika semua sublevel di level ini sudah completed
         """
-        # Get all sublevels in this level
-        sublevels = self.db.query(SubLevel).filter(
+        # ✅ Satu query: jumlah sublevel aktif vs yang completed oleh user
+        total, completed = self.db.query(
+            func.count(SubLevel.id),
+            func.count(Progress.id).filter(Progress.status == ProgressStatus.COMPLETED)
+        ).outerjoin(
+            Progress, and_(Progress.sublevel_id == SubLevel.id, Progress.user_id == user_id)
+        ).filter(
             SubLevel.level_id == level_id,
             SubLevel.deleted_at.is_(None)
-        ).all()
-        
-        if not sublevels:
-            return False
-        
-        # Check if all sublevels are completed
-        for sublevel in sublevels:
-            progress = self.db.query(Progress).filter(
-                Progress.user_id == user_id,
-                Progress.sublevel_id == sublevel.id
-            ).first()
-            
-            # If any sublevel is not completed, return False
-            if not progress or not self.get_bool(progress.is_completed):
-                return False
+        ).one()
         
-        return True
+        return int(total or 0) > 0 and int(completed or 0) >= int(total or 0)
     
     def get_unlocked_levels(self, user_id: int) -> List[int]:
         """
@@ -251,7 +246,7 @@ class SoalHandler:
             
             return False
         except Exception as e:
-            print(f"Error unlocking next sublevel: {e}")
+            logger.error(f"Error unlocking next sublevel: {e}")
             return False
     
     def initialize_user_progress(self, user_id: int):
@@ -396,7 +391,7 @@ class SoalHandler:
             }
             
         except Exception as e:
-            print(f"❌ Error updating user streak: {e}")
+            logger.error(f"❌ Error updating user streak: {e}")
             self.db.rollback()
             return {
                 "success": False,
@@ -445,7 +440,7 @@ class SoalHandler:
             }
             
         except Exception as e:
-            print(f"❌ Error getting user streak info: {e}")
+            logger.error(f"❌ Error getting user streak info: {e}")
             return {
                 "success": False,
                 "message": f"Failed to get streak info: {str(e)}"
@@ -523,6 +518,12 @@ class SoalHandler:
         
         self.db.commit()
         
+        # ✅ Update leaderboard incremental (tidak boleh menggagalkan quiz)
+        try:
+            leaderboard_engine.record_quiz(self.db, user_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Leaderboard update skipped: {e}")
+        
         # Return response dengan streak info
         result = QuizResultResponse(
             score=self.get_int(progress.score),
@@ -538,8 +539,20 @@ class SoalHandler:
             next_sublevel_unlocked=next_sublevel_unlocked
         )
         
-        # ✅ Add streak info to response metadata (optional)
-        print(f"✅ Quiz completed! Streak info: {streak_info}")
+        # ✅ Event frekuensi tinggi: structured + bisa di-sample (LOG_SAMPLE_RATES=quiz.completed=...)
+        logger.info(
+            "Quiz completed",
+            extra={
+                "event": "quiz.completed",
+                "user_id": user_id,
+                "sublevel_id": sublevel_id,
+                "score": result.score,
+                "stars": result.stars,
+                "is_completed": result.is_completed,
+                "current_streak": streak_info.get("current_streak"),
+                "streak_increased": streak_info.get("streak_increased"),
+            },
+        )
         
         return result
     
@@ -588,37 +601,35 @@ class SoalHandler:
         
         summary = Progress.get_user_progress_summary(self.db, user_id)
         
-        # Get unlocked levels
-        unlocked_levels = self.get_unlocked_levels(user_id)
-        
-        # Get detailed progress by level
-        all_levels = self.db.query(Level).filter(
+        # ✅ 3 query total (levels, sublevels, progress user), agregasi di memory
+        all_levels = self.db.query(Level.id, Level.name).filter(
             Level.deleted_at.is_(None)
         ).order_by(Level.id).all()
         
+        sublevels_by_level: Dict[int, List[int]] = {}
+        for sublevel_id, level_id in self.db.query(SubLevel.id, SubLevel.level_id).filter(
+            SubLevel.deleted_at.is_(None)
+        ).all():
+            sublevels_by_level.setdefault(level_id, []).append(sublevel_id)
+        
+        progress_by_sublevel = {
+            progress.sublevel_id: progress
+            for progress in self.db.query(Progress).filter(Progress.user_id == user_id).all()
+        }
+        
         level_progress: Dict[str, Dict[str, Any]] = {}
+        level_completed: Dict[int, bool] = {}
         
-        for level in all_levels:
-            level_id = self.get_int(level.id)
-            level_name = self.get_str(level.name)
-            
-            # Get all sublevels in this level
-            sublevels = self.db.query(SubLevel).filter(
-                SubLevel.level_id == level_id,
-                SubLevel.deleted_at.is_(None)
-            ).all()
+        for level_id, level_name in all_levels:
+            level_id = self.get_int(level_id)
+            level_name = self.get_str(level_name)
+            sublevel_ids = sublevels_by_level.get(level_id, [])
             
-            total_sublevels = len(sublevels)
             completed = 0
             total_stars = 0
             unlocked = 0
-            
-            for sublevel in sublevels:
-                progress = self.db.query(Progress).filter(
-                    Progress.user_id == user_id,
-                    Progress.sublevel_id == sublevel.id
-                ).first()
-                
+            for sublevel_id in sublevel_ids:
+                progress = progress_by_sublevel.get(sublevel_id)
                 if progress:
                     if self.get_bool(progress.is_completed):
                         completed += 1
@@ -626,16 +637,27 @@ class SoalHandler:
                         unlocked += 1
                     total_stars += self.get_int(progress.best_stars)
             
+            # Sama dengan is_level_completed(): semua sublevel aktif completed
+            level_completed[level_id] = bool(sublevel_ids) and completed == len(sublevel_ids)
             level_progress[level_name] = {
                 "level_id": level_id,
-                "total_sublevels": total_sublevels,
+                "total_sublevels": len(sublevel_ids),
                 "completed": completed,
                 "total_stars": total_stars,
                 "unlocked": unlocked,
-                "is_level_unlocked": level_id in unlocked_levels,
-                "is_level_completed": self.is_level_completed(user_id, level_id)
+                "is_level_unlocked": False,
+                "is_level_completed": level_completed[level_id]
             }
         
+        # Sama dengan get_unlocked_levels(): level N terbuka jika level N-1 completed
+        unlocked_levels: List[int] = []
+        for idx, (level_id, _) in enumerate(all_levels):
+            if idx > 0 and not level_completed[self.get_int(all_levels[idx - 1][0])]:
+                break
+            unlocked_levels.append(self.get_int(level_id))
+        for data in level_progress.values():
+            data["is_level_unlocked"] = data["level_id"] in unlocked_levels
+        
         return {
             "overall_summary": summary,
             "progress_by_level": level_progress,
@@ -0,0 +1,355 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_
+
+from src.models.user import User
+from src.models.progress import Progress, ProgressStatus
+from src.dto.leaderboard_dto import TierInfo, LeaderboardEntry, LeaderboardData
+from src.utils.metrics import cache_hit, cache_miss
+
+# =====================================================================
+# TIER DEFINITIONS (sinkron dengan User.update_tier_based_on_streak)
+# =====================================================================
+
+TIERS: List[TierInfo] = [
+    TierInfo(name="bronze", min_streak=0, max_streak=6, color="#CD7F32", display_name="Bronze"),
+    TierInfo(name="silver", min_streak=7, max_streak=29, color="#C0C0C0", display_name="Silver"),
+    TierInfo(name="gold", min_streak=30, max_streak=89, color="#FFD700", display_name="Gold"),
+    TierInfo(name="diamond", min_streak=90, max_streak=179, color="#B9F2FF", display_name="Diamond"),
+    TierInfo(name="platinum", min_streak=180, max_streak=None, color="#E5E4E2", display_name="Platinum"),
+]
+TIER_COLORS = {tier.name: tier.color for tier in TIERS}
+
+WINDOWS = ("daily", "weekly", "all_time")
+
+# Rank key (desc), user_id sebagai tie-breaker:
+# - all_time     : streak, XP, stars, completion rate
+# - daily/weekly : stars, completed, completion rate di dalam window
+RankKey = Tuple
+
+
+def window_start(window: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Awal window (waktu lokal server, sama dengan Progress.last_attempt)"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "daily":
+        return today
+    if window == "weekly":
+        return today - timedelta(days=today.weekday())
+    return None
+
+
+class RankedBoard:
+    """
+    Sorted rank structure (SortedList): upsert/remove dan rank lookup O(log n).
+
+    Dibangun sekali dari semua stats (satu sort), lalu di-update per user.
+    """
+
+    def __init__(self, window: str = "all_time", rows: Iterable[Dict[str, Any]] = ()):
+        self.window = window
+        self._users: Dict[int, Tuple[RankKey, Dict[str, Any]]] = {
+            int(stats["user_id"]): (self.make_key(stats, window), stats) for stats in rows
+        }
+        self._keys = SortedList(key for key, _ in self._users.values())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def make_key(stats: Dict[str, Any], window: str = "all_time") -> RankKey:
+        if window != "all_time":
+            return (
+                -int(stats["total_stars"]),
+                -int(stats["completed_count"]),
+                -float(stats["completion_rate"]),
+                int(stats["user_id"]),
+            )
+        return (
+            -int(stats["current_streak"]),
+            -int(stats["total_xp"]),
+            -int(stats["total_stars"]),
+            -float(stats["completion_rate"]),
+            int(stats["user_id"]),
+        )
+
+    def upsert(self, stats: Dict[str, Any]):
+        user_id = int(stats["user_id"])
+        self.remove(user_id)
+        key = self.make_key(stats, self.window)
+        self._keys.add(key)
+        self._users[user_id] = (key, stats)
+
+    def remove(self, user_id: int):
+        existing = self._users.pop(user_id, None)
+        if existing is not None:
+            self._keys.discard(existing[0])
+
+    def rank_of(self, user_id: int) -> Optional[int]:
+        """1-based rank, None jika user tidak ada di board"""
+        existing = self._users.get(user_id)
+        if existing is None:
+            return None
+        return self._keys.bisect_left(existing[0]) + 1
+
+    def page(self, offset: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return [(rank, stats)] untuk slice [offset, offset+limit)"""
+        result = []
+        for index, key in enumerate(self._keys.islice(offset, offset + limit), start=offset + 1):
+            result.append((index, self._users[key[-1]][1]))
+        return result
+
+
+class LeaderboardEngine:
+    """
+    In-memory leaderboard per window (daily/weekly/all_time).
+
+    Di-warm sekali dari database dengan satu GROUP BY query, lalu di-update
+    incremental oleh finish_quiz. Window harian/mingguan di-rebuild saat
+    melewati batas window; full refresh periodik menyamakan state antar worker.
+    """
+
+    def __init__(self, refresh_interval: int = 300):
+        self.refresh_interval = refresh_interval
+        self._boards: Dict[str, RankedBoard] = {window: RankedBoard(window) for window in WINDOWS}
+        self._window_starts: Dict[str, Optional[datetime]] = {}
+        self._loaded_at: float = 0.0
+        self._generated_at: Optional[datetime] = None
+        self._lock = threading.RLock()  # State board (swap / upsert / read)
+        self._reload_lock = threading.Lock()  # Satu reload sekaligus, query di luar _lock
+        self._touched: Optional[Set[int]] = None  # User yang di-update selama reload berjalan
+
+    # =====================================================================
+    # QUERIES
+    # =====================================================================
+
+    def _stats_query(self, db: Session, starts: Dict[str, Optional[datetime]]):
+        """Satu query: kolom user + agregat progress per window (FILTER)"""
+        attempted = Progress.attempts > 0
+        completed = Progress.status == ProgressStatus.COMPLETED
+        columns = [
+            User.id, User.username, User.avatar, User.current_streak, User.longest_streak,
+            User.tier, User.total_xp, User.total_quizzes_completed, User.last_activity_date,
+        ]
+        for window in WINDOWS:
+            start = starts.get(window)
+            in_window = attempted if start is None else and_(attempted, Progress.last_attempt >= start)
+            columns.extend([
+                func.coalesce(func.sum(Progress.best_stars).filter(in_window), 0),
+                func.count(Progress.id).filter(in_window),
+                func.count(Progress.id).filter(and_(in_window, completed)),
+            ])
+        return (
+            db.query(*columns)
+            .outerjoin(Progress, and_(Progress.user_id == User.id, Progress.deleted_at.is_(None)))
+            .filter(User.deleted_at.is_(None))
+            .group_by(User.id)
+        )
+
+    @staticmethod
+    def _row_to_stats(row) -> Dict[str, Dict[str, Any]]:
+        """Convert satu row query menjadi stats per window"""
+        tier = row[5].value if row[5] is not None else "bronze"
+        base = {
+            "user_id": int(row[0]),
+            "username": str(row[1]),
+            "avatar": row[2],
+            "current_streak": int(row[3] or 0),
+            "longest_streak": int(row[4] or 0),
+            "tier": tier,
+            "tier_color": TIER_COLORS.get(tier, TIER_COLORS["bronze"]),
+            "total_xp": int(row[6] or 0),
+            "total_quizzes_completed": int(row[7] or 0),
+            "last_activity_date": row[8].isoformat() if row[8] is not None else None,
+        }
+        per_window = {}
+        for index, window in enumerate(WINDOWS):
+            stars, attempted, completed = row[9 + index * 3: 12 + index * 3]
+            attempted, completed = int(attempted or 0), int(completed or 0)
+            if window != "all_time" and attempted == 0:
+                continue  # Tidak aktif di window ini
+            stats = dict(base)
+            stats["total_stars"] = int(stars or 0)
+            stats["completed_count"] = completed
+            stats["completion_rate"] = round(completed / attempted * 100, 2) if attempted else 0.0
+            per_window[window] = stats
+        return per_window
+
+    # =====================================================================
+    # LOADING & INCREMENTAL UPDATES
+    # =====================================================================
+
+    def _current_starts(self) -> Dict[str, Optional[datetime]]:
+        now = datetime.now()
+        return {window: window_start(window, now) for window in WINDOWS}
+
+    def _needs_reload(self) -> bool:
+        if self._generated_at is None:
+            return True
+        if time.monotonic() - self._loaded_at > self.refresh_interval:
+            return True
+        return self._current_starts() != self._window_starts
+
+    def reload(self, db: Session):
+        """
+        Full rebuild semua window dari database.
+
+        Query + sort berjalan tanpa ``_lock`` (reader tetap dilayani board
+        lama); hanya swap yang di dalam lock. User yang di-update selama query
+        berjalan di-refresh lagi setelah swap agar tidak tertimpa data lama.
+        """
+        with self._lock:
+            self._touched = set()
+        try:
+            starts = self._current_starts()
+            per_window: Dict[str, List[Dict[str, Any]]] = {window: [] for window in WINDOWS}
+            for row in self._stats_query(db, starts).all():
+                for window, stats in self._row_to_stats(row).items():
+                    per_window[window].append(stats)
+            boards = {window: RankedBoard(window, rows) for window, rows in per_window.items()}
+            with self._lock:
+                self._boards = boards
+                self._window_starts = starts
+                self._loaded_at = time.monotonic()
+                self._generated_at = datetime.utcnow()
+                touched, self._touched = self._touched, None
+        except Exception:
+            with self._lock:
+                self._touched = None
+            raise
+        for user_id in touched:
+            self.record_quiz(db, user_id)
+
+    def ensure_fresh(self, db: Session):
+        if self._needs_reload():
+            with self._reload_lock:
+                # ✅ Re-check: request lain mungkin sudah reload selagi menunggu
+                if self._needs_reload():
+                    cache_miss("leaderboard")
+                    self.reload(db)
+                    return
+        cache_hit("leaderboard")
+
+    def record_quiz(self, db: Session, user_id: int):
+        """Update incremental satu user (dipanggil setelah finish_quiz commit)"""
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add(user_id)
+            if self._generated_at is None:
+                return  # Belum di-warm; reload pertama akan memuat user ini
+            starts = dict(self._window_starts)
+        row = self._stats_query(db, starts).filter(User.id == user_id).first()
+        with self._lock:
+            if self._generated_at is None or self._window_starts != starts:
+                return  # Window berganti / invalidate: reload berikutnya memuat user ini
+            if row is None:
+                for board in self._boards.values():
+                    board.remove(user_id)
+                return
+            per_window = self._row_to_stats(row)
+            for window, board in self._boards.items():
+                if window in per_window:
+                    board.upsert(per_window[window])
+                else:
+                    board.remove(user_id)
+
+    def invalidate(self):
+        """Paksa full reload pada request berikutnya (mis. setelah batch job)"""
+        with self._lock:
+            self._generated_at = None
+
+    def remove_user(self, user_id: int):
+        with self._lock:
+            for board in self._boards.values():
+                board.remove(user_id)
+
+    # =====================================================================
+    # READS
+    # =====================================================================
+
+    @staticmethod
+    def _to_entry(rank: int, stats: Dict[str, Any], current_user_id: Optional[int]) -> LeaderboardEntry:
+        return LeaderboardEntry(rank=rank, is_current_user=stats["user_id"] == current_user_id, **stats)
+
+    def get_page(
+        self,
+        db: Session,
+        window: str = "all_time",
+        offset: int = 0,
+        limit: int = 10,
+        current_user_id: Optional[int] = None,
+        radius: int = 2,
+    ) -> LeaderboardData:
+        """Top-N page + rank current user dan tetangganya"""
+        self.ensure_fresh(db)
+        with self._lock:
+            board = self._boards[window]
+            entries = [self._to_entry(rank, stats, current_user_id) for rank, stats in board.page(offset, limit)]
+            current_entry = None
+            neighbors: List[LeaderboardEntry] = []
+            if current_user_id is not None:
+                rank = board.rank_of(current_user_id)
+                if rank is not None:
+                    start = max(rank - 1 - radius, 0)
+                    neighbors = [
+                        self._to_entry(r, stats, current_user_id)
+                        for r, stats in board.page(start, radius * 2 + 1)
+                    ]
+                    current_entry = next((e for e in neighbors if e.is_current_user), None)
+            return LeaderboardData(
+                window=window,
+                total_users=len(board),
+                offset=offset,
+                limit=limit,
+                entries=entries,
+                current_user=current_entry,
+                neighbors=neighbors,
+                generated_at=self._generated_at.isoformat() if self._generated_at else None,
+            )
+
+
+# Global engine instance (per worker process)
+leaderboard_engine = LeaderboardEngine()
+
+
+class LeaderboardHandler:
+    """Handler untuk business logic leaderboard"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.engine = leaderboard_engine
+
+    def get_leaderboard(
+        self, user_id: Optional[int], window: str = "all_time", offset: int = 0, limit: int = 10
+    ) -> Dict[str, Any]:
+        """Get leaderboard page untuk window tertentu"""
+        data = self.engine.get_page(self.db, window, offset, limit, current_user_id=user_id)
+        return {
+            "success": True,
+            "message": f"Leaderboard {window} retrieved successfully",
+            "data": data
+        }
+
+    def get_my_rank(self, user_id: int, window: str = "all_time", radius: int = 2) -> Dict[str, Any]:
+        """Get rank user beserta tetangga di atas/bawah"""
+        data = self.engine.get_page(self.db, window, 0, 0, current_user_id=user_id, radius=radius)
+        message = "Rank retrieved successfully" if data.current_user else f"User belum masuk leaderboard {window}"
+        return {
+            "success": True,
+            "message": message,
+            "data": data
+        }
+
+    @staticmethod
+    def get_tiers() -> Dict[str, Any]:
+        """Get daftar tier dan threshold streak"""
+        return {
+            "success": True,
+            "message": "Tiers retrieved successfully",
+            "data": TIERS
+        }
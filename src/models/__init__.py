@@ -7,6 +7,8 @@ from .level import Level
 from .sublevel import SubLevel
 from .soal import Soal
 from .progress import Progress, ProgressStatus  # ✅ Add Progress
+from .storage_file import StorageFile
+from .resource_version import ResourceVersion
 
 # Export untuk kemudahan import
 __all__ = [
@@ -19,5 +21,7 @@ __all__ = [
     'SubLevel',
     'Soal',
     'Progress',
-    'ProgressStatus'
+    'ProgressStatus',
+    'StorageFile',
+    'ResourceVersion'
 ]
\ No newline at end of file
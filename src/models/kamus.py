@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, event
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, Index, event, select, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -36,6 +36,11 @@ class Kamus(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     
+    # ✅ List kamus aktif per kategori: WHERE category = ? AND deleted_at IS NULL ORDER BY word_text
+    __table_args__ = (
+        Index("idx_kamus_category_word_active", "category", "word_text", postgresql_where=text("deleted_at IS NULL")),
+    )
+    
     def __repr__(self):
         return f"<Kamus(id={self.id}, word_text='{self.word_text}', category='{self.category.value}')>"
     
@@ -50,11 +55,39 @@ class Kamus(Base):
     @hybrid_property
     def total_soal(self):
         """Get total number of soal related to this kamus entry"""
+        preloaded = getattr(self, "_total_soal", None)
+        if preloaded is not None:
+            return preloaded
         try:
             return self.soal_list.count() if self.soal_list else 0
         except:
             return 0
     
+    @total_soal.expression
+    def total_soal(cls):
+        from .soal import Soal
+        return select(func.count(Soal.id))\
+            .where(Soal.dictionary_id == cls.id)\
+            .correlate_except(Soal)\
+            .scalar_subquery()
+    
+    @classmethod
+    def preload_total_soal(cls, db, kamus_list):
+        """Hitung total_soal untuk banyak kamus dalam satu query (hindari N+1)"""
+        from .soal import Soal
+        ids = [kamus.id for kamus in kamus_list]
+        if not ids:
+            return kamus_list
+        counts = dict(
+            db.query(Soal.dictionary_id, func.count(Soal.id))
+            .filter(Soal.dictionary_id.in_(ids))
+            .group_by(Soal.dictionary_id)
+            .all()
+        )
+        for kamus in kamus_list:
+            kamus._total_soal = int(counts.get(kamus.id, 0))
+        return kamus_list
+    
     def get_category_display(self) -> str:
         """Get human-readable category name"""
         # ✅ FIX: Use getattr to safely access category value
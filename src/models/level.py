@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, event
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, event, select
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -27,7 +27,36 @@ class Level(Base):
     # Hybrid property untuk count sublevels
     @hybrid_property
     def total_sublevels(self):
-        return len(self.sublevels.all()) if self.sublevels else 0
+        # ✅ Pakai hasil preload (satu GROUP BY per halaman) jika ada, selain itu COUNT(*)
+        preloaded = getattr(self, "_total_sublevels", None)
+        if preloaded is not None:
+            return preloaded
+        return self.sublevels.count()
+    
+    @total_sublevels.expression
+    def total_sublevels(cls):
+        from .sublevel import SubLevel
+        return select(func.count(SubLevel.id))\
+            .where(SubLevel.level_id == cls.id)\
+            .correlate_except(SubLevel)\
+            .scalar_subquery()
+    
+    @classmethod
+    def preload_total_sublevels(cls, db, levels):
+        """Hitung total_sublevels untuk banyak level dalam satu query (hindari N+1)"""
+        from .sublevel import SubLevel
+        ids = [level.id for level in levels]
+        if not ids:
+            return levels
+        counts = dict(
+            db.query(SubLevel.level_id, func.count(SubLevel.id))
+            .filter(SubLevel.level_id.in_(ids))
+            .group_by(SubLevel.level_id)
+            .all()
+        )
+        for level in levels:
+            level._total_sublevels = int(counts.get(level.id, 0))
+        return levels
     
     def __repr__(self):
         return f"<Level(id={self.id}, name='{self.name}', sublevels={self.total_sublevels})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -53,7 +53,10 @@ class Progress(Base):
     
     # Constraints
     __table_args__ = (
+        # user_id leading column: juga melayani WHERE user_id = ?
         UniqueConstraint('user_id', 'sublevel_id', name='uq_user_sublevel_progress'),
+        # Statistik / cascade per sublevel: WHERE sublevel_id = ?
+        Index("idx_progress_sublevel_id", "sublevel_id"),
     )
     
     def __repr__(self):
@@ -171,22 +174,14 @@ class Progress(Base):
     @hybrid_property
     def success_rate(self):
         """Calculate success rate as percentage"""
-<<<<<<< HEAD
-        if self.total_questions == 0:
-=======
         if self.total_questions == 0:  # type: ignore
->>>>>>> 03f67aacdd09a30595b9d5c2b592966cc5ef3fe8
             return 0.0
         return (self.correct_answers / self.total_questions) * 100
     
     @hybrid_property
     def is_perfect_score(self) -> bool:
         """Check if user got perfect score (100%)"""
-<<<<<<< HEAD
-        return self.completion_percentage == 100
-=======
         return self.completion_percentage == 100  # type: ignore
->>>>>>> 03f67aacdd09a30595b9d5c2b592966cc5ef3fe8
     
     # =====================================================================
     # CLASS METHODS
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, BigInteger
+from sqlalchemy.sql import func
+from ..database.db import Base
+
+class ResourceVersion(Base):
+    """Version counter per resource (level, sublevel, kamus, soal) untuk ETag"""
+    __tablename__ = "resource_versions"
+    
+    resource = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ResourceVersion(resource='{self.resource}', version={self.version})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, event
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, Index, event, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -37,6 +37,20 @@ class Soal(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # ✅ Index: hampir semua query memfilter deleted_at IS NULL
+    __table_args__ = (
+        # Quiz / progress: WHERE sublevel_id = ? AND deleted_at IS NULL ORDER BY id
+        Index("idx_soal_sublevel_active", "sublevel_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        # Available kamus / filter admin per kamus
+        Index("idx_soal_dictionary_active", "dictionary_id", postgresql_where=text("deleted_at IS NULL")),
+        # Admin list: ORDER BY created_at DESC
+        Index("idx_soal_created_active", "created_at", postgresql_where=text("deleted_at IS NULL")),
+        # FK penuh (termasuk soft-deleted): total_soal, cascade delete
+        Index("idx_soal_sublevel_id", "sublevel_id"),
+        Index("idx_soal_dictionary_id", "dictionary_id"),
+    )
+    
     # Hybrid property untuk mendapatkan level dari sublevel
     @hybrid_property
     def level_name(self):
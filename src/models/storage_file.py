@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from ..database.db import Base
+
+class StorageFile(Base):
+    """Metadata catalog untuk file di storage (diisi saat upload)"""
+    __tablename__ = "storage_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    subfolder = Column(String(50), nullable=False)         # soal, kamus, avatars
+    filename = Column(String(255), nullable=False)
+    path = Column(String(512), nullable=False)             # storage/media/ab/cd/<hash>.jpg
+    sha256 = Column(String(64), nullable=True, index=True)
+    size = Column(BigInteger, nullable=False, default=0)
+    mime_type = Column(String(100), nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    modified_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint('subfolder', 'filename', name='uq_storage_files_subfolder_filename'),
+        # Listing: WHERE subfolder = ? ORDER BY created_at DESC LIMIT/OFFSET
+        Index("idx_storage_files_subfolder_created", "subfolder", "created_at"),
+    )
+    
+    @property
+    def view_url(self) -> str:
+        return f"/{self.path}"
+    
+    def to_dict(self) -> dict:
+        return {
+            "filename": self.filename,
+            "subfolder": self.subfolder,
+            "path": self.path,
+            "sha256": self.sha256,
+            "size": self.size,
+            "media_type": self.mime_type,
+            "width": self.width,
+            "height": self.height,
+            "created": self.created_at.isoformat() if self.created_at is not None else None,
+            "modified": self.modified_at.isoformat() if self.modified_at is not None else None,
+            "view_url": self.view_url,
+            "download_url": f"{self.view_url}?download=true",
+            "info_url": f"/storage/{self.subfolder}/{self.filename}/info"
+        }
+    
+    def __repr__(self):
+        return f"<StorageFile(id={self.id}, subfolder='{self.subfolder}', filename='{self.filename}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, event
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Boolean, Text, Enum, Index, event, select, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -59,12 +59,45 @@ class SubLevel(Base):
     # Hybrid property untuk count soal
     @hybrid_property
     def total_soal(self):
-        return len(self.soal_list.all()) if self.soal_list else 0
+        # ✅ Pakai hasil preload (satu GROUP BY per halaman) jika ada, selain itu COUNT(*)
+        preloaded = getattr(self, "_total_soal", None)
+        if preloaded is not None:
+            return preloaded
+        return self.soal_list.count()
+    
+    @total_soal.expression
+    def total_soal(cls):
+        from .soal import Soal
+        return select(func.count(Soal.id))\
+            .where(Soal.sublevel_id == cls.id)\
+            .correlate_except(Soal)\
+            .scalar_subquery()
+    
+    @classmethod
+    def preload_total_soal(cls, db, sublevels):
+        """Hitung total_soal untuk banyak sublevel dalam satu query (hindari N+1)"""
+        from .soal import Soal
+        ids = [sublevel.id for sublevel in sublevels]
+        if not ids:
+            return sublevels
+        counts = dict(
+            db.query(Soal.sublevel_id, func.count(Soal.id))
+            .filter(Soal.sublevel_id.in_(ids))
+            .group_by(Soal.sublevel_id)
+            .all()
+        )
+        for sublevel in sublevels:
+            sublevel._total_soal = int(counts.get(sublevel.id, 0))
+        return sublevels
     
     # Constraint untuk unique name per level
     __table_args__ = (
         # Unique constraint: name + level_id
         # Artinya nama sublevel boleh sama, tapi tidak boleh sama dalam 1 level
+        # ✅ WHERE level_id = ? AND deleted_at IS NULL ORDER BY id (learner & admin)
+        Index("idx_sublevel_level_active", "level_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        # FK penuh (termasuk soft-deleted): total_sublevels, restore/cascade
+        Index("idx_sublevel_level_id", "level_id"),
         {'sqlite_autoincrement': True},
     )
     
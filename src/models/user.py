@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, event, Date
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, event, Date, literal
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -8,6 +8,19 @@ import enum
 from .user_badge import user_badge_association
 from ..database.db import Base
 
+# =====================================================================
+# STREAK RULE - satu sumber untuk User.update_streak dan streak maintenance job
+# =====================================================================
+# Setiap hari tanpa aktivitas ditutup oleh satu freeze. Jika semua hari yang
+# terlewat tertutup, streak tetap jalan (aktivitas berikutnya dihitung hari
+# berurutan); jika tidak, streak putus. Hasil sama baik job malam sudah
+# berjalan atau belum.
+
+def missed_streak_days(last_activity: date, activity_date: date) -> int:
+    """Jumlah hari tanpa aktivitas di antara last_activity dan activity_date"""
+    return max((activity_date - last_activity).days - 1, 0)
+
+
 class UserRole(enum.Enum):
     ADMIN = "admin"
     USER = "user"
@@ -151,6 +164,11 @@ class User(Base):
         else:
             self.tier = UserTier.BRONZE
     
+    @classmethod
+    def missed_streak_days_expr(cls, activity_date: date):
+        """SQL dari ``missed_streak_days(last_activity_date, activity_date)`` (tanpa clamp)"""
+        return literal(activity_date) - cls.last_activity_date - 1
+    
     def update_streak(self, activity_date: Optional[date] = None) -> None:
         """
         Update user streak based on activity
@@ -158,10 +176,10 @@ class User(Base):
         Args:
             activity_date: Date of activity (default: today)
         
-        Logic:
+        Logic (lihat STREAK RULE di atas):
         - Same day: No change
-        - Next day (consecutive): Increment streak
-        - Gap > 1 day: Reset streak (unless has freeze)
+        - Next day, atau hari terlewat tertutup freeze (1 per hari): Increment streak
+        - Selain itu: Reset streak
         """
         if activity_date is None:
             activity_date = date.today()
@@ -191,22 +209,18 @@ class User(Base):
             if days_diff == 0:
                 # Same day, no change to streak
                 pass
-            elif days_diff == 1:
-                # Consecutive day, increment streak
+            elif days_diff > 0:
                 current_val = int(getattr(self, 'current_streak', 0))  # type: ignore
-                self.current_streak = current_val + 1
-                self.last_activity_date = activity_date
-            elif days_diff > 1:
-                # Streak broken (unless has freeze)
                 freeze_val = int(getattr(self, 'streak_freeze_count', 0))  # type: ignore
-                if freeze_val > 0:
-                    # Use streak freeze
-                    self.streak_freeze_count = freeze_val - 1
-                    self.last_activity_date = activity_date
+                missed = missed_streak_days(last_activity, activity_date)
+                if current_val > 0 and missed <= freeze_val:
+                    # Consecutive day / semua hari terlewat ditutup freeze
+                    self.streak_freeze_count = freeze_val - missed
+                    self.current_streak = current_val + 1
                 else:
                     # Reset streak
                     self.current_streak = 1
-                    self.last_activity_date = activity_date
+                self.last_activity_date = activity_date
         
         # Update longest streak if current is higher
         current_val = int(getattr(self, 'current_streak', 0))  # type: ignore
@@ -1,26 +1,59 @@
+import importlib
+
 from fastapi import APIRouter
-from .auhtRoutes import router as auth_router
-from .badges_routes import router as badge_router
-from .userRoutes import router as user_router
-from .kamusRoutes import router as kamus_router
-from .level import router as level_router
-from .sublevel import router as sublevel_router
-from .soalRoutes import router as soal_router
-from .exerciseRoutes import router as exercise_router
-from .predictRoutes import router as predict_router  # ✅ Import predict router
-
-# ✅ Buat router utama untuk /api (PROTECTED routes)
-api_router = APIRouter(prefix="/api")
-
-# ✅ JANGAN include predict_router di sini (akan di-include langsung di main.py)
-api_router.include_router(auth_router)
-api_router.include_router(badge_router)
-api_router.include_router(user_router)
-api_router.include_router(kamus_router)
-api_router.include_router(level_router)
-api_router.include_router(sublevel_router)
-api_router.include_router(soal_router)
-api_router.include_router(exercise_router)
+
+# ✅ Router di-import secara lazy (PEP 562): import satu router (mis.
+# src.routes.predictRoutes untuk benchmark / model server) tidak ikut memuat
+# semua handler + DTO. api_router dirakit saat pertama kali diakses.
+
+# nama export -> submodule (masing-masing punya atribut ``router``)
+_ROUTER_MODULES = {
+    "auth_router": "auhtRoutes",
+    "badge_router": "badges_routes",
+    "user_router": "userRoutes",
+    "kamus_router": "kamusRoutes",
+    "level_router": "level",
+    "sublevel_router": "sublevel",
+    "soal_router": "soalRoutes",
+    "exercise_router": "exerciseRoutes",
+    "leaderboard_router": "leaderboardRoutes",
+    "statistics_router": "statisticsRoutes",
+    "predict_router": "predictRoutes",  # ✅ PUBLIC, di-include langsung di main.py
+}
+
+# Urutan include ke /api (PROTECTED routes)
+API_ROUTERS = (
+    "auth_router",
+    "badge_router",
+    "user_router",
+    "kamus_router",
+    "level_router",
+    "sublevel_router",
+    "soal_router",
+    "exercise_router",
+    "leaderboard_router",
+    "statistics_router",
+)
+
+
+def _build_api_router() -> APIRouter:
+    """Router utama untuk /api (PROTECTED routes)"""
+    router = APIRouter(prefix="/api")
+    # ✅ JANGAN include predict_router di sini (akan di-include langsung di main.py)
+    for name in API_ROUTERS:
+        router.include_router(__getattr__(name))
+    return router
+
+
+def __getattr__(name):
+    if name == "api_router":
+        value = _build_api_router()
+    elif name in _ROUTER_MODULES:
+        value = importlib.import_module(f"{__name__}.{_ROUTER_MODULES[name]}").router
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 # ✅ Testing router
 test_router = APIRouter(tags=["Testing"])
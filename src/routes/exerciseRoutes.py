@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
@@ -6,6 +7,7 @@ from src.database.db import get_db
 from src.models.user import User
 from src.config.middleware import get_current_user
 from src.handler.user.kerjakanSoal import SoalHandler
+from src.utils.responses import FastJSONResponse
 from src.dto.exercise_dto import (
     FinishQuizRequest,
     StartQuizResponse,
@@ -16,6 +18,9 @@ from src.dto.exercise_dto import (
     ResetProgressResponse,
     ApiResponse
 )
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/user/soal", tags=["User - Soal"])
 
 # =====================================================================
@@ -34,16 +39,17 @@ async def start_quiz(
         # ✅ Use helper method instead of direct access
         quiz_data = handler.start_quiz(current_user.get_id(), sublevel_id)
         
-        return StartQuizResponse(
-            success=True,
-            message=f"Quiz dimulai untuk {quiz_data.sublevel_name}",
-            data=quiz_data
-        )
+        # ✅ quiz_data sudah tervalidasi di handler: serialize langsung, skip re-validasi response_model
+        return FastJSONResponse(content={
+            "success": True,
+            "message": f"Quiz dimulai untuk {quiz_data.sublevel_name}",
+            "data": quiz_data
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error starting quiz: {e}")
+        logger.error(f"Error starting quiz: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat memulai quiz"
@@ -76,7 +82,7 @@ async def finish_quiz(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error finishing quiz: {e}")
+        logger.error(f"Error finishing quiz: {e}")
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,7 +104,7 @@ async def get_sublevel_progress(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting progress: {e}")
+        logger.error(f"Error getting progress: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat mengambil progress"
@@ -124,7 +130,7 @@ async def get_user_progress_summary(
         )
         
     except Exception as e:
-        print(f"Error getting user progress summary: {e}")
+        logger.error(f"Error getting user progress summary: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat mengambil ringkasan progress"
@@ -138,11 +144,11 @@ async def get_available_sublevels(
     """📋 Get all available sublevels dengan status unlock"""
     try:
         handler = SoalHandler(db)
-        # ✅ Use helper method
-        return handler.get_available_sublevels(current_user.get_id())
+        # ✅ Use helper method (DTO sudah dibangun handler, skip re-validasi response_model)
+        return FastJSONResponse(content=handler.get_available_sublevels(current_user.get_id()))
         
     except Exception as e:
-        print(f"Error getting available sublevels: {e}")
+        logger.error(f"Error getting available sublevels: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat mengambil daftar sublevel"
@@ -169,7 +175,7 @@ async def reset_sublevel_progress(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error resetting progress: {e}")
+        logger.error(f"Error resetting progress: {e}")
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -219,7 +225,7 @@ async def get_user_streak_info(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting streak info: {e}")
+        logger.error(f"Error getting streak info: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat mengambil informasi streak"
@@ -263,7 +269,7 @@ async def use_streak_freeze(
         raise
     except Exception as e:
         db.rollback()
-        print(f"Error using streak freeze: {e}")
+        logger.error(f"Error using streak freeze: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Terjadi kesalahan saat menggunakan streak freeze"
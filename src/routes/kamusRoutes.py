@@ -5,6 +5,7 @@ from typing import Optional
 from ..database import get_db
 from ..config.middleware import require_moderator_or_admin
 from ..handler.admin.master_kamus import Kamus_Management
+from ..utils.responses import FastJSONResponse
 from ..dto.kamus_dto import (
     KamusCreateRequest, KamusUpdateRequest, KamusResponse,
     KamusListResponse, KamusCategoryEnum
@@ -33,7 +34,13 @@ async def get_all_kamus(
         include_deleted=include_deleted,
         category=category.value if category else None
     )
-    return result
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result["message"]
+        )
+    # ✅ Data sudah berupa dict JSON-ready: skip re-validasi response_model
+    return FastJSONResponse(content=result)
 
 @router.get("/statistics")
 async def get_kamus_statistics(
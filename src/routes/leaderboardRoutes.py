@@ -0,0 +1,62 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from src.database.db import get_db
+from src.models.user import User
+from src.config.middleware import get_current_user
+from src.handler.user.leaderBoard import LeaderboardHandler
+from src.dto.leaderboard_dto import LeaderboardResponse, TierListResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/user/leaderboard", tags=["User - Leaderboard"])
+
+WINDOW_PATTERN = "^(daily|weekly|all_time)$"
+
+# Sync def: query + lock leaderboard berjalan di threadpool, bukan di event loop
+@router.get("", response_model=LeaderboardResponse)
+def get_leaderboard(
+    window: str = Query("all_time", pattern=WINDOW_PATTERN, description="daily, weekly, atau all_time"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """🏆 Get leaderboard (top-N) beserta rank current user"""
+    try:
+        handler = LeaderboardHandler(db)
+        return handler.get_leaderboard(current_user.get_id(), window, offset, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting leaderboard: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Terjadi kesalahan saat mengambil leaderboard"
+        )
+
+@router.get("/me", response_model=LeaderboardResponse)
+def get_my_rank(
+    window: str = Query("all_time", pattern=WINDOW_PATTERN, description="daily, weekly, atau all_time"),
+    radius: int = Query(2, ge=0, le=25, description="Jumlah tetangga di atas/bawah"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """🎯 Get rank current user dan tetangganya"""
+    try:
+        handler = LeaderboardHandler(db)
+        return handler.get_my_rank(current_user.get_id(), window, radius)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting rank: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Terjadi kesalahan saat mengambil rank"
+        )
+
+@router.get("/tiers", response_model=TierListResponse)
+def get_tiers(current_user: User = Depends(get_current_user)):
+    """🥇 Get daftar tier berdasarkan streak"""
+    return LeaderboardHandler.get_tiers()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..utils.metrics import registry, METRICS_ENABLED
+
+# ✅ PUBLIC ROUTER (sudah di exclude_paths JWT & rate limit); batasi akses di nginx
+router = APIRouter(tags=["Monitoring"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus text format: latency per route, in-flight, DB queries, inference, cache, pool.
+    Dengan PROMETHEUS_MULTIPROC_DIR: jumlah semua worker (file I/O, jadi sync di threadpool).
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
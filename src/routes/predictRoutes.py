@@ -1,11 +1,21 @@
 from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import base64
 import io
-from PIL import Image
-import numpy as np
-from typing import Optional
-import os
+from typing import Optional, TYPE_CHECKING
+import time
+import logging
+
+from ..utils.metrics import observe_inference
+from ..config.settings import settings
+
+# ✅ numpy/PIL (dan TensorFlow di get_model) di-import saat request pertama, bukan saat startup
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
 
 # ✅ PUBLIC ROUTER - No authentication dependencies
 router = APIRouter(
@@ -16,29 +26,32 @@ router = APIRouter(
 
 # ✅ Global variable untuk cache model
 _model = None
-_model_path = "ml/mauna.h5"
+_model_path = settings.model_path
 
 def get_model():
-    """Lazy load model - only load when needed"""
+    """Lazy load model - only load when needed.
+
+    MODEL_SERVER_ENABLED: return client ke model server (satu model untuk
+    semua worker gunicorn), interface ``predict`` sama.
+    """
     global _model
     
     if _model is None:
         try:
-            # Suppress TensorFlow warnings
-            os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-            os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
-            
-            from tensorflow.keras.models import load_model
-            
-            if not os.path.exists(_model_path):
-                raise FileNotFoundError(f"Model file not found: {_model_path}")
-            
-            print(f"🔄 Loading ML model from {_model_path}...")
-            _model = load_model(_model_path)
-            print(f"✅ ML model loaded successfully!")
+            if settings.model_server_enabled:
+                from ..utils.model_server import ModelClient
+
+                _model = ModelClient(settings.model_server_socket)
+                logger.info(f"✅ Using model server at {settings.model_server_socket}")
+            else:
+                from ..utils.model_server import load_keras_model
+
+                logger.info(f"🔄 Loading ML model from {_model_path}...")
+                _model = load_keras_model(_model_path)
+                logger.info("✅ ML model loaded successfully!")
             
         except Exception as e:
-            print(f"❌ Failed to load model: {str(e)}")
+            logger.error(f"❌ Failed to load model: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to load ML model: {str(e)}"
@@ -56,6 +69,52 @@ class PredictionResponse(BaseModel):
     message: str
     data: dict
 
+# =====================================================================
+# PIPELINE STAGES (dipakai route dan benchmarks/inference.py)
+# =====================================================================
+
+INPUT_SIZE = (224, 224)
+
+def decode_base64(image: str) -> bytes:
+    """Base64 (dengan/tanpa data URI prefix) -> bytes"""
+    if "," in image:
+        return base64.b64decode(image.split(",")[1])
+    return base64.b64decode(image)
+
+def decode_image(img_data: bytes) -> "Image.Image":
+    """Bytes -> PIL RGB image (decode penuh)"""
+    from PIL import Image
+
+    return Image.open(io.BytesIO(img_data)).convert("RGB")
+
+def resize_image(image: "Image.Image") -> "Image.Image":
+    return image.resize(INPUT_SIZE)
+
+def normalize_image(image: "Image.Image") -> "np.ndarray":
+    """PIL image -> batch float array (1, H, W, 3) skala 0-1"""
+    import numpy as np
+
+    img_array = np.array(image) / 255.0
+    return np.expand_dims(img_array, axis=0)
+
+def build_prediction(prediction: "np.ndarray") -> dict:
+    """Output model -> payload response"""
+    import numpy as np
+
+    class_idx = int(np.argmax(prediction))
+    confidence = float(np.max(prediction))
+    label = _get_class_labels().get(class_idx, f"Class_{class_idx}")
+    return {
+        "success": True,
+        "message": "Prediction successful",
+        "data": {
+            "class": class_idx,
+            "class_label": label,
+            "confidence": confidence,
+            "confidence_percentage": round(confidence * 100, 2)
+        }
+    }
+
 @router.post("/", response_model=PredictionResponse)
 async def predict_image(data: ImageData) -> dict:
     """
@@ -83,10 +142,7 @@ async def predict_image(data: ImageData) -> dict:
         
         # ✅ Safely decode base64 with error handling
         try:
-            if "," in data.image:
-                img_data = base64.b64decode(data.image.split(",")[1])
-            else:
-                img_data = base64.b64decode(data.image)
+            img_data = decode_base64(data.image)
         except Exception as decode_error:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -95,10 +151,7 @@ async def predict_image(data: ImageData) -> dict:
         
         # Process image
         try:
-            image = Image.open(io.BytesIO(img_data)).convert("RGB")
-            image = image.resize((224, 224))
-            img_array = np.array(image) / 255.0
-            img_array = np.expand_dims(img_array, axis=0)
+            img_array = normalize_image(resize_image(decode_image(img_data)))
         except Exception as img_error:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -107,28 +160,17 @@ async def predict_image(data: ImageData) -> dict:
 
         # Predict
         try:
-            prediction = model.predict(img_array, verbose=0)
-            class_idx = int(np.argmax(prediction))
-            confidence = float(np.max(prediction))
+            started = time.perf_counter()
+            # ✅ Di threadpool: predict (lokal atau via model server) blocking, event loop tetap jalan
+            prediction = await run_in_threadpool(model.predict, img_array, verbose=0)
+            observe_inference("mauna", time.perf_counter() - started, batch_size=len(img_array))
         except Exception as pred_error:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Prediction failed: {str(pred_error)}"
             )
         
-        class_labels = _get_class_labels()
-        label = class_labels.get(class_idx, f"Class_{class_idx}")
-        
-        return {
-            "success": True,
-            "message": "Prediction successful",
-            "data": {
-                "class": class_idx,
-                "class_label": label,
-                "confidence": confidence,
-                "confidence_percentage": round(confidence * 100, 2)
-            }
-        }
+        return build_prediction(prediction)
         
     except HTTPException:
         raise
@@ -153,12 +195,37 @@ def _get_class_labels() -> dict:
         # ... add more mappings based on your model
     }
 
+HEALTH_PING_TIMEOUT = 2.0  # detik
+
+def _ping_model_server() -> None:
+    """Round-trip ping sungguhan (file socket bisa tertinggal setelah proses mati)"""
+    from ..utils.model_server import ModelClient
+
+    client = ModelClient(settings.model_server_socket, timeout=HEALTH_PING_TIMEOUT)
+    try:
+        client.ping()
+    finally:
+        client.close()
+
 @router.get("/health")
 async def health_check() -> dict:
     """
     🌍 PUBLIC ENDPOINT - Check if ML model is loaded and ready
     """
     try:
+        if settings.model_server_enabled:
+            try:
+                await run_in_threadpool(_ping_model_server)
+                ready, error = True, None
+            except (OSError, RuntimeError) as e:
+                ready, error = False, str(e)
+            return {
+                "success": ready,
+                "message": "ML model server is ready" if ready else f"ML model server is not responding: {error}",
+                "model_loaded": ready,
+                "model_path": _model_path,
+                "model_server": settings.model_server_socket
+            }
         model = get_model()
         return {
             "success": True,
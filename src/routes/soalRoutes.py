@@ -12,9 +12,8 @@ from ..dto.soal_dto import (
     BulkDeleteSoalRequest, BulkRestoreSoalRequest
 )
 from ..utils.FileHandler import save_image
+from ..utils.responses import FastJSONResponse
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -85,7 +84,7 @@ async def upload_soal_image(
             )
         
         # Save image file
-        image_path = save_image(file, "soal")
+        image_path = await save_image(file, "soal")
         
         if not image_path:
             return JSONResponse(
@@ -98,7 +97,7 @@ async def upload_soal_image(
             )
         
         # Format image URL
-        image_url = f"/storage/soal/{image_path.split('/')[-1]}"
+        image_url = f"/{image_path}"
         
         # ✅ Update database dengan image_url
         result = handler.update_soal_image(soal_id, image_url)
@@ -211,11 +210,11 @@ async def list_soal(
         )
         
         status_code = 200 if result["success"] else 400
-        return JSONResponse(content=result, status_code=status_code)
+        return FastJSONResponse(content=result, status_code=status_code)
         
     except Exception as e:
         logger.error(f"Error listing soal: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "success": False,
                 "message": f"Internal server error: {str(e)}",
@@ -556,11 +555,11 @@ async def create_soal_with_image(
         if file and result["data"]:
             try:
                 soal_id = result["data"]["id"]
-                image_path = save_image(file, "soal")
+                image_path = await save_image(file, "soal")
                 
                 if image_path:
                     # Format image URL
-                    image_url = f"/storage/soal/{image_path.split('/')[-1]}"
+                    image_url = f"/{image_path}"
                     
                     # ✅ Update database dengan image_url
                     update_result = handler.update_soal_image(soal_id, image_url)
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..config.middleware import require_moderator_or_admin
+from ..handler.admin.statistics import AdminStatistics
+
+router = APIRouter(
+    prefix="/admin/statistics",
+    tags=["Admin - Statistics"],
+    dependencies=[Depends(require_moderator_or_admin)]
+)
+
+@router.get("/")
+async def get_dashboard_statistics(
+    refresh: bool = Query(False, description="Paksa hitung ulang snapshot"),
+    db: Session = Depends(get_db)
+):
+    """Get semua statistik dashboard (cached snapshot)"""
+    try:
+        return {
+            "success": True,
+            "message": "Dashboard statistics retrieved successfully",
+            "data": AdminStatistics(db).dashboard(refresh=refresh)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Failed to retrieve dashboard statistics: {str(e)}",
+            "data": {}
+        }
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Query, Depends
 from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 import os
+import re
 from datetime import datetime
 import mimetypes
 from pathlib import Path
+from sqlalchemy.orm import Session
 
 # Import dari FileHandler
 from ..utils.FileHandler import STORAGE_FOLDERS
+from ..utils.media_store import media_store
+from ..utils.storage_catalog import storage_catalog
+from ..database.db import get_db
+from ..utils.static_serving import serve_file
+from ..utils.image_variants import (
+    FORMATS, IMAGE_EXTENSIONS, MIN_SIZE, MAX_SIZE,
+    available_formats, negotiate_format, resolve_thumbnail
+)
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter(
     prefix="/storage",
@@ -16,8 +27,35 @@ router = APIRouter(
     },
 )
 
+MEDIA_SHARD_PATTERN = re.compile(r"^[0-9a-f]{2}$")
+MEDIA_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+@router.get("/media/{shard_a}/{shard_b}/{filename}")
+async def get_media_file(shard_a: str, shard_b: str, filename: str, request: Request):
+    """
+    Serve content-addressed media - PUBLIC ACCESS
+    
+    Nama file adalah SHA-256 konten, jadi response aman di-cache selamanya.
+    """
+    if not (MEDIA_SHARD_PATTERN.match(shard_a) and MEDIA_SHARD_PATTERN.match(shard_b)
+            and MEDIA_NAME_PATTERN.match(filename) and filename.startswith(shard_a + shard_b)):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    file_path = os.path.join(media_store.root, shard_a, shard_b, filename)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    media_type, _ = mimetypes.guess_type(filename)
+    return await serve_file(
+        request,
+        file_path,
+        media_type or "application/octet-stream",
+        content_hash=os.path.splitext(filename)[0],
+        immutable=True
+    )
+
 @router.get("/{subfolder}/{filename}")
-async def get_file(subfolder: str, filename: str, download: bool = False):
+async def get_file(subfolder: str, filename: str, request: Request, download: bool = False):
     """
     Serve uploaded files from storage - PUBLIC ACCESS
     
@@ -127,14 +165,13 @@ async def get_file(subfolder: str, filename: str, download: bool = False):
         content_disposition = f'inline; filename="{filename}"'
     
     try:
-        return FileResponse(
-            path=file_path,
-            media_type=media_type,
-            filename=filename,
+        # ✅ Strong ETag dari content hash, 304, byte-range (video seeking), X-Accel-Redirect
+        return await serve_file(
+            request,
+            file_path,
+            media_type,
             headers={
                 "Content-Disposition": content_disposition,
-                "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
-                "X-Content-Type-Options": "nosniff",
                 "X-Frame-Options": "SAMEORIGIN"
             }
         )
@@ -142,18 +179,24 @@ async def get_file(subfolder: str, filename: str, download: bool = False):
         raise HTTPException(status_code=500, detail=f"Error serving file: {str(e)}")
 
 @router.get("/{subfolder}/{filename}/info")
-async def get_file_info(subfolder: str, filename: str):
-    """Get file information without downloading"""
+def get_file_info(subfolder: str, filename: str, db: Session = Depends(get_db)):
+    """Get file information without downloading (dari storage catalog)"""
     
     # Validate subfolder
     if subfolder not in STORAGE_FOLDERS:
         raise HTTPException(status_code=404, detail="Invalid subfolder")
     
-    # Build file path
-    file_path = os.path.join(STORAGE_FOLDERS[subfolder], filename)
+    # ✅ Indexed lookup (subfolder, filename) di catalog
+    entry = storage_catalog.get(db, subfolder, filename)
+    if entry is not None:
+        data = entry.to_dict()
+        data["size_human"] = _format_file_size(entry.size)
+        data["extension"] = os.path.splitext(filename)[1].lower()
+        return JSONResponse({"success": True, "data": data})
     
-    # Check if file exists
-    if not os.path.exists(file_path):
+    # Fallback: file legacy yang belum masuk catalog
+    file_path = os.path.join(STORAGE_FOLDERS[subfolder], os.path.basename(filename))
+    if not os.path.isfile(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
@@ -184,67 +227,108 @@ async def get_file_info(subfolder: str, filename: str):
         raise HTTPException(status_code=500, detail=f"Error getting file info: {str(e)}")
 
 @router.get("/{subfolder}")
-async def list_files(subfolder: str):
-    """List all files in a storage subfolder - PUBLIC ACCESS"""
+def list_files(
+    subfolder: str,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    List files in a storage subfolder - PUBLIC ACCESS
+    
+    Paginated dari storage catalog (index subfolder + created_at), newest first.
+    Jalankan `python cli.py storage:catalog` untuk mencatat file lama.
+    """
     
     # Validate subfolder
     if subfolder not in STORAGE_FOLDERS:
         raise HTTPException(status_code=404, detail="Invalid subfolder")
     
-    storage_dir = STORAGE_FOLDERS[subfolder]
-    
-    # Check if directory exists
-    if not os.path.exists(storage_dir):
-        return JSONResponse({
-            "success": True,
-            "subfolder": subfolder,
-            "files": [],
-            "count": 0
-        })
-    
     try:
-        # Get all files in directory
+        total, entries = storage_catalog.list_files(db, subfolder, limit=limit, offset=offset)
         files = []
-        for filename in os.listdir(storage_dir):
-            file_path = os.path.join(storage_dir, filename)
-            if os.path.isfile(file_path):
-                file_stat = os.stat(file_path)
-                file_extension = os.path.splitext(filename)[1].lower()
-                
-                # Determine media type
-                media_type, _ = mimetypes.guess_type(filename)
-                media_type = media_type or "application/octet-stream"
-                
-                files.append({
-                    "filename": filename,
-                    "size": file_stat.st_size,
-                    "size_human": _format_file_size(file_stat.st_size),
-                    "extension": file_extension,
-                    "media_type": media_type,
-                    "created": datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                    "modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                    "view_url": f"/storage/{subfolder}/{filename}",
-                    "download_url": f"/storage/{subfolder}/{filename}?download=true",
-                    "info_url": f"/storage/{subfolder}/{filename}/info"
-                })
-        
-        # Sort by modified time (newest first)
-        files.sort(key=lambda x: x["modified"], reverse=True)
+        for entry in entries:
+            data = entry.to_dict()
+            data["size_human"] = _format_file_size(entry.size)
+            data["extension"] = os.path.splitext(entry.filename)[1].lower()
+            files.append(data)
         
         return JSONResponse({
             "success": True,
             "subfolder": subfolder,
             "files": files,
-            "count": len(files)
+            "count": len(files),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + len(files) < total
         })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
 
+async def _thumbnail_response(file_path: str, filename: str, size: int, request: Request):
+    """Serve precomputed variant (atau bounded on-demand cache) dengan content negotiation"""
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in IMAGE_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="File is not an image")
+    
+    if not available_formats():
+        # Pillow not installed, return original image
+        return FileResponse(
+            path=file_path,
+            media_type=mimetypes.guess_type(filename)[0] or "image/jpeg",
+            headers={"Content-Disposition": 'inline'}
+        )
+    
+    fmt = negotiate_format(request.headers.get("accept"))
+    try:
+        thumb_path, media_type = await run_in_threadpool(resolve_thumbnail, file_path, size, fmt)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating thumbnail: {str(e)}")
+    
+    return await serve_file(
+        request,
+        thumb_path,
+        media_type,
+        headers={
+            "Content-Disposition": f'inline; filename="thumb_{size}_{os.path.splitext(filename)[0]}{FORMATS[fmt][1]}"',
+            "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+            "Vary": "Accept"
+        }
+    )
+
+@router.get("/media/{shard_a}/{shard_b}/{filename}/thumbnail")
+async def get_media_thumbnail(
+    shard_a: str,
+    shard_b: str,
+    filename: str,
+    request: Request,
+    size: int = Query(150, ge=MIN_SIZE, le=MAX_SIZE)
+):
+    """Thumbnail untuk content-addressed media"""
+    if not (MEDIA_SHARD_PATTERN.match(shard_a) and MEDIA_SHARD_PATTERN.match(shard_b)
+            and MEDIA_NAME_PATTERN.match(filename)):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    file_path = os.path.join(media_store.root, shard_a, shard_b, filename)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    return await _thumbnail_response(file_path, filename, size, request)
+
 @router.get("/{subfolder}/{filename}/thumbnail")
-async def get_thumbnail(subfolder: str, filename: str, size: int = 150):
+async def get_thumbnail(
+    subfolder: str,
+    filename: str,
+    request: Request,
+    size: int = Query(150, ge=MIN_SIZE, le=MAX_SIZE)
+):
     """
-    Generate thumbnail for images (optional - requires Pillow)
+    Serve thumbnail for images
+    
+    Ukuran standar (64/150/320/640) disajikan dari file yang sudah digenerate;
+    ukuran lain dirender sekali ke bounded on-disk cache.
     
     Args:
         subfolder: Storage subfolder
@@ -257,55 +341,13 @@ async def get_thumbnail(subfolder: str, filename: str, size: int = 150):
         raise HTTPException(status_code=404, detail="Invalid subfolder")
     
     # Build file path
-    file_path = os.path.join(STORAGE_FOLDERS[subfolder], filename)
+    file_path = os.path.join(STORAGE_FOLDERS[subfolder], os.path.basename(filename))
     
     # Check if file exists
-    if not os.path.exists(file_path):
+    if not os.path.isfile(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
-    # Check if it's an image
-    file_extension = os.path.splitext(filename)[1].lower()
-    image_extensions = [".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"]
-    
-    if file_extension not in image_extensions:
-        raise HTTPException(status_code=400, detail="File is not an image")
-    
-    try:
-        from PIL import Image
-        import io
-        
-        # Open and resize image
-        with Image.open(file_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ('RGBA', 'P'):
-                img = img.convert('RGB')
-            
-            # Create thumbnail
-            img.thumbnail((size, size), Image.Resampling.LANCZOS)
-            
-            # Save to bytes
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='JPEG', quality=85, optimize=True)
-            img_bytes.seek(0)
-            
-            return StreamingResponse(
-                io.BytesIO(img_bytes.read()), 
-                media_type="image/jpeg",
-                headers={
-                    "Content-Disposition": f'inline; filename="thumb_{filename}"',
-                    "Cache-Control": "public, max-age=86400"  # Cache for 24 hours
-                }
-            )
-            
-    except ImportError:
-        # Pillow not installed, return original image
-        return FileResponse(
-            path=file_path,
-            media_type="image/jpeg",
-            headers={"Content-Disposition": 'inline'}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating thumbnail: {str(e)}")
+    return await _thumbnail_response(file_path, filename, size, request)
 
 def _format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
@@ -7,7 +7,7 @@ from ..models.user import User, UserRole
 from ..dto.user_dto import (
     UserProfileDTO, UserResponse, UserListResponse, UserProfileResponse,
     UserStatsResponse, GenericUserResponse,
-    UserRoleUpdateDTO, BulkUserActionDTO
+    UserRoleUpdateDTO, BulkUserActionDTO, BulkRoleUpdateDTO, BulkBadgeAssignDTO
 )
 from ..config.middleware import get_current_user, require_admin, require_moderator_or_admin
 from ..handler.admin.manajemen_user import User_Management
@@ -340,6 +340,60 @@ async def bulk_deactivate_users(
             detail=f"Bulk deactivation failed: {str(e)}"
         )
 
+@router.post("/bulk-actions/role")
+async def bulk_update_role(
+    bulk_data: BulkRoleUpdateDTO,
+    request: Request,
+    user_mgmt: User_Management = Depends(get_user_management),
+    current_user: User = Depends(require_admin)
+):
+    """Bulk change role (Admin only)"""
+    try:
+        # Admin tidak bisa mengubah role dirinya sendiri
+        user_ids = [uid for uid in bulk_data.user_ids if uid != current_user.id]
+        
+        if not user_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No valid user IDs provided"
+            )
+        
+        result = user_mgmt.bulk_update_role(user_ids, bulk_data.role.value)
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk role update failed: {str(e)}"
+        )
+
+@router.post("/bulk-actions/badges")
+async def bulk_assign_badge(
+    bulk_data: BulkBadgeAssignDTO,
+    request: Request,
+    user_mgmt: User_Management = Depends(get_user_management),
+    current_user: User = Depends(require_moderator_or_admin)
+):
+    """Bulk assign badge to users (Moderator/Admin only)"""
+    try:
+        result = user_mgmt.bulk_assign_badge(bulk_data.user_ids, bulk_data.badge_id)
+        if not result["success"] and result["data"] is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=result["message"]
+            )
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk badge assignment failed: {str(e)}"
+        )
+
 # Juga perbaiki get_current_user_profile untuk konversi manual:
 @router.get("/me", response_model=UserProfileDTO)
 async def get_current_user_profile(
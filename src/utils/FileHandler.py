@@ -3,12 +3,16 @@ import uuid
 from datetime import datetime
 from fastapi import Form, APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 import re
 import logging
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .media_store import media_store
+from ..config.settings import settings
+from .image_variants import variant_worker
+from .storage_catalog import storage_catalog
+
 logger = logging.getLogger(__name__)
 
 BASE_STORAGE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "storage"))
@@ -21,6 +25,8 @@ STORAGE_FOLDERS = {
 
 ALLOWED_IMAGE_TYPES = {"image/png", "image/jpeg", "image/jpg", "image/webp"}
 
+MAX_UPLOAD_SIZE = settings.max_upload_size_mb * 1024 * 1024
+
 def ensure_storage_dirs():
     """Ensure storage directories exist with proper error handling"""
     for name, folder in STORAGE_FOLDERS.items():
@@ -44,16 +50,15 @@ def ensure_storage_dirs():
         except Exception as e:
             logger.error(f"❌ Unexpected error creating {folder}: {e}")
 
+_ready_dirs = set()
+
 def _ensure_dir_exists(directory: str):
-    """Ensure specific directory exists when needed"""
+    """Ensure specific directory exists when needed (sekali per proses)"""
+    if directory in _ready_dirs:
+        return True
     try:
         Path(directory).mkdir(parents=True, exist_ok=True)
-        
-        # Test write permission
-        test_file = Path(directory) / '.write_test'
-        test_file.touch()
-        test_file.unlink()
-        
+        _ready_dirs.add(directory)
         return True
     except PermissionError as e:
         logger.warning(f"Permission denied creating directory: {directory}")
@@ -78,10 +83,8 @@ def sanitize_filename(filename: str) -> str:
     filename = re.sub(r'_{2,}', '_', filename)
     return filename
 
-def save_image(file: UploadFile, subfolder: str) -> str:
-    """Save uploaded image to storage and return relative path"""
-    logger.info(f"🔍 Debug: File received - filename: {file.filename}, content_type: {file.content_type}")
-    
+async def save_image(file: UploadFile, subfolder: str, max_size: int = MAX_UPLOAD_SIZE) -> str:
+    """Save uploaded image ke content-addressed media store (streamed, off the event loop) and return relative path"""
     if not file or not file.filename:
         logger.error("❌ No file provided or filename is empty")
         return ""
@@ -90,84 +93,51 @@ def save_image(file: UploadFile, subfolder: str) -> str:
         logger.error(f"❌ Invalid content type: {file.content_type}")
         raise HTTPException(status_code=400, detail=f"File must be an image. Allowed types: {ALLOWED_IMAGE_TYPES}")
     
-    # Get storage directory
-    storage_dir = STORAGE_FOLDERS.get(subfolder)
-    if not storage_dir:
+    # Subfolder tetap divalidasi (kompatibilitas API), konten disimpan di media store
+    if subfolder not in STORAGE_FOLDERS:
         raise HTTPException(status_code=400, detail="Invalid storage subfolder")
     
-    # Ensure directory exists - with fallback handling
-    dir_result = _ensure_dir_exists(storage_dir)
-    if dir_result is False:
-        raise HTTPException(status_code=500, detail=f"Cannot create storage directory: {storage_dir}")
-    elif isinstance(dir_result, str):
-        # Alternative directory was used
-        storage_dir = dir_result
-    
-    # Generate filename
-    original_filename = file.filename
-    file_extension = os.path.splitext(original_filename)[1].lower()
-    filename_without_ext = os.path.splitext(original_filename)[0]
-    
-    clean_filename = sanitize_filename(filename_without_ext)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    unique_filename = f"{clean_filename}_{timestamp}{file_extension}"
-    
-    if not file_extension:
-        extension_map = {
-            "image/png": ".png",
-            "image/jpeg": ".jpg", 
-            "image/jpg": ".jpg",
-            "image/webp": ".webp"
-        }
-        file_extension = extension_map.get(file.content_type, ".jpg")
-        unique_filename = f"{clean_filename}_{timestamp}{file_extension}"
-    
-    file_path = os.path.join(storage_dir, unique_filename)
-    
-    # Handle duplicate filenames
-    counter = 1
-    original_unique_filename = unique_filename
-    while os.path.exists(file_path):
-        filename_parts = os.path.splitext(original_unique_filename)
-        unique_filename = f"{filename_parts[0]}_{counter}{filename_parts[1]}"
-        file_path = os.path.join(storage_dir, unique_filename)
-        counter += 1
+    # ✅ Extension dari content type: konten identik selalu ke key yang sama
+    extension_map = {
+        "image/png": ".png",
+        "image/jpeg": ".jpg", 
+        "image/jpg": ".jpg",
+        "image/webp": ".webp"
+    }
+    file_extension = extension_map.get(file.content_type, ".jpg")
     
     try:
-        # Reset file pointer
-        file.file.seek(0)
-        
-        # Read and save file
-        with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            if not content:
-                logger.error("❌ File content is empty")
-                raise HTTPException(status_code=400, detail="File content is empty")
-            
-            buffer.write(content)
-            logger.info(f"✅ File saved successfully: {file_path}")
-            logger.info(f"📁 File size: {len(content)} bytes")
+        relative_path, digest, size, created = await run_in_threadpool(
+            media_store.put_stream, file.file, file_extension, max_size
+        )
+        logger.info(
+            "File saved",
+            extra={
+                "event": "file.saved",
+                "path": relative_path,
+                "size": size,
+                "subfolder": subfolder,
+                "deduplicated": not created,
+            },
+        )
         
-        # Verify file was created
-        if not os.path.exists(file_path):
-            logger.error(f"❌ File was not created: {file_path}")
-            raise HTTPException(status_code=500, detail="Failed to save file")
+        # ✅ Metadata catalog: listing/info tanpa directory scan
+        await run_in_threadpool(
+            storage_catalog.record, subfolder, relative_path, digest, size, file.content_type
+        )
         
-        # Return relative path
-        relative_path = f"storage/{subfolder}/{unique_filename}"
-        logger.info(f"🎯 Returning relative path: {relative_path}")
+        # ✅ Thumbnails/WebP di-generate sekali di background worker
+        if created:
+            variant_worker.submit(media_store.resolve(relative_path))
         return relative_path
         
+    except HTTPException:
+        raise
     except PermissionError as e:
         logger.error(f"❌ Permission error saving file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Permission denied: {str(e)}")
     except Exception as e:
         logger.error(f"❌ Error saving file: {str(e)}")
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
 # Initialize router
@@ -177,7 +147,7 @@ router = APIRouter(prefix="/file", tags=["File Upload"])
 async def upload_soal_image(file: UploadFile = File(...)):
     """Upload image for soal"""
     try:
-        rel_path = save_image(file, "soal")
+        rel_path = await save_image(file, "soal")
         return JSONResponse({
             "success": True, 
             "path": rel_path,
@@ -199,7 +169,7 @@ async def upload_soal_image(file: UploadFile = File(...)):
 async def upload_avatar(file: UploadFile = File(...)):
     """Upload user avatar"""
     try:
-        rel_path = save_image(file, "avatars")
+        rel_path = await save_image(file, "avatars")
         return JSONResponse({
             "success": True, 
             "path": rel_path,
@@ -225,7 +195,7 @@ async def upload_kamus_image(
 ):
     """Upload image for kamus entry"""
     try:
-        rel_path = save_image(file, "kamus")
+        rel_path = await save_image(file, "kamus")
         return JSONResponse({
             "success": True, 
             "path": rel_path, 
@@ -0,0 +1,93 @@
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import update
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityWriter:
+    """Batched background writer untuk last_login / activity timestamps.
+
+    Login tidak lagi melakukan write transaction sinkron; timestamp di-queue
+    per user_id (yang terbaru menang) lalu di-flush periodik dalam satu
+    executemany UPDATE.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, max_pending: int = 1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_login(self, user_id: int, when: Optional[datetime] = None) -> datetime:
+        """Queue last_login untuk user, return timestamp yang di-queue"""
+        when = when or datetime.utcnow()
+        with self._lock:
+            self._pending[int(user_id)] = when
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wakeup.set()
+        return when
+
+    def start(self):
+        """Start background flush thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop thread dan flush sisa pending writes"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write semua pending timestamps dalam satu batch, return jumlah row"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+
+        # Import here to avoid circular imports
+        from ..database.db import SessionLocal
+        from ..models.user import User
+
+        rows = [{"id": user_id, "last_login": ts} for user_id, ts in batch.items()]
+        db = SessionLocal()
+        try:
+            db.execute(update(User), rows)
+            db.commit()
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Activity flush failed ({len(rows)} rows): {e}")
+            # Re-queue, tapi jangan timpa timestamp yang lebih baru
+            with self._lock:
+                for user_id, ts in batch.items():
+                    if user_id not in self._pending:
+                        self._pending[user_id] = ts
+            return 0
+        finally:
+            db.close()
+
+
+activity_writer = ActivityWriter(settings.activity_flush_interval, settings.activity_max_pending)
@@ -0,0 +1,420 @@
+import re
+import gzip
+import zlib
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from fastapi import Request
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from .metrics import cache_hit, cache_miss
+from ..config.settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tabel yang di-track -> nama resource untuk version counter
+TRACKED_TABLES = {
+    "level": "level",
+    "sublevel": "sublevel",
+    "kamus": "kamus",
+    "soal": "soal",
+}
+# Tabel dengan version per user ("progress:<user_id>"). Bulk statement tidak tahu
+# user mana yang kena, jadi bump resource global-nya ("progress", semua user)
+PER_USER_TABLES = {
+    "progress": "progress",
+}
+
+# "{user_id}" diisi dari JWT (request.state.user_id)
+LEARNER_RESOURCES = ("level", "sublevel", "progress", "progress:{user_id}")
+
+# Endpoint read-mostly -> resource yang mempengaruhi isi response
+CACHE_RULES: List[Tuple[Pattern, Tuple[str, ...]]] = [
+    (re.compile(r"^/api/admin/levels(/.*)?$"), ("level", "sublevel")),
+    (re.compile(r"^/api/admin/sublevels(/.*)?$"), ("sublevel", "level", "soal")),
+    (re.compile(r"^/api/admin/kamus(/.*)?$"), ("kamus", "soal")),
+    (re.compile(r"^/api/admin/soal/list$"), ("soal", "kamus", "sublevel", "level")),
+    # Curriculum learner (mobile). /start tidak di-cache: menulis progress (start_progress)
+    (re.compile(r"^/api/user/soal/available-sublevels$"), LEARNER_RESOURCES),
+    (re.compile(r"^/api/user/soal/sublevel/\d+/progress$"), LEARNER_RESOURCES),
+    (re.compile(r"^/api/user/soal/user/progress/summary$"), LEARNER_RESOURCES),
+]
+# Statistik punya window waktu ("30 hari terakhir"), tidak murni fungsi dari version
+CACHE_EXCLUDE = re.compile(r"/statistics$")
+
+CACHE_CONTROL = "private, no-cache"  # Client simpan, tapi selalu revalidate (304)
+
+COMPRESSION_MIN_SIZE = settings.compression_min_size
+GZIP_LEVEL = settings.gzip_level
+BROTLI_QUALITY = settings.brotli_quality
+VERSION_TTL = settings.etag_version_ttl
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+# =====================================================================
+# VERSION COUNTERS
+# =====================================================================
+
+class ResourceVersions:
+    """
+    Version counter per resource, disimpan di tabel resource_versions.
+
+    Di-bump dalam transaksi yang sama dengan perubahan data (after_flush untuk
+    ORM, do_orm_execute untuk bulk UPDATE/DELETE), sehingga semua worker
+    melihat version yang sama begitu commit. Resource bersama di-cache per
+    proses selama ``ttl`` detik; resource per user (progress:<id>) selalu
+    dibaca, karena user bisa saja baru menulis lewat worker lain.
+    """
+
+    def __init__(self, ttl: float = VERSION_TTL):
+        self.ttl = ttl
+        self._seen: Dict[str, int] = {}
+        self._cache: Dict[str, Tuple[int, float]] = {}  # resource -> (version, expires_at)
+        self._listeners: List[Tuple[Tuple[str, ...], Callable[[], None]]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bump(connection, resources: Iterable[str]):
+        from ..models.resource_version import ResourceVersion
+
+        resources = sorted(set(resources))  # Urutan tetap: hindari deadlock antar transaksi
+        if not resources:
+            return
+        stmt = insert(ResourceVersion).values([{"resource": r, "version": 1} for r in resources])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResourceVersion.resource],
+            set_={"version": ResourceVersion.version + 1, "updated_at": func.now()},
+        )
+        connection.execute(stmt)
+
+    def cached(self, resources: Tuple[str, ...]) -> Optional[Dict[str, int]]:
+        """Version dari cache proses, None jika ada yang belum/tidak di-cache"""
+        now = time.monotonic()
+        versions = {}
+        with self._lock:
+            for resource in resources:
+                entry = self._cache.get(resource)
+                if entry is None or entry[1] < now:
+                    return None
+                versions[resource] = entry[0]
+        return versions
+
+    def current(self, resources: Tuple[str, ...]) -> Dict[str, int]:
+        """Version saat ini; hanya yang tidak ada di cache dibaca dari DB. Blocking, panggil dari threadpool"""
+        now = time.monotonic()
+        versions: Dict[str, int] = {}
+        with self._lock:
+            for resource in resources:
+                entry = self._cache.get(resource)
+                if entry is not None and entry[1] >= now:
+                    versions[resource] = entry[0]
+
+        missing = tuple(resource for resource in resources if resource not in versions)
+        if missing:
+            fetched = self._fetch(missing)
+            expires_at = time.monotonic() + self.ttl
+            with self._lock:
+                self._cache.update(
+                    (resource, (version, expires_at))
+                    for resource, version in fetched.items()
+                    if ":" not in resource
+                )
+            versions.update(fetched)
+            self._notify_changes(fetched)
+        return versions
+
+    def invalidate(self, resources: Iterable[str]):
+        """Buang cache proses setelah commit lokal: request berikutnya di worker ini langsung fresh"""
+        with self._lock:
+            for resource in resources:
+                self._cache.pop(resource, None)
+
+    @staticmethod
+    def _fetch(resources: Tuple[str, ...]) -> Dict[str, int]:
+        """Satu query PK lookup lewat koneksi pool (tanpa ORM session)"""
+        from ..database.db import engine
+        from ..models.resource_version import ResourceVersion
+
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(ResourceVersion.resource, ResourceVersion.version)
+                .where(ResourceVersion.resource.in_(resources))
+            ).all()
+        versions = {resource: 0 for resource in resources}
+        versions.update({resource: int(version) for resource, version in rows})
+        return versions
+
+    def on_change(self, resources: Tuple[str, ...], callback: Callable[[], None]):
+        """Daftarkan callback (mis. invalidasi cache in-process) saat version berubah"""
+        self._listeners.append((resources, callback))
+
+    def _notify_changes(self, versions: Dict[str, int]):
+        with self._lock:
+            changed = {r for r, v in versions.items() if self._seen.get(r, v) != v}
+            self._seen.update((r, v) for r, v in versions.items() if ":" not in r)
+        if not changed:
+            return
+        for resources, callback in self._listeners:
+            if changed.intersection(resources):
+                callback()
+
+
+resource_versions = ResourceVersions()
+
+_BUMPED = "http_cache_bumped"  # session.info: resource yang di-bump dalam transaksi ini
+
+
+def _table_name(mapper) -> Optional[str]:
+    table = getattr(mapper, "local_table", None) if mapper is not None else None
+    return getattr(table, "name", None)
+
+
+def _tracked_resource(mapper) -> Optional[str]:
+    """Resource untuk bulk statement (tabel per user -> resource global-nya)"""
+    name = _table_name(mapper)
+    return TRACKED_TABLES.get(name) or PER_USER_TABLES.get(name)
+
+
+def _object_resource(obj) -> Optional[str]:
+    from sqlalchemy import inspect
+
+    name = _table_name(inspect(obj).mapper)
+    if name in PER_USER_TABLES:
+        return f"{PER_USER_TABLES[name]}:{obj.user_id}"
+    return TRACKED_TABLES.get(name)
+
+
+def _bump(session, resources):
+    resource_versions.bump(session.connection(), resources)
+    session.info.setdefault(_BUMPED, set()).update(resources)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, flush_context):
+    resources = set()
+    for obj in list(session.new) + list(session.deleted):
+        resource = _object_resource(obj)
+        if resource:
+            resources.add(resource)
+    for obj in session.dirty:
+        resource = _object_resource(obj)
+        if resource and session.is_modified(obj, include_collections=False):
+            resources.add(resource)
+    if resources:
+        _bump(session, resources)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk_statement(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    resource = _tracked_resource(orm_execute_state.bind_mapper)
+    if resource:
+        _bump(orm_execute_state.session, [resource])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    resource_versions.invalidate(session.info.pop(_BUMPED, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_BUMPED, None)
+
+
+# =====================================================================
+# CONDITIONAL GET
+# =====================================================================
+
+def match_rule(path: str, user_id=None) -> Optional[Tuple[str, ...]]:
+    """Resource untuk path ini ("{user_id}" sudah diisi), None jika tidak di-cache"""
+    if CACHE_EXCLUDE.search(path):
+        return None
+    for pattern, resources in CACHE_RULES:
+        if pattern.match(path):
+            if not user_id and any("{user_id}" in r for r in resources):
+                return None
+            return tuple(r.format(user_id=user_id) for r in resources)
+    return None
+
+
+def compute_etag(request: Request, versions: Dict[str, int]) -> str:
+    """Weak ETag: versions + URL + identitas (response bisa beda per role/user)"""
+    parts = [
+        request.url.path,
+        request.url.query,
+        str(getattr(request.state, "user_id", "") or ""),
+        str(getattr(request.state, "role", "") or ""),
+    ]
+    parts.extend(f"{resource}:{versions[resource]}" for resource in sorted(versions))
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+class ConditionalCacheMiddleware:
+    """
+    Pure ASGI: ETag + 304 untuk endpoint curriculum yang read-mostly.
+
+    ETag dihitung dari version counter sebelum handler dipanggil, jadi request
+    yang cocok dengan If-None-Match dijawab 304 tanpa query data sama sekali.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "GET":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        resources = match_rule(scope["path"], getattr(request.state, "user_id", None))
+        if resources is None:
+            await self.app(scope, receive, send)
+            return
+
+        versions = resource_versions.cached(resources)
+        if versions is None:
+            versions = await run_in_threadpool(resource_versions.current, resources)
+        etag = compute_etag(request, versions)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization, Accept-Encoding"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            cache_hit("http_etag")
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+        cache_miss("http_etag")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# =====================================================================
+# COMPRESSION
+# =====================================================================
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accept_encoding = accept_encoding.lower()
+    if brotli is not None and "br" in accept_encoding:
+        return "br"
+    if "gzip" in accept_encoding:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def stream_compressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """(compress_chunk, finish) untuk response streaming"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # format gzip
+    return compressor.compress, compressor.flush
+
+
+def _mark_encoded(headers: MutableHeaders, encoding: str):
+    headers["content-encoding"] = encoding
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI: brotli/gzip untuk response API (JSON/text) di atas threshold.
+
+    Body satu message (JSONResponse) dikompres sekali; response streaming
+    dikompres per chunk, tidak di-buffer.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, path_prefix: str = "/api/"):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope.get("path", "").startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = {}
+        state = {"passthrough": False, "started": False, "compressor": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                status = message["status"]
+                state["passthrough"] = (
+                    status < 200
+                    or status in (204, 304)
+                    or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                )
+                if state["passthrough"]:
+                    await send(message)
+                else:
+                    start_message.update(message)  # Tahan sampai body pertama: header tergantung ukuran
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not state["started"]:
+                state["started"] = True
+                headers = MutableHeaders(scope=start_message)
+                if not more_body:
+                    if len(body) >= self.minimum_size:
+                        body = await run_in_threadpool(compress, body, encoding)
+                        headers["content-length"] = str(len(body))
+                        _mark_encoded(headers, encoding)
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["content-length"]
+                _mark_encoded(headers, encoding)
+                state["compressor"] = stream_compressor(encoding)
+                await send(start_message)
+
+            compress_chunk, finish = state["compressor"]
+            chunk = compress_chunk(body)
+            if not more_body:
+                chunk += finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,234 @@
+import os
+import logging
+import tempfile
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .media_store import media_store, BASE_STORAGE_PATH
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_ROOT = os.path.join(BASE_STORAGE_PATH, "variants")
+ONDEMAND_CACHE_DIR = os.path.join(VARIANTS_ROOT, ".cache")
+
+# Ukuran standar yang digenerate saat upload (px, sisi terpanjang)
+VARIANT_SIZES = (64, 150, 320, 640)
+MIN_SIZE = 16
+MAX_SIZE = 1024
+ONDEMAND_CACHE_MAX_FILES = settings.thumbnail_cache_max_files
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"}
+
+# format -> (PIL format, extension, media type, save options)
+FORMATS = {
+    "avif": ("AVIF", ".avif", "image/avif", {"quality": 60}),
+    "webp": ("WEBP", ".webp", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", ".jpg", "image/jpeg", {"quality": 85, "optimize": True}),
+}
+
+
+@lru_cache(maxsize=1)
+def available_formats() -> Tuple[str, ...]:
+    """Format output yang didukung Pillow di environment ini (urut preferensi)"""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return ()
+    formats = []
+    if "AVIF" in Image.registered_extensions().values() or features.check("avif"):
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    formats.append("jpeg")
+    return tuple(formats)
+
+
+def variant_dir(source_path: str) -> str:
+    """Direktori variants untuk satu original (media: per hash, legacy: per subfolder/nama)"""
+    source_path = os.path.abspath(source_path)
+    if source_path.startswith(media_store.root + os.sep):
+        digest = os.path.splitext(os.path.basename(source_path))[0]
+        a, b = media_store.shard(digest)
+        return os.path.join(VARIANTS_ROOT, a, b, digest)
+    relative = os.path.relpath(source_path, BASE_STORAGE_PATH)
+    return os.path.join(VARIANTS_ROOT, "legacy", relative)
+
+
+def variant_path(source_path: str, size: int, fmt: str) -> str:
+    return os.path.join(variant_dir(source_path), f"{size}{FORMATS[fmt][1]}")
+
+
+def _atomic_save(image, path: str, fmt: str):
+    pil_format, _, _, options = FORMATS[fmt]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            image.save(buffer, format=pil_format, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _render(source_path: str, sizes: Tuple[int, ...], targets: Dict[Tuple[int, str], str]):
+    """Decode original sekali, render semua (size, format) ke target path"""
+    from PIL import Image
+
+    with Image.open(source_path) as img:
+        # JPEG draft mode: decode langsung di resolusi yang cukup untuk size terbesar
+        img.draft("RGB", (max(sizes), max(sizes)))
+        base = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+    for size in sorted(sizes, reverse=True):
+        resized = base.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for (target_size, fmt), path in targets.items():
+            if target_size != size:
+                continue
+            frame = resized.convert("RGB") if fmt == "jpeg" and resized.mode != "RGB" else resized
+            _atomic_save(frame, path, fmt)
+
+
+def generate_variants(source_path: str, force: bool = False) -> int:
+    """Generate semua ukuran standar x format untuk satu image, return jumlah file baru"""
+    if os.path.splitext(source_path)[1].lower() not in IMAGE_EXTENSIONS:
+        return 0
+    targets = {}
+    for size in VARIANT_SIZES:
+        for fmt in available_formats():
+            path = variant_path(source_path, size, fmt)
+            if force or not os.path.exists(path):
+                targets[(size, fmt)] = path
+    if not targets:
+        return 0
+    _render(source_path, tuple(sorted({size for size, _ in targets})), targets)
+    return len(targets)
+
+
+def remove_variants(source_path: str):
+    """Hapus variants milik original (dipakai media GC)"""
+    import shutil
+    shutil.rmtree(variant_dir(source_path), ignore_errors=True)
+
+
+# =====================================================================
+# BACKGROUND WORKER
+# =====================================================================
+
+class VariantWorker:
+    """Single-thread background worker untuk generate variants setelah upload"""
+
+    def __init__(self, max_workers: int = 1):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image-variants")
+            return self._executor
+
+    def submit(self, source_path: str):
+        future = self._get_executor().submit(generate_variants, source_path)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"❌ Variant generation failed: {error}")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+variant_worker = VariantWorker(settings.image_variant_workers)
+
+
+def backfill(folders: Dict[str, str], force: bool = False) -> Dict[str, int]:
+    """Generate variants untuk semua file yang sudah ada (media store + folder legacy)"""
+    sources = [path for _, path, _ in media_store.iter_files()]
+    for folder in folders.values():
+        if os.path.isdir(folder):
+            sources.extend(entry.path for entry in os.scandir(folder) if entry.is_file())
+
+    processed = generated = failed = 0
+    for source in sources:
+        if os.path.splitext(source)[1].lower() not in IMAGE_EXTENSIONS:
+            continue
+        processed += 1
+        try:
+            generated += generate_variants(source, force=force)
+        except Exception as e:
+            failed += 1
+            logger.warning(f"⚠️ Could not generate variants for {source}: {e}")
+    return {"images_processed": processed, "variants_generated": generated, "failed": failed}
+
+
+# =====================================================================
+# SERVING
+# =====================================================================
+
+def negotiate_format(accept_header: Optional[str]) -> str:
+    """Pilih format terbaik yang diterima client dan didukung server"""
+    accept = accept_header or ""
+    supported = available_formats()
+    for fmt in ("avif", "webp"):
+        if fmt in supported and FORMATS[fmt][2] in accept:
+            return fmt
+    return "jpeg"
+
+
+def _evict_ondemand_cache():
+    """Bounded cache: buang file paling lama diakses jika melebihi batas"""
+    try:
+        entries = [entry for entry in os.scandir(ONDEMAND_CACHE_DIR) if entry.is_file()]
+    except FileNotFoundError:
+        return
+    overflow = len(entries) - ONDEMAND_CACHE_MAX_FILES
+    if overflow <= 0:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_atime)
+    for entry in entries[:overflow]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def resolve_thumbnail(source_path: str, size: int, fmt: str) -> Tuple[str, str]:
+    """
+    Return (path, media_type) thumbnail: precomputed jika size standar,
+    selain itu dari bounded on-disk cache (render sekali per size/format).
+    Blocking, panggil dari threadpool.
+    """
+    size = max(MIN_SIZE, min(MAX_SIZE, size))
+    media_type = FORMATS[fmt][2]
+
+    if size in VARIANT_SIZES:
+        path = variant_path(source_path, size, fmt)
+        if not os.path.exists(path):
+            generate_variants(source_path)
+        if os.path.exists(path):
+            return path, media_type
+
+    key = os.path.relpath(variant_dir(source_path), VARIANTS_ROOT).replace(os.sep, "__")
+    path = os.path.join(ONDEMAND_CACHE_DIR, f"{key}__{size}{FORMATS[fmt][1]}")
+    if os.path.exists(path):
+        os.utime(path, None)
+        return path, media_type
+
+    _render(source_path, (size,), {(size, fmt): path})
+    _evict_ondemand_cache()
+    return path, media_type
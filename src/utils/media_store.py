@@ -0,0 +1,271 @@
+import os
+import time
+import hashlib
+import tempfile
+import logging
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, union_all, func
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+BASE_STORAGE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "storage"))
+MEDIA_ROOT = os.path.join(BASE_STORAGE_PATH, "media")
+MEDIA_URL_PREFIX = "storage/media"
+
+CHUNK_SIZE = 64 * 1024
+# File baru yang belum direferensikan DB tidak di-GC sebelum grace period habis
+GC_GRACE_SECONDS = settings.media_gc_grace_seconds
+
+
+class MediaStore:
+    """
+    Content-addressed media store.
+
+    File disimpan sekali per SHA-256 di layout fan-out
+    ``media/ab/cd/<sha256><ext>``, sehingga upload yang sama untuk beberapa
+    soal/kamus/avatar berbagi satu file dan URL-nya immutable.
+    """
+
+    def __init__(self, root: str = MEDIA_ROOT, url_prefix: str = MEDIA_URL_PREFIX):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.tmp_dir = os.path.join(root, ".tmp")
+
+    # =====================================================================
+    # PATHS
+    # =====================================================================
+
+    @staticmethod
+    def shard(digest: str) -> Tuple[str, str]:
+        return digest[:2], digest[2:4]
+
+    def relative_path(self, digest: str, ext: str) -> str:
+        """Path relatif yang disimpan di DB, mis. storage/media/ab/cd/<hash>.jpg"""
+        a, b = self.shard(digest)
+        return f"{self.url_prefix}/{a}/{b}/{digest}{ext}"
+
+    def absolute_path(self, digest: str, ext: str) -> str:
+        a, b = self.shard(digest)
+        return os.path.join(self.root, a, b, f"{digest}{ext}")
+
+    def resolve(self, reference: Optional[str]) -> Optional[str]:
+        """Map nilai kolom DB (dengan/tanpa leading slash) ke absolute path media"""
+        if not reference:
+            return None
+        normalized = reference.lstrip("/")
+        if not normalized.startswith(self.url_prefix + "/"):
+            return None
+        return os.path.join(self.root, *normalized[len(self.url_prefix) + 1:].split("/"))
+
+    # =====================================================================
+    # WRITES
+    # =====================================================================
+
+    def put_stream(self, source: BinaryIO, ext: str, max_size: int) -> Tuple[str, str, int, bool]:
+        """
+        Stream source ke store: hash + size limit dalam satu pass, lalu atomic
+        rename ke lokasi content-addressed. Duplikat langsung dibuang.
+
+        Returns:
+            (relative_path, sha256_hex, size, created)
+        """
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir, prefix="upload_", suffix=".tmp")
+        try:
+            source.seek(0)
+            with os.fdopen(fd, "wb") as buffer:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Max size: {max_size // (1024 * 1024)} MB"
+                        )
+                    hasher.update(chunk)
+                    buffer.write(chunk)
+
+            if size == 0:
+                raise HTTPException(status_code=400, detail="File content is empty")
+
+            digest = hasher.hexdigest()
+            final_path = self.absolute_path(digest, ext)
+            if os.path.exists(final_path):
+                # ✅ Dedup: konten sama sudah ada, refresh mtime untuk GC grace period
+                os.remove(tmp_path)
+                os.utime(final_path, None)
+                return self.relative_path(digest, ext), digest, size, False
+
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+            return self.relative_path(digest, ext), digest, size, True
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def put_file(self, path: str) -> Tuple[str, str, int, bool]:
+        """Import file yang sudah ada di disk ke store (untuk migrasi legacy)"""
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, "rb") as source:
+            return self.put_stream(source, ext, max_size=os.path.getsize(path) + 1)
+
+    # =====================================================================
+    # REFERENCE COUNTING
+    # =====================================================================
+
+    @staticmethod
+    def _reference_union():
+        """UNION ALL semua kolom yang mereferensikan media"""
+        # Import here to avoid circular imports
+        from ..models.soal import Soal
+        from ..models.kamus import Kamus
+        from ..models.user import User
+
+        return union_all(
+            select(func.ltrim(Soal.image_url, "/").label("ref")).where(Soal.image_url.isnot(None)),
+            select(func.ltrim(Kamus.image_url_ref, "/").label("ref")).where(Kamus.image_url_ref.isnot(None)),
+            select(func.ltrim(User.avatar, "/").label("ref")).where(User.avatar.isnot(None)),
+        ).subquery()
+
+    def reference_counts(self, db: Session) -> Dict[str, int]:
+        """Refcount per media path (satu GROUP BY atas ketiga kolom)"""
+        refs = self._reference_union()
+        rows = db.execute(
+            select(refs.c.ref, func.count())
+            .where(refs.c.ref.like(f"{self.url_prefix}/%"))
+            .group_by(refs.c.ref)
+        ).all()
+        return {ref: int(count) for ref, count in rows}
+
+    def refcount(self, db: Session, reference: str) -> int:
+        refs = self._reference_union()
+        return int(db.execute(
+            select(func.count()).select_from(refs).where(refs.c.ref == reference.lstrip("/"))
+        ).scalar() or 0)
+
+    # =====================================================================
+    # GARBAGE COLLECTION
+    # =====================================================================
+
+    def iter_files(self):
+        """Yield (relative_path, absolute_path, stat) untuk semua file media"""
+        if not os.path.isdir(self.root):
+            return
+        for shard_a in os.scandir(self.root):
+            if not shard_a.is_dir() or shard_a.name.startswith("."):
+                continue
+            for shard_b in os.scandir(shard_a.path):
+                if not shard_b.is_dir():
+                    continue
+                for entry in os.scandir(shard_b.path):
+                    if entry.is_file():
+                        rel = f"{self.url_prefix}/{shard_a.name}/{shard_b.name}/{entry.name}"
+                        yield rel, entry.path, entry.stat()
+
+    def find_orphans(self, db: Session, grace_seconds: int = GC_GRACE_SECONDS) -> List[Tuple[str, str, int]]:
+        """File media tanpa referensi yang lebih tua dari grace period"""
+        referenced = self.reference_counts(db)
+        cutoff = time.time() - grace_seconds
+        return [
+            (rel, path, st.st_size)
+            for rel, path, st in self.iter_files()
+            if rel not in referenced and st.st_mtime < cutoff
+        ]
+
+    def gc(self, db: Session, dry_run: bool = False, grace_seconds: int = GC_GRACE_SECONDS) -> Dict[str, int]:
+        """Hapus orphan media files (dan temp upload yang tertinggal)"""
+        from .image_variants import remove_variants
+
+        from ..models.storage_file import StorageFile
+
+        orphans = self.find_orphans(db, grace_seconds)
+        removed_paths = []
+        freed = 0
+        for rel, path, size in orphans:
+            if dry_run:
+                continue
+            try:
+                os.remove(path)
+                remove_variants(path)
+                removed_paths.append(rel)
+                freed += size
+            except OSError as e:
+                logger.warning(f"⚠️ Could not remove orphan {rel}: {e}")
+        removed = len(removed_paths)
+        
+        if removed_paths:
+            # Buang entry catalog milik file yang sudah dihapus
+            db.query(StorageFile).filter(StorageFile.path.in_(removed_paths))\
+                .delete(synchronize_session=False)
+            db.commit()
+
+        stale_tmp = 0
+        if os.path.isdir(self.tmp_dir):
+            cutoff = time.time() - grace_seconds
+            for entry in os.scandir(self.tmp_dir):
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    stale_tmp += 1
+                    if not dry_run:
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+
+        return {
+            "orphans_found": len(orphans),
+            "orphans_removed": removed,
+            "bytes_freed": freed,
+            "stale_tmp_files": stale_tmp,
+        }
+
+    # =====================================================================
+    # LEGACY MIGRATION
+    # =====================================================================
+
+    def migrate_legacy(self, db: Session, folders: Dict[str, str]) -> Dict[str, int]:
+        """
+        Import file lama (storage/<subfolder>/<name>) ke store dan rewrite
+        referensi DB ke path content-addressed. File lama tidak dihapus.
+        """
+        from sqlalchemy import update
+        from ..models.soal import Soal
+        from ..models.kamus import Kamus
+        from ..models.user import User
+
+        mapping: Dict[str, str] = {}
+        imported = 0
+        for subfolder, folder in folders.items():
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                rel, _, _, created = self.put_file(entry.path)
+                mapping[f"storage/{subfolder}/{entry.name}"] = rel
+                imported += int(created)
+
+        rewritten = 0
+        for old, new in mapping.items():
+            variants = [old, f"/{old}"]
+            for column, value in ((Soal.image_url, f"/{new}"), (Kamus.image_url_ref, f"/{new}"), (User.avatar, new)):
+                rewritten += db.execute(
+                    update(column.class_).where(column.in_(variants)).values({column.key: value})
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+        db.commit()
+        return {"files_scanned": len(mapping), "files_imported": imported, "references_rewritten": rewritten}
+
+
+media_store = MediaStore()
@@ -0,0 +1,461 @@
+"""
+Metric in-process (Prometheus text format) tanpa dependency tambahan.
+
+Multi-worker (gunicorn, WEB_CONCURRENCY>1): tiap worker punya registry
+sendiri, sehingga /metrics hanya melihat satu worker. Dengan
+PROMETHEUS_MULTIPROC_DIR, tiap worker menulis snapshot ke
+``<dir>/metrics_<pid>.json`` (MetricsFileWriter) dan /metrics menjumlahkan
+semua file. Counter/histogram worker yang mati digabung ke
+``metrics_dead.json`` (mark_process_dead, dari gunicorn child_exit).
+"""
+import os
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = settings.metrics_enabled
+MULTIPROC_DIR = settings.metrics_multiproc_dir
+DEAD_FILE = "metrics_dead.json"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# =====================================================================
+# METRIC TYPES
+# =====================================================================
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def values(self) -> Dict[LabelValues, Any]:
+        raise NotImplementedError
+
+    @staticmethod
+    def merge(a: Any, b: Any) -> Any:
+        return a + b
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self, values: Optional[Dict[LabelValues, float]] = None) -> List[str]:
+        values = self.values() if values is None else values
+        lines = self.header()
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+        if self._callback is not None:
+            try:
+                values.update(self._callback())
+            except Exception:
+                pass  # Collector gagal (mis. DB belum siap): jangan gagalkan /metrics
+        return values
+
+    def render(self, values: Optional[Dict[LabelValues, float]] = None) -> List[str]:
+        values = self.values() if values is None else values
+        lines = self.header()
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> ([count per bucket (+Inf terakhir)], sum)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def values(self) -> Dict[LabelValues, Tuple[List[int], List[float]]]:
+        with self._lock:
+            return {labels: (list(counts), list(total)) for labels, (counts, total) in self._series.items()}
+
+    @staticmethod
+    def merge(a, b):
+        return [x + y for x, y in zip(a[0], b[0])], [a[1][0] + b[1][0]]
+
+    def render(self, values: Optional[Dict[LabelValues, Tuple[List[int], List[float]]]] = None) -> List[str]:
+        values = self.values() if values is None else values
+        lines = self.header()
+        for labels, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound) if bound != float("inf") else "+Inf"}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total[0]}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Registry metric in-process, di-render ke Prometheus text format"""
+
+    def __init__(self, multiproc_dir: str = ""):
+        self._metrics: List[Metric] = []
+        self.multiproc_dir = multiproc_dir
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    # =====================================================================
+    # MULTI-PROCESS (PROMETHEUS_MULTIPROC_DIR)
+    # =====================================================================
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        """State semua metric, JSON-serializable: {name: [[labels, value], ...]}"""
+        return {
+            metric.name: [[list(labels), value] for labels, value in metric.values().items()]
+            for metric in self._metrics
+        }
+
+    def write_snapshot(self, pid: Optional[int] = None) -> None:
+        """Tulis snapshot proses ini ke <dir>/metrics_<pid>.json (atomic replace)"""
+        path = os.path.join(self.multiproc_dir, f"metrics_{pid or os.getpid()}.json")
+        _write_json(path, self.snapshot())
+
+    def _merge_into(self, merged: Dict[str, Dict[LabelValues, Any]], snapshot: Dict[str, List[list]],
+                    kinds: Tuple[str, ...] = ("counter", "gauge", "histogram")) -> None:
+        for metric in self._metrics:
+            if metric.kind not in kinds:
+                continue
+            target = merged.setdefault(metric.name, {})
+            for labels, value in snapshot.get(metric.name, []):
+                labels = tuple(labels)
+                target[labels] = metric.merge(target[labels], value) if labels in target else value
+
+    def collect(self) -> Dict[str, Dict[LabelValues, Any]]:
+        """Jumlah semua worker: snapshot file + state terbaru proses ini"""
+        self.write_snapshot()
+        merged: Dict[str, Dict[LabelValues, Any]] = {}
+        for filename in sorted(os.listdir(self.multiproc_dir)):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            snapshot = _read_json(os.path.join(self.multiproc_dir, filename))
+            if snapshot is not None:
+                self._merge_into(merged, snapshot)
+        return merged
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Worker mati: simpan counter/histogram ke metrics_dead.json, buang gauge-nya"""
+        path = os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+        snapshot = _read_json(path)
+        if snapshot is not None:
+            dead_path = os.path.join(self.multiproc_dir, DEAD_FILE)
+            merged: Dict[str, Dict[LabelValues, Any]] = {}
+            self._merge_into(merged, _read_json(dead_path) or {}, ("counter", "histogram"))
+            self._merge_into(merged, snapshot, ("counter", "histogram"))
+            _write_json(dead_path, {
+                name: [[list(labels), value] for labels, value in values.items()]
+                for name, values in merged.items()
+            })
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def render(self) -> str:
+        merged = self.collect() if self.multiproc_dir else {}
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render(merged.get(metric.name, {}) if self.multiproc_dir else None))
+        return "\n".join(lines) + "\n"
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning(f"⚠️ Skipping unreadable metrics file {path}")
+        return None
+
+
+def clear_multiproc_dir(path: str) -> None:
+    """Hapus snapshot run sebelumnya (dipanggil master sebelum worker start)"""
+    os.makedirs(path, exist_ok=True)
+    for filename in os.listdir(path):
+        if filename.startswith("metrics_"):
+            os.unlink(os.path.join(path, filename))
+
+
+class MetricsFileWriter:
+    """Thread per worker: tulis snapshot registry setiap METRICS_FLUSH_INTERVAL"""
+
+    def __init__(self, registry: "Registry", interval: float = settings.metrics_flush_interval):
+        self.registry = registry
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start (idempotent); no-op tanpa PROMETHEUS_MULTIPROC_DIR"""
+        if not self.registry.multiproc_dir or (self._thread is not None and self._thread.is_alive()):
+            return
+        os.makedirs(self.registry.multiproc_dir, exist_ok=True)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout=self.interval + 5)
+        self._thread = None
+        self._flush()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._flush()
+
+    def _flush(self):
+        try:
+            self.registry.write_snapshot()
+        except OSError as e:
+            logger.error(f"❌ Metrics snapshot failed: {e}")
+
+
+registry = Registry(MULTIPROC_DIR)
+metrics_writer = MetricsFileWriter(registry)
+
+# =====================================================================
+# METRICS
+# =====================================================================
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), LATENCY_BUCKETS))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"))
+
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "Total SQL statements executed"))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency", (), QUERY_BUCKETS))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements per HTTP request", ("route",), COUNT_BUCKETS))
+db_time_per_request = registry.register(Histogram(
+    "db_time_per_request_seconds", "Total SQL time per HTTP request", ("route",), LATENCY_BUCKETS))
+
+model_inference_duration = registry.register(Histogram(
+    "model_inference_seconds", "ML model inference latency", ("model",), LATENCY_BUCKETS))
+model_batch_size = registry.register(Histogram(
+    "model_batch_size", "ML model inference batch size", ("model",), BATCH_BUCKETS))
+
+cache_requests_total = registry.register(Counter(
+    "cache_requests_total", "Cache lookups by result", ("cache", "result")))
+
+
+def _pool_stats() -> Dict[LabelValues, float]:
+    from ..database.db import engine
+
+    pool = engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        getter = getattr(pool, name, None)
+        if callable(getter):
+            stats[(name,)] = getter()
+    return stats
+
+
+db_pool_connections = registry.register(Gauge(
+    "db_pool_connections", "SQLAlchemy connection pool state", ("state",), callback=_pool_stats))
+
+
+def cache_hit(cache: str):
+    cache_requests_total.inc(cache, "hit")
+
+
+def cache_miss(cache: str):
+    cache_requests_total.inc(cache, "miss")
+
+
+def observe_inference(model: str, seconds: float, batch_size: int = 1):
+    model_inference_duration.observe(seconds, model)
+    model_batch_size.observe(batch_size, model)
+
+
+# =====================================================================
+# PER-REQUEST DB ACCOUNTING (SQLAlchemy engine events)
+# =====================================================================
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_queries_total.inc()
+    db_query_duration.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+# =====================================================================
+# MIDDLEWARE
+# =====================================================================
+
+def _route_template(scope) -> str:
+    """Route template (mis. /api/admin/soal/{soal_id}) agar label cardinality terbatas"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: latency, status, in-flight dan query count per route"""
+
+    def __init__(self, app, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            current_request_stats.reset(token)
+            route = _route_template(scope)
+            method = scope.get("method", "GET")
+            http_requests_total.inc(method, route, str(status_holder["status"]))
+            http_request_duration.observe(elapsed, method, route)
+            db_queries_per_request.observe(stats.queries, route)
+            db_time_per_request.observe(stats.db_time, route)
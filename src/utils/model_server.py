@@ -0,0 +1,353 @@
+"""
+Model server: satu proses memegang model TensorFlow, web worker mengirim
+input lewat Unix socket (MODEL_SERVER_SOCKET), sehingga N worker gunicorn
+berbagi satu model di memori.
+
+Request dari banyak koneksi digabung jadi satu ``model.predict`` oleh
+MicroBatcher (INFERENCE_BATCH_SIZE item atau INFERENCE_BATCH_WAIT_MS).
+
+Frame (dua arah): 4 byte panjang header (big endian) + header JSON
+``{"dtype", "shape"}`` + raw array. Error dikirim sebagai header
+``{"error": "..."}`` tanpa payload; ``{"ping": true}`` (health check)
+dijawab server dengan frame yang sama.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import struct
+import logging
+import threading
+import socketserver
+import multiprocessing
+from concurrent.futures import Future
+from typing import Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+
+def load_keras_model(path: str):
+    """Load model Keras (TensorFlow di-import di sini, bukan saat startup)"""
+    # Suppress TensorFlow warnings
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+
+    from tensorflow.keras.models import load_model
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model file not found: {path}")
+    return load_model(path)
+
+
+# =====================================================================
+# FRAMING
+# =====================================================================
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError("Model server connection closed")
+        received += n
+    return buffer
+
+
+def send_array(sock: socket.socket, array=None, error: Optional[str] = None, ping: bool = False) -> None:
+    if error is not None:
+        header, payload = {"error": error}, b""
+    elif ping:
+        header, payload = {"ping": True}, b""
+    else:
+        import numpy as np
+
+        array = np.ascontiguousarray(array)
+        header = {"dtype": array.dtype.str, "shape": list(array.shape)}
+        # tanpa copy; cast() menolak shape dengan dimensi 0 (batch kosong)
+        payload = memoryview(array).cast("B") if array.size else b""
+    raw = json.dumps(header).encode()
+    sock.sendall(_HEADER.pack(len(raw)) + raw)
+    if len(payload):
+        sock.sendall(payload)
+
+
+def recv_array(sock: socket.socket):
+    """Terima satu array (None untuk frame ping); error dari server di-raise sebagai RuntimeError"""
+    import numpy as np
+
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, size))
+    if "error" in header:
+        raise RuntimeError(header["error"])
+    if header.get("ping"):
+        return None
+    dtype = np.dtype(header["dtype"])
+    shape = tuple(header["shape"])
+    count = 1
+    for dim in shape:
+        count *= dim
+    return np.frombuffer(_recv_exact(sock, dtype.itemsize * count), dtype=dtype).reshape(shape)
+
+
+# =====================================================================
+# SERVER
+# =====================================================================
+
+class MicroBatcher:
+    """Gabungkan request konkuren menjadi satu batch ``model.predict``"""
+
+    def __init__(self, model, max_batch: int = settings.inference_batch_size,
+                 wait_ms: float = settings.inference_batch_wait_ms):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.wait = max(0.0, wait_ms) / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="model-batcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(self, batch) -> Future:
+        future: Future = Future()
+        self._queue.put((batch, future))
+        return future
+
+    def _collect(self):
+        items = [self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        import numpy as np
+
+        while True:
+            items = self._collect()
+            try:
+                batch = items[0][0] if len(items) == 1 else np.concatenate([b for b, _ in items])
+                output = self.model.predict(batch, verbose=0)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            offset = 0
+            for batch, future in items:
+                future.set_result(output[offset:offset + len(batch)])
+                offset += len(batch)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Satu koneksi per web worker (persistent), request diproses berurutan"""
+
+    def handle(self):
+        while True:
+            try:
+                batch = recv_array(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            try:
+                if batch is None:
+                    # Ping: jawab hanya jika batcher masih jalan
+                    if self.server.batcher.is_alive():
+                        send_array(self.request, ping=True)
+                    else:
+                        send_array(self.request, error="Model batcher stopped")
+                    continue
+                try:
+                    result = self.server.batcher.submit(batch).result()
+                except Exception as e:
+                    send_array(self.request, error=f"{type(e).__name__}: {e}")
+                else:
+                    send_array(self.request, result)
+            except OSError:
+                return
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, batcher: MicroBatcher):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        self.batcher = batcher
+
+
+def serve(path: Optional[str] = None, model_path: Optional[str] = None) -> None:
+    """Jalankan model server (foreground) sampai SIGTERM/SIGINT"""
+    from ..config.logging_config import setup_logging
+
+    setup_logging(use_queue=False)
+    path = path or settings.model_server_socket
+    model_path = model_path or settings.model_path
+
+    logger.info(f"🔄 Model server loading {model_path}...")
+    batcher = MicroBatcher(load_keras_model(model_path))
+    batcher.start()
+
+    # Socket baru dibuat setelah model siap: keberadaan file = ready
+    server = ModelServer(path, batcher)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info(
+        f"✅ Model server listening on {path} "
+        f"(batch {batcher.max_batch}, wait {batcher.wait * 1000:.1f} ms)"
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        logger.info("👋 Model server stopped")
+
+
+class ModelServerProcess:
+    """
+    Model server sebagai child process (dipakai gunicorn.conf.py).
+
+    ``watch()`` menjalankan thread monitor di master: child yang mati (OOM,
+    crash TensorFlow) di-start ulang, dengan backoff jika start terus gagal.
+    """
+
+    def __init__(self, path: Optional[str] = None, target=serve):
+        self.path = path or settings.model_server_socket
+        self.target = target
+        self.process: Optional[multiprocessing.Process] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self, timeout: float = settings.model_server_start_timeout) -> None:
+        with self._lock:
+            if self._stopping.is_set():
+                raise RuntimeError("Model server is stopping")
+            if os.path.exists(self.path):
+                os.unlink(self.path)  # socket basi dari run sebelumnya
+            # spawn: TensorFlow tidak fork-safe, dan master gunicorn tetap ringan
+            context = multiprocessing.get_context("spawn")
+            process = context.Process(target=self.target, args=(self.path,), name="mauna-model-server")
+            process.start()
+            self.process = process
+
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(self.path):
+            if not process.is_alive():
+                raise RuntimeError(f"Model server exited during startup (code {process.exitcode})")
+            if time.monotonic() > deadline:
+                self._terminate(process)
+                raise TimeoutError(f"Model server not ready after {timeout:.0f}s")
+            time.sleep(0.1)
+
+    def watch(self, interval: float = settings.model_server_watch_interval) -> None:
+        """Start thread monitor (sekali); berhenti saat stop()"""
+        if self._monitor is not None:
+            return
+        self._monitor = threading.Thread(
+            target=self._watch, args=(interval,), name="model-server-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def _watch(self, interval: float) -> None:
+        delay = interval
+        while not self._stopping.wait(delay):
+            process = self.process
+            if process is not None and process.is_alive():
+                delay = interval
+                continue
+            code = process.exitcode if process is not None else None
+            logger.error(f"❌ Model server exited (code {code}), restarting")
+            try:
+                self.start()
+            except Exception as e:
+                delay = min(delay * 2, 60.0)
+                logger.error(f"❌ Model server restart failed: {e} (retry in {delay:.0f}s)")
+            else:
+                delay = interval
+                logger.info(f"✅ Model server restarted on {self.path}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        with self._lock:
+            process, self.process = self.process, None
+        if process is not None:
+            self._terminate(process, timeout)
+
+    @staticmethod
+    def _terminate(process: multiprocessing.Process, timeout: float = 10.0) -> None:
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+
+# =====================================================================
+# CLIENT
+# =====================================================================
+
+class ModelClient:
+    """Interface ``predict(batch)`` seperti model Keras, diteruskan ke model server"""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = settings.model_server_timeout):
+        self.path = path or settings.model_server_socket
+        self.timeout = timeout
+        self._local = threading.local()  # satu koneksi persistent per thread
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        return sock
+
+    def predict(self, batch, verbose=0):
+        return self._request(lambda sock: send_array(sock, batch))
+
+    def ping(self) -> None:
+        """Round-trip ke model server (proses hidup dan batcher jalan); raise jika gagal"""
+        self._request(lambda sock: send_array(sock, ping=True))
+
+    def _request(self, send):
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                send(sock)
+                return recv_array(sock)
+            except ConnectionError:
+                # Koneksi basi (mis. model server restart): reconnect sekali
+                self.close()
+                if attempt:
+                    raise
+            except OSError:
+                self.close()
+                raise
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
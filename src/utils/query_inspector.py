@@ -0,0 +1,210 @@
+import os
+import re
+import logging
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# off | warn | strict (strict: budget terlampaui -> 500, untuk dev/test)
+QUERY_DEBUG = settings.query_debug
+N_PLUS_ONE_THRESHOLD = settings.query_n_plus_one_threshold
+DEFAULT_QUERY_BUDGET = settings.query_budget_default  # 0 = tanpa budget default
+
+# Budget query per endpoint: "METHOD route_template" -> max statements
+QUERY_BUDGETS: Dict[str, int] = {
+    "GET /api/admin/soal/list": 4,
+    "GET /api/admin/kamus/": 5,
+    "GET /api/admin/levels/": 5,
+    "GET /api/admin/sublevels/": 5,
+    "GET /api/user/soal/user/progress/summary": 12,
+    "GET /api/user/soal/available-sublevels": 12,
+    "GET /api/user/soal/sublevel/{sublevel_id}/start": 10,
+    "POST /api/user/soal/sublevel/{sublevel_id}/finish": 25,
+    "GET /api/user/leaderboard": 6,
+}
+
+_LITERALS = re.compile(r"('(?:[^']|'')*'|\b\d+\b)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Jumlah query melebihi budget (AssertionError: otomatis gagal di pytest)"""
+
+    def __init__(self, name: str, budget: int, recorder: "QueryRecorder"):
+        self.name = name
+        self.budget = budget
+        self.recorder = recorder
+        super().__init__(
+            f"{name}: {recorder.count} queries > budget {budget}\n{recorder.report()}"
+        )
+
+
+class QueryRecorder:
+    """Rekam statement SQL selama satu request / blok kode"""
+
+    def __init__(self, capture_stack: bool = False):
+        self.capture_stack = capture_stack
+        self.statements: List[Tuple[str, object]] = []
+        self._groups: Dict[str, Dict[str, object]] = {}
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @staticmethod
+    def normalize(statement: str) -> str:
+        return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+    def record(self, statement: str, parameters):
+        self.statements.append((statement, parameters))
+        key = self.normalize(statement)
+        group = self._groups.get(key)
+        if group is None:
+            group = {"count": 0, "params": set(), "origin": None}
+            self._groups[key] = group
+        group["count"] += 1
+        group["params"].add(repr(parameters))
+        if self.capture_stack and group["origin"] is None:
+            group["origin"] = self._caller()
+
+    @staticmethod
+    def _caller() -> Optional[str]:
+        """Frame pertama di kode aplikasi (bukan sqlalchemy/starlette) yang memicu query"""
+        for frame in reversed(traceback.extract_stack()[:-3]):
+            filename = frame.filename.replace(os.sep, "/")
+            if "/src/" in filename and "/utils/query_inspector" not in filename:
+                return f"{filename.split('/src/', 1)[1]}:{frame.lineno} in {frame.name}"
+        return None
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Dict[str, object]]:
+        """Statement sama yang dieksekusi >= threshold kali dengan parameter berbeda"""
+        findings = []
+        for statement, group in self._groups.items():
+            if group["count"] >= threshold and len(group["params"]) > 1:
+                findings.append({
+                    "statement": statement[:300],
+                    "count": group["count"],
+                    "distinct_params": len(group["params"]),
+                    "origin": group["origin"],
+                })
+        return sorted(findings, key=lambda f: f["count"], reverse=True)
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries"]
+        for finding in self.n_plus_one():
+            origin = f" ({finding['origin']})" if finding["origin"] else ""
+            lines.append(f"  N+1 x{finding['count']}{origin}: {finding['statement']}")
+        return "\n".join(lines)
+
+
+current_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("current_query_recorder", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    recorder = current_recorder.get()
+    if recorder is not None:
+        recorder.record(statement, parameters)
+
+
+@contextmanager
+def query_budget(max_queries: int, name: str = "block", capture_stack: bool = True):
+    """
+    Context manager untuk test/CLI: gagal jika blok mengeksekusi lebih dari
+    ``max_queries`` statement.
+
+        with query_budget(3, "list_soal"):
+            SoalHandler(db).list_soal(use_cache=False)
+    """
+    recorder = QueryRecorder(capture_stack=capture_stack)
+    token = current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        current_recorder.reset(token)
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(name, max_queries, recorder)
+
+
+def budget_for(method: str, route: str) -> int:
+    return QUERY_BUDGETS.get(f"{method} {route}", DEFAULT_QUERY_BUDGET)
+
+
+class QueryInspectorMiddleware:
+    """
+    Dev/test mode (QUERY_DEBUG=warn|strict): hitung query per request,
+    deteksi N+1 dan cek budget per endpoint. Header X-Query-Count selalu diset.
+    """
+
+    def __init__(self, app, mode: str = QUERY_DEBUG, path_prefix: str = "/api/"):
+        self.app = app
+        self.mode = mode
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope.get("path", "").startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder(capture_stack=True)
+        token = current_recorder.set(recorder)
+        response_start = {}
+        body_parts: List[bytes] = []
+
+        async def buffered_send(message):
+            # Tahan response sampai jumlah query final diketahui
+            if message["type"] == "http.response.start":
+                response_start.update(message)
+                return
+            if message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, buffered_send)
+        finally:
+            current_recorder.reset(token)
+
+        route = getattr(scope.get("route"), "path", scope.get("path", ""))
+        method = scope.get("method", "GET")
+        budget = budget_for(method, route)
+        findings = recorder.n_plus_one()
+        for finding in findings:
+            logger.warning(
+                f"⚠️ N+1 on {method} {route}: x{finding['count']} "
+                f"({finding['origin'] or 'unknown origin'}) {finding['statement']}"
+            )
+
+        if budget and recorder.count > budget:
+            message = f"Query budget exceeded on {method} {route}: {recorder.count} > {budget}"
+            logger.error(f"❌ {message}\n{recorder.report()}")
+            if self.mode == "strict":
+                response = JSONResponse(
+                    status_code=500,
+                    content={
+                        "success": False,
+                        "message": message,
+                        "error": "query_budget_exceeded",
+                        "n_plus_one": findings,
+                    },
+                    headers={"X-Query-Count": str(recorder.count)},
+                )
+                await response(scope, receive, send)
+                return
+
+        headers = list(response_start.get("headers", []))
+        headers.append((b"x-query-count", str(recorder.count).encode()))
+        if findings:
+            headers.append((b"x-n-plus-one", str(len(findings)).encode()))
+        await send({**response_start, "headers": headers})
+        await send({"type": "http.response.body", "body": b"".join(body_parts)})
@@ -0,0 +1,55 @@
+import json
+import datetime
+import decimal
+import enum
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback ke stdlib json
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def _default(value: Any):
+    """Tipe yang tidak didukung langsung oleh serializer"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ke JSON bytes (orjson jika tersedia)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class project.
+
+    Serialize langsung dengan orjson (dict, list, Pydantic model, datetime,
+    enum, numpy). Route yang me-return response ini secara eksplisit juga
+    melewati re-validasi response_model FastAPI; response_model tetap dipakai
+    untuk dokumentasi OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
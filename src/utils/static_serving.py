@@ -0,0 +1,175 @@
+import os
+import re
+import hashlib
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+
+from .media_store import BASE_STORAGE_PATH
+from .metrics import cache_hit, cache_miss
+from ..config.settings import settings
+
+# ✅ X-Accel-Redirect mode: app hanya validasi/otorisasi, nginx yang kirim bytes (sendfile)
+ACCEL_REDIRECT_ENABLED = settings.storage_accel_redirect
+ACCEL_REDIRECT_PREFIX = settings.storage_accel_prefix
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=3600, must-revalidate"
+
+STREAM_CHUNK_SIZE = 256 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class ContentHashCache:
+    """SHA-256 per file, di-cache per (path, mtime, size) supaya hanya di-hash sekali"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> str:
+        cached = self._entries.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            cache_hit("content_hash")
+            return cached[2]
+        cache_miss("content_hash")
+        hasher = hashlib.sha256()
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(STREAM_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+
+content_hashes = ContentHashCache()
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse single byte range, return (start, end) inklusif; None jika tidak valid/multi-range"""
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    start_raw, end_raw = match.groups()
+    if not start_raw and not end_raw:
+        return None
+    if not start_raw:
+        # Suffix range: N byte terakhir
+        length = int(end_raw)
+        if length == 0:
+            return (size, size)  # unsatisfiable
+        return (max(size - length, 0), size - 1)
+    start = int(start_raw)
+    end = min(int(end_raw), size - 1) if end_raw else size - 1
+    if end < start:
+        return None
+    return (start, end)
+
+
+def _iter_file(path: str, start: int, length: int):
+    with open(path, "rb") as source:
+        source.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = source.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def serve_file(
+    request: Request,
+    path: str,
+    media_type: str,
+    content_hash: Optional[str] = None,
+    immutable: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Serve file dengan strong ETag (content hash), conditional GET (304),
+    single byte-range (206/416) dan optional X-Accel-Redirect.
+    """
+    stat = await run_in_threadpool(os.stat, path)
+    if content_hash is None:
+        content_hash = await run_in_threadpool(content_hashes.get, path, stat)
+
+    etag = f'"{content_hash}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    base_headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": IMMUTABLE_CACHE if immutable else DEFAULT_CACHE,
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+    }
+    base_headers.update(headers or {})
+
+    # Conditional GET: If-None-Match lebih prioritas dari If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=base_headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+            if int(stat.st_mtime) <= int(since):
+                return Response(status_code=304, headers=base_headers)
+        except (TypeError, ValueError):
+            pass
+
+    if ACCEL_REDIRECT_ENABLED:
+        relative = os.path.relpath(path, BASE_STORAGE_PATH).replace(os.sep, "/")
+        return Response(
+            status_code=200,
+            media_type=media_type,
+            headers={**base_headers, "X-Accel-Redirect": f"{ACCEL_REDIRECT_PREFIX}{relative}"},
+        )
+
+    size = stat.st_size
+    range_header = request.headers.get("range")
+    if range_header and size > 0:
+        if_range = request.headers.get("if-range")
+        if if_range is None or if_range.strip() == etag:
+            byte_range = _parse_range(range_header, size)
+            if byte_range is not None:
+                start, end = byte_range
+                if start >= size:
+                    return Response(
+                        status_code=416,
+                        headers={**base_headers, "Content-Range": f"bytes */{size}"},
+                    )
+                length = end - start + 1
+                return StreamingResponse(
+                    _iter_file(path, start, length),
+                    status_code=206,
+                    media_type=media_type,
+                    headers={
+                        **base_headers,
+                        "Content-Range": f"bytes {start}-{end}/{size}",
+                        "Content-Length": str(length),
+                    },
+                )
+
+    return StreamingResponse(
+        _iter_file(path, 0, size),
+        status_code=200,
+        media_type=media_type,
+        headers={**base_headers, "Content-Length": str(size)},
+    )
@@ -0,0 +1,174 @@
+import os
+import mimetypes
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from .media_store import media_store
+
+logger = logging.getLogger(__name__)
+
+
+def image_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
+    """Baca width/height dari header image saja (tanpa decode penuh)"""
+    try:
+        from PIL import Image
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None, None
+
+
+class StorageCatalog:
+    """
+    Metadata catalog untuk storage.
+
+    Setiap upload mencatat satu row (subfolder, filename, path, sha256, size,
+    mime, dimensi, timestamps) sehingga listing/info cukup satu indexed query,
+    bukan listdir + stat per file.
+    """
+
+    # =====================================================================
+    # WRITES
+    # =====================================================================
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[Dict]):
+        from ..models.storage_file import StorageFile
+
+        if not rows:
+            return
+        stmt = insert(StorageFile).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_storage_files_subfolder_filename",
+            set_={
+                "path": stmt.excluded.path,
+                "sha256": stmt.excluded.sha256,
+                "size": stmt.excluded.size,
+                "mime_type": stmt.excluded.mime_type,
+                "width": stmt.excluded.width,
+                "height": stmt.excluded.height,
+                "modified_at": stmt.excluded.modified_at,
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def build_row(subfolder: str, path: str, absolute_path: str, sha256: Optional[str] = None,
+                  size: Optional[int] = None, mime_type: Optional[str] = None) -> Dict:
+        filename = os.path.basename(absolute_path)
+        stat = os.stat(absolute_path)
+        width, height = image_dimensions(absolute_path)
+        return {
+            "subfolder": subfolder,
+            "filename": filename,
+            "path": path,
+            "sha256": sha256,
+            "size": size if size is not None else stat.st_size,
+            "mime_type": mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            "width": width,
+            "height": height,
+            "created_at": datetime.fromtimestamp(stat.st_ctime, tz=timezone.utc),
+            "modified_at": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        }
+
+    def record(self, subfolder: str, relative_path: str, sha256: str, size: int, mime_type: str):
+        """Catat upload ke catalog (blocking, panggil dari threadpool)"""
+        from ..database.db import SessionLocal
+
+        absolute_path = media_store.resolve(relative_path)
+        row = self.build_row(subfolder, relative_path, absolute_path, sha256, size, mime_type)
+        db = SessionLocal()
+        try:
+            self._upsert(db, [row])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Catalog hanya metadata: upload tetap sukses, backfill bisa memperbaiki
+            logger.warning(f"⚠️ Could not record {relative_path} in storage catalog: {e}")
+        finally:
+            db.close()
+
+    def backfill(self, db: Session, folders: Dict[str, str], batch_size: int = 500) -> Dict[str, int]:
+        """
+        Isi catalog dari file yang sudah ada: folder legacy per subfolder dan
+        media yang direferensikan soal/kamus/avatar.
+        """
+        from ..models.soal import Soal
+        from ..models.kamus import Kamus
+        from ..models.user import User
+
+        rows: List[Dict] = []
+        recorded = 0
+
+        def flush():
+            nonlocal recorded
+            self._upsert(db, rows)
+            recorded += len(rows)
+            rows.clear()
+
+        for subfolder, folder in folders.items():
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                rows.append(self.build_row(subfolder, f"storage/{subfolder}/{entry.name}", entry.path))
+                if len(rows) >= batch_size:
+                    flush()
+
+        # Media: subfolder diturunkan dari kolom yang mereferensikan file
+        references = (
+            ("soal", Soal.image_url),
+            ("kamus", Kamus.image_url_ref),
+            ("avatars", User.avatar),
+        )
+        for subfolder, column in references:
+            refs = db.query(func.ltrim(column, "/")).filter(
+                column.isnot(None), func.ltrim(column, "/").like(f"{media_store.url_prefix}/%")
+            ).distinct().all()
+            for (reference,) in refs:
+                absolute_path = media_store.resolve(reference)
+                if not absolute_path or not os.path.isfile(absolute_path):
+                    continue
+                digest = os.path.splitext(os.path.basename(absolute_path))[0]
+                rows.append(self.build_row(subfolder, reference, absolute_path, sha256=digest))
+                if len(rows) >= batch_size:
+                    flush()
+
+        flush()
+        db.commit()
+        return {"files_recorded": recorded}
+
+    # =====================================================================
+    # READS
+    # =====================================================================
+
+    @staticmethod
+    def list_files(db: Session, subfolder: str, limit: int = 50, offset: int = 0):
+        """Paginated listing (index subfolder, created_at), return (total, rows)"""
+        from ..models.storage_file import StorageFile
+
+        base = db.query(StorageFile).filter(StorageFile.subfolder == subfolder)
+        total = base.with_entities(func.count(StorageFile.id)).scalar() or 0
+        rows = base.order_by(StorageFile.created_at.desc(), StorageFile.id.desc())\
+            .offset(offset)\
+            .limit(limit)\
+            .all()
+        return int(total), rows
+
+    @staticmethod
+    def get(db: Session, subfolder: str, filename: str):
+        from ..models.storage_file import StorageFile
+
+        return db.query(StorageFile).filter(
+            StorageFile.subfolder == subfolder,
+            StorageFile.filename == filename
+        ).first()
+
+
+storage_catalog = StorageCatalog()
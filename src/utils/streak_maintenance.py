@@ -0,0 +1,167 @@
+import threading
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from sqlalchemy import update, case, literal, func, text
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key supaya hanya satu worker yang menjalankan job
+STREAK_JOB_LOCK_KEY = 72_601_029
+
+
+def _tier_case(User, UserTier):
+    """CASE expression tier berdasarkan streak (sinkron dengan User.update_tier_based_on_streak)"""
+    tier_type = User.__table__.c.tier.type
+    streak = func.coalesce(User.current_streak, 0)
+    return case(
+        (streak >= 180, literal(UserTier.PLATINUM, tier_type)),
+        (streak >= 90, literal(UserTier.DIAMOND, tier_type)),
+        (streak >= 30, literal(UserTier.GOLD, tier_type)),
+        (streak >= 7, literal(UserTier.SILVER, tier_type)),
+        else_=literal(UserTier.BRONZE, tier_type),
+    )
+
+
+def apply_streak_rule(db: Session, today: date, *criteria) -> Tuple[int, int]:
+    """
+    STREAK RULE (src/models/user.py) secara set-based, per hari ``today``:
+
+    - User yang melewatkan N hari dan punya freeze >= N: freeze dikurangi N,
+      last_activity_date digeser ke kemarin (aktivitas hari ini = hari berurutan).
+    - User yang melewatkan hari tanpa cukup freeze: current_streak = 0.
+
+    ``criteria`` membatasi user yang diproses (mis. test). Tidak commit.
+    Return (freezes_consumed, streaks_expired).
+    """
+    from ..models.user import User
+
+    cutoff = today - timedelta(days=1)  # Aktivitas kemarin masih menjaga streak
+    has_streak = func.coalesce(User.current_streak, 0) > 0
+    missed_days = User.missed_streak_days_expr(today)
+    freeze = func.coalesce(User.streak_freeze_count, 0)
+    lapsed = User.last_activity_date < cutoff
+    scope = (User.deleted_at.is_(None), has_streak, lapsed, *criteria)
+
+    # 1. Freeze consumption: cukup freeze untuk menutup semua hari yang terlewat
+    frozen = db.execute(
+        update(User)
+        .where(*scope, freeze >= missed_days)
+        .values(streak_freeze_count=freeze - missed_days, last_activity_date=cutoff)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # 2. Streak expiry: sisanya yang masih lapsed kehilangan streak
+    expired = db.execute(
+        update(User)
+        .where(*scope)
+        .values(current_streak=0)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return frozen, expired
+
+
+def run_streak_maintenance(db: Optional[Session] = None, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Recalculate streak expiry, freeze consumption (``apply_streak_rule``) dan
+    tier untuk semua user (set-based). Tier dan longest_streak disamakan
+    dengan current_streak.
+    """
+    # Import here to avoid circular imports
+    from ..database.db import SessionLocal
+    from ..models.user import User, UserTier
+
+    today = today or date.today()
+    owns_session = db is None
+    db = db or SessionLocal()
+
+    try:
+        if db.bind is not None and db.bind.dialect.name == "postgresql":
+            locked = db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": STREAK_JOB_LOCK_KEY}).scalar()
+            if not locked:
+                return {"success": False, "message": "Streak maintenance already running", "data": None}
+
+        frozen, expired = apply_streak_rule(db, today)
+
+        # 3. Tier + longest_streak hanya untuk row yang berubah
+        tier_expr = _tier_case(User, UserTier)
+        retiered = db.execute(
+            update(User)
+            .where(
+                User.deleted_at.is_(None),
+                (User.tier.is_distinct_from(tier_expr))
+                | (func.coalesce(User.longest_streak, 0) < func.coalesce(User.current_streak, 0))
+            )
+            .values(
+                tier=tier_expr,
+                longest_streak=func.greatest(func.coalesce(User.longest_streak, 0), func.coalesce(User.current_streak, 0)),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        db.commit()
+
+        # Leaderboard harus membaca ulang streak/tier baru
+        from ..handler.user.leaderBoard import leaderboard_engine
+        leaderboard_engine.invalidate()
+
+        result = {
+            "run_date": today.isoformat(),
+            "freezes_consumed": frozen,
+            "streaks_expired": expired,
+            "tiers_updated": retiered,
+        }
+        logger.info(f"✅ Streak maintenance done: {result}")
+        return {"success": True, "message": "Streak maintenance completed", "data": result}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Streak maintenance failed: {e}")
+        return {"success": False, "message": f"Streak maintenance failed: {str(e)}", "data": None}
+    finally:
+        if owns_session:
+            db.close()
+
+
+class StreakMaintenanceScheduler:
+    """Background thread yang menjalankan streak maintenance setiap malam"""
+
+    def __init__(self, run_at: str = "00:05"):
+        hour, minute = (int(part) for part in run_at.split(":"))
+        self.run_hour = hour
+        self.run_minute = minute
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now()
+        next_run = now.replace(hour=self.run_hour, minute=self.run_minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="streak-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Catch-up sekali saat startup (idempotent), lalu tiap malam
+        run_streak_maintenance()
+        while not self._stopped.wait(self.seconds_until_next_run()):
+            run_streak_maintenance()
+
+
+streak_scheduler = StreakMaintenanceScheduler(settings.streak_job_time)
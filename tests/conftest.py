@@ -0,0 +1,146 @@
+"""
+Fixture pytest bersama.
+
+Test berjalan terhadap Postgres yang sudah di-migrate (``python cli.py migrate``
+atau ``migrate:fresh-seed``), dikonfigurasi lewat DATABASE_* seperti app.
+Jika dependency atau database tidak tersedia, test di-skip.
+
+App dijalankan in-process lewat ``httpx.ASGITransport`` (tanpa socket).
+"""
+import os
+import sys
+import uuid
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings dibaca sekali saat src di-import: override sebelum import apa pun dari src
+os.environ["RATE_LIMIT"] = "100000000"  # Semua request test dari satu client
+os.environ["STREAK_JOB_ENABLED"] = "false"
+os.environ["QUERY_DEBUG"] = "off"  # Budget dicek eksplisit dengan query_budget
+os.environ["MODEL_SERVER_ENABLED"] = "false"
+os.environ["LOG_ASYNC"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+TEST_PASSWORD = "Password123"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Engine app; skip jika dependency / database tidak tersedia"""
+    for module in ("fastapi", "httpx", "dotenv"):
+        pytest.importorskip(module)
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+
+    from src.database.db import db_config
+
+    try:
+        with db_config.engine.connect() as conn:
+            conn.execute(sqlalchemy.text("SELECT 1 FROM users LIMIT 1"))
+    except Exception as e:
+        pytest.skip(f"Database not available or not migrated: {e}")
+    return db_config.engine
+
+
+@pytest.fixture(scope="session")
+def app(engine):
+    from src.app.main import app
+
+    return app
+
+
+@pytest.fixture
+def db(engine):
+    from src.database.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+class Accounts:
+    """User sementara untuk test (dihapus di akhir sesi)"""
+
+    def __init__(self, admin_id: int, learner_id: int):
+        from src.config.middleware import auth_manager
+
+        self.admin_id = admin_id
+        self.learner_id = learner_id
+        self.admin_token = auth_manager.create_access_token({"sub": str(admin_id)})
+        self.learner_token = auth_manager.create_access_token({"sub": str(learner_id)})
+
+    @staticmethod
+    def auth(token: str):
+        return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def accounts(engine):
+    from sqlalchemy import delete
+
+    from src.config.hash import hash_password
+    from src.database.db import SessionLocal
+    from src.models.progress import Progress
+    from src.models.user import User, UserRole
+    from src.models.user_badge import user_badge_association
+
+    tag = f"TEST-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    created = {}
+    for role in (UserRole.ADMIN, UserRole.USER):
+        created[role] = User(
+            unique_id=f"{tag}-{role.value}",
+            username=f"{tag.lower()}_{role.value}",
+            email=f"{tag.lower()}_{role.value}@example.test",
+            password=hash_password(TEST_PASSWORD),
+            nama=f"Test {role.value}",
+            role=role,
+            is_active=True,
+            is_verified=True,
+        )
+        db.add(created[role])
+    db.flush()
+    admin_id, learner_id = created[UserRole.ADMIN].id, created[UserRole.USER].id
+    db.commit()
+    db.close()  # Jangan tahan koneksi pool selama sesi test
+
+    ids = [admin_id, learner_id]
+    try:
+        yield Accounts(admin_id, learner_id)
+    finally:
+        db = SessionLocal()
+        db.execute(delete(user_badge_association).where(user_badge_association.c.user_id.in_(ids)))
+        db.execute(delete(Progress).where(Progress.user_id.in_(ids)))
+        db.execute(delete(User).where(User.id.in_(ids)))
+        db.commit()
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def event_loop_runner():
+    """Satu event loop untuk seluruh sesi (middleware app dibangun sekali)"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def run_client(app, event_loop_runner):
+    """``run_client(scenario)``: jalankan ``async def scenario(client)`` terhadap app"""
+    import httpx
+
+    def run(scenario):
+        async def main():
+            # raise_app_exceptions=False: exception handler jadi 500, seperti di server
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await scenario(client)
+
+        return event_loop_runner(main())
+
+    return run
@@ -0,0 +1,18 @@
+"""
+Query hot-path harus bisa memakai index yang diharapkan (lihat
+``src/database/indexes.py``; sama dengan ``python cli.py db:explain``).
+"""
+
+
+def test_key_queries_use_expected_index(engine):
+    from src.database.indexes import KEY_QUERIES, explain_key_queries
+
+    results = explain_key_queries(engine)
+
+    assert len(results) == len(KEY_QUERIES)
+    missing = [
+        (result["query"], result["expected_index"], result["indexes_used"])
+        for result in results
+        if result["expected_index"] not in result["indexes_used"]
+    ]
+    assert not missing, missing
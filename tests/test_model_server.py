@@ -0,0 +1,194 @@
+"""
+Model server tanpa TensorFlow dan Postgres: framing send_array/recv_array,
+MicroBatcher (hasil dipecah per submit, error diteruskan) dan restart oleh
+monitor ModelServerProcess. Model diganti stub.
+"""
+import os
+import time
+import socket
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def model_server():
+    try:
+        from src.utils import model_server
+    except ImportError as e:
+        pytest.skip(f"Dependency not available: {e}")
+
+    return model_server
+
+
+@pytest.fixture
+def pair():
+    left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    yield left, right
+    left.close()
+    right.close()
+
+
+class StubModel:
+    """predict = batch * 2; ukuran batch per panggilan dicatat"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    def predict(self, batch, verbose=0):
+        self.calls.append(len(batch))
+        if self.fail:
+            raise ValueError("boom")
+        return batch * 2
+
+
+def _fake_server(path: str):
+    """Target child process: "ready" begitu file socket ada"""
+    open(path, "w").close()
+    time.sleep(60)
+
+
+def _send_in_thread(target, *args, **kwargs) -> threading.Thread:
+    # Payload besar melebihi buffer socketpair: kirim dari thread lain
+    thread = threading.Thread(target=target, args=args, kwargs=kwargs)
+    thread.start()
+    return thread
+
+
+# =====================================================================
+# FRAMING
+# =====================================================================
+
+@pytest.mark.parametrize("array", [
+    np.arange(12, dtype=np.float32).reshape(3, 4),
+    np.arange(12, dtype=np.int64).reshape(3, 4).T,  # non-contiguous
+    np.zeros((2, 224, 224, 3), dtype=np.uint8),
+    np.empty((0, 5), dtype=np.float64),
+])
+def test_array_roundtrip(model_server, pair, array):
+    left, right = pair
+
+    thread = _send_in_thread(model_server.send_array, left, array)
+    received = model_server.recv_array(right)
+    thread.join()
+
+    assert received.dtype == array.dtype
+    assert received.shape == array.shape
+    np.testing.assert_array_equal(received, array)
+
+
+def test_error_frame_raises(model_server, pair):
+    left, right = pair
+
+    model_server.send_array(left, error="ValueError: boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        model_server.recv_array(right)
+
+
+def test_ping_frame(model_server, pair):
+    left, right = pair
+
+    model_server.send_array(left, ping=True)
+
+    assert model_server.recv_array(right) is None
+
+
+def test_closed_connection(model_server, pair):
+    left, right = pair
+    left.close()
+
+    with pytest.raises(ConnectionError):
+        model_server.recv_array(right)
+
+
+# =====================================================================
+# MICRO BATCHER
+# =====================================================================
+
+def test_micro_batcher_splits_results_per_submit(model_server):
+    model = StubModel()
+    batcher = model_server.MicroBatcher(model, max_batch=8, wait_ms=200)
+    batches = [np.full((size, 2), i, dtype=np.float32) for i, size in enumerate((1, 3, 2), start=1)]
+
+    # Submit sebelum start: semua sudah antri, jadi satu batch
+    futures = [batcher.submit(batch) for batch in batches]
+    batcher.start()
+
+    for batch, future in zip(batches, futures):
+        np.testing.assert_array_equal(future.result(timeout=5), batch * 2)
+    assert model.calls == [6]
+
+
+def test_micro_batcher_respects_max_batch(model_server):
+    model = StubModel()
+    batcher = model_server.MicroBatcher(model, max_batch=2, wait_ms=200)
+
+    futures = [batcher.submit(np.ones((1, 2), dtype=np.float32)) for _ in range(3)]
+    batcher.start()
+
+    for future in futures:
+        future.result(timeout=5)
+    assert model.calls == [2, 1]
+
+
+def test_micro_batcher_propagates_model_error(model_server):
+    batcher = model_server.MicroBatcher(StubModel(fail=True), max_batch=8, wait_ms=50)
+
+    futures = [batcher.submit(np.ones((1, 2), dtype=np.float32)) for _ in range(2)]
+    batcher.start()
+
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result(timeout=5)
+    assert batcher.is_alive()  # Error satu batch tidak menghentikan batcher
+
+
+# =====================================================================
+# SERVER + CLIENT
+# =====================================================================
+
+def test_client_predict_and_ping(model_server, tmp_path):
+    batcher = model_server.MicroBatcher(StubModel(), max_batch=8, wait_ms=1)
+    batcher.start()
+    path = str(tmp_path / "model.sock")
+    server = model_server.ModelServer(path, batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = model_server.ModelClient(path, timeout=5)
+    batch = np.arange(6, dtype=np.float32).reshape(3, 2)
+
+    try:
+        client.ping()
+        np.testing.assert_array_equal(client.predict(batch), batch * 2)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_monitor_restarts_dead_server(model_server, tmp_path):
+    path = str(tmp_path / "model.sock")
+    process = model_server.ModelServerProcess(path, target=_fake_server)
+    process.start(timeout=30)
+    process.watch(interval=0.1)
+
+    try:
+        first = process.process
+        first.kill()
+        first.join()
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            current = process.process
+            if current is not first and current is not None and current.is_alive() and os.path.exists(path):
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("Model server not restarted")
+    finally:
+        process.stop()
+
+    assert process.process is None
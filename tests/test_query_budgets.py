@@ -0,0 +1,53 @@
+"""
+Query budget handler utama: test gagal jika jumlah statement SQL melebihi
+budget di ``QUERY_BUDGETS`` (mis. regresi N+1).
+"""
+import pytest
+
+
+def _budget(route: str) -> int:
+    from src.utils.query_inspector import QUERY_BUDGETS
+
+    return QUERY_BUDGETS[route]
+
+
+def test_progress_summary_within_budget(db, accounts):
+    from src.handler.user.kerjakanSoal import SoalHandler
+    from src.utils.query_inspector import query_budget
+
+    route = "GET /api/user/soal/user/progress/summary"
+    with query_budget(_budget(route), route):
+        SoalHandler(db).get_user_progress_summary(accounts.learner_id)
+
+
+def test_admin_soal_list_within_budget(db):
+    from src.handler.admin.Manajemen_soal import SoalHandler
+    from src.utils.query_inspector import query_budget
+
+    route = "GET /api/admin/soal/list"
+    with query_budget(_budget(route), route):
+        SoalHandler(db).list_soal(use_cache=False)
+
+
+def test_leaderboard_within_budget(db, accounts):
+    from src.handler.user.leaderBoard import LeaderboardHandler, leaderboard_engine
+    from src.utils.query_inspector import query_budget
+
+    route = "GET /api/user/leaderboard"
+    leaderboard_engine.invalidate()  # Worst case: full reload
+    with query_budget(_budget(route), route):
+        LeaderboardHandler(db).get_leaderboard(accounts.learner_id, "all_time", 0, 10)
+
+
+def test_over_budget_block_raises(db):
+    from sqlalchemy import text
+
+    from src.utils.query_inspector import QueryBudgetExceeded, query_budget
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(1, "two_queries"):
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+
+    assert excinfo.value.recorder.count == 2
+    assert excinfo.value.budget == 1
@@ -0,0 +1,75 @@
+"""
+Auth dependency dan handler berbagi satu session per request (get_db), dan
+koneksi selalu kembali ke pool, termasuk saat handler atau dependency gagal.
+"""
+import asyncio
+
+import pytest
+
+PROBE_PATH = "/api/__tests__/session-probe-error"
+BURST = 60
+CONCURRENCY = 10  # <= pool_size: request tidak saling menunggu checkout
+
+
+@pytest.fixture(scope="module")
+def probe_app(app):
+    """Route yang query lewat session bersama lalu gagal"""
+    from fastapi import Depends
+    from sqlalchemy import text
+
+    from src.config.middleware import get_current_user
+    from src.database.db import get_db
+
+    def failing_handler(current_user=Depends(get_current_user), db=Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        raise RuntimeError("session probe failure")
+
+    if not any(getattr(route, "path", None) == PROBE_PATH for route in app.routes):
+        app.add_api_route(PROBE_PATH, failing_handler, methods=["GET"])
+    return app
+
+
+def _requests(accounts):
+    from src.config.middleware import auth_manager
+
+    unknown_user = auth_manager.create_access_token({"sub": "999999999"})
+    learner = accounts.auth(accounts.learner_token)
+    admin = accounts.auth(accounts.admin_token)
+    return [
+        ("/api/user/soal/user/progress/summary", learner, 200),
+        ("/api/user/leaderboard", learner, 200),
+        ("/api/admin/soal/list", admin, 200),
+        ("/api/user/leaderboard", accounts.auth(unknown_user), 401),  # dependency raise HTTPException
+        (PROBE_PATH, learner, 500),  # handler raise
+    ]
+
+
+def test_pool_checkouts_return_to_zero_after_burst(engine, probe_app, accounts, run_client):
+    calls = _requests(accounts)
+
+    async def scenario(client):
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def one(i):
+            path, headers, expected = calls[i % len(calls)]
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+            return path, expected, response.status_code
+
+        return await asyncio.gather(*(one(i) for i in range(BURST)))
+
+    results = run_client(scenario)
+
+    unexpected = [(path, expected, got) for path, expected, got in results if got != expected]
+    assert not unexpected, unexpected
+    assert engine.pool.checkedout() == 0
+
+
+def test_failing_handler_releases_connection(engine, probe_app, accounts, run_client):
+    async def scenario(client):
+        return await client.get(PROBE_PATH, headers=accounts.auth(accounts.learner_token))
+
+    response = run_client(scenario)
+
+    assert response.status_code == 500
+    assert engine.pool.checkedout() == 0
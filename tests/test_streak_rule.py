@@ -0,0 +1,78 @@
+"""
+STREAK RULE: hasil User.update_streak harus sama, baik streak maintenance
+job malam sudah berjalan sebelum user kembali maupun belum.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+TODAY = date(2026, 3, 10)
+
+# (hari sejak aktivitas terakhir, streak, freeze) -> (streak, freeze) setelah quiz hari ini
+CASES = [
+    (0, 5, 0, 5, 0),   # hari yang sama
+    (1, 5, 0, 6, 0),   # hari berurutan
+    (2, 5, 1, 6, 0),   # 1 hari terlewat, 1 freeze
+    (4, 5, 3, 6, 0),   # 3 hari terlewat, 3 freeze
+    (4, 5, 5, 6, 2),   # freeze lebih: sisa tetap
+    (4, 5, 2, 1, 2),   # freeze kurang: streak putus, freeze utuh
+    (3, 0, 4, 1, 4),   # streak sudah 0: freeze tidak dipakai
+]
+
+
+@pytest.fixture(scope="module")
+def models():
+    """Model saja, tanpa database"""
+    try:
+        import src.models  # noqa: F401 - registrasi semua mapper
+        from src.models.user import User
+    except ImportError as e:
+        pytest.skip(f"Dependency not available: {e}")
+
+    return User
+
+
+def _user(User, days_ago: int, streak: int, freeze: int):
+    return User(
+        current_streak=streak,
+        longest_streak=streak,
+        streak_freeze_count=freeze,
+        last_activity_date=TODAY - timedelta(days=days_ago),
+    )
+
+
+@pytest.mark.parametrize("days_ago, streak, freeze, expected_streak, expected_freeze", CASES)
+def test_update_streak_rule(models, days_ago, streak, freeze, expected_streak, expected_freeze):
+    user = _user(models, days_ago, streak, freeze)
+
+    user.update_streak(TODAY)
+
+    assert (user.current_streak, user.streak_freeze_count) == (expected_streak, expected_freeze)
+    assert user.last_activity_date == TODAY
+
+
+@pytest.mark.parametrize("days_ago, streak, freeze, expected_streak, expected_freeze", CASES)
+def test_job_then_update_streak_matches_direct_path(db, accounts, days_ago, streak, freeze,
+                                                   expected_streak, expected_freeze):
+    from sqlalchemy import update
+
+    from src.models.user import User
+    from src.utils.streak_maintenance import apply_streak_rule
+
+    db.execute(
+        update(User)
+        .where(User.id == accounts.learner_id)
+        .values(
+            current_streak=streak,
+            longest_streak=streak,
+            streak_freeze_count=freeze,
+            last_activity_date=TODAY - timedelta(days=days_ago),
+        )
+    )
+    # Job berjalan dini hari (sebelum user kembali), lalu user mengerjakan quiz
+    apply_streak_rule(db, TODAY, User.id == accounts.learner_id)
+    db.expire_all()
+    user = db.get(User, accounts.learner_id)
+    user.update_streak(TODAY)
+
+    assert (user.current_streak, user.streak_freeze_count) == (expected_streak, expected_freeze)